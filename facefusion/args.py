@@ -45,6 +45,7 @@ def apply_args(args : Args) -> None:
 	state_manager.init_item('face_detector_angles', args.get('face_detector_angles'))
 	state_manager.init_item('face_detector_score', args.get('face_detector_score'))
 	state_manager.init_item('face_landmarker_score', args.get('face_landmarker_score'))
+	state_manager.init_item('face_tracker_interval', args.get('face_tracker_interval'))
 	# face selector
 	state_manager.init_item('face_selector_mode', args.get('face_selector_mode'))
 	state_manager.init_item('face_selector_order', args.get('face_selector_order'))
@@ -61,8 +62,10 @@ def apply_args(args : Args) -> None:
 	# frame extraction
 	state_manager.init_item('trim_frame_start', args.get('trim_frame_start'))
 	state_manager.init_item('trim_frame_end', args.get('trim_frame_end'))
+	state_manager.init_item('frame_extraction_mode', args.get('frame_extraction_mode'))
 	state_manager.init_item('temp_frame_format', args.get('temp_frame_format'))
 	state_manager.init_item('keep_temp', args.get('keep_temp'))
+	state_manager.init_item('duplicate_frame_threshold', args.get('duplicate_frame_threshold'))
 	# output creation
 	state_manager.init_item('output_image_quality', args.get('output_image_quality'))
 	if is_image(args.get('target_path')):
@@ -90,6 +93,7 @@ def apply_args(args : Args) -> None:
 	# frame processors
 	available_frame_processors = list_directory('facefusion/processors/frame/modules')
 	state_manager.init_item('frame_processors', args.get('frame_processors'))
+	state_manager.init_item('fuse_frame_processors', args.get('fuse_frame_processors'))
 	for frame_processor in available_frame_processors:
 		frame_processor_module = load_frame_processor_module(frame_processor)
 		frame_processor_module.apply_args(args)
@@ -98,18 +102,37 @@ def apply_args(args : Args) -> None:
 		state_manager.init_item('open_browser', args.get('open_browser'))
 		state_manager.init_item('ui_layouts', args.get('ui_layouts'))
 		state_manager.init_item('ui_workflow', args.get('ui_workflow'))
+	# quantize
+	if args.get('command') == 'quantize':
+		state_manager.init_item('quantize_method', args.get('quantize_method'))
+		state_manager.init_item('quantize_frame_total', args.get('quantize_frame_total'))
+		state_manager.init_item('quantize_similarity', args.get('quantize_similarity'))
 	# execution
 	state_manager.init_item('execution_device_id', args.get('execution_device_id'))
 	state_manager.init_item('execution_providers', args.get('execution_providers'))
 	state_manager.init_item('execution_thread_count', args.get('execution_thread_count'))
+	state_manager.init_item('execution_pool_type', args.get('execution_pool_type'))
 	state_manager.init_item('execution_queue_count', args.get('execution_queue_count'))
+	state_manager.init_item('execution_segment_count', args.get('execution_segment_count'))
+	state_manager.init_item('execution_step_count', args.get('execution_step_count'))
+	state_manager.init_item('execution_graph_optimization_level', args.get('execution_graph_optimization_level'))
+	state_manager.init_item('execution_mode', args.get('execution_mode'))
+	state_manager.init_item('execution_intra_op_thread_count', args.get('execution_intra_op_thread_count'))
+	state_manager.init_item('execution_inter_op_thread_count', args.get('execution_inter_op_thread_count'))
+	state_manager.init_item('execution_memory_arena_strategy', args.get('execution_memory_arena_strategy'))
+	state_manager.init_item('execution_cache_path', args.get('execution_cache_path'))
+	state_manager.init_item('execution_session_replica_count', args.get('execution_session_replica_count'))
+	state_manager.init_item('execution_model_precision', args.get('execution_model_precision'))
 	# memory
 	state_manager.init_item('video_memory_strategy', args.get('video_memory_strategy'))
 	state_manager.init_item('system_memory_limit', args.get('system_memory_limit'))
+	state_manager.init_item('face_store_memory_limit', args.get('face_store_memory_limit'))
+	state_manager.init_item('inference_memory_limit', args.get('inference_memory_limit'))
 	# misc
 	state_manager.init_item('skip_download', args.get('skip_download'))
 	state_manager.init_item('log_level', args.get('log_level'))
 	# job
 	state_manager.init_item('job_id', args.get('job_id'))
 	state_manager.init_item('job_status', args.get('job_status'))
+	state_manager.init_item('show_throughput', args.get('show_throughput'))
 	state_manager.init_item('step_index', args.get('step_index'))
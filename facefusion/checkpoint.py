@@ -0,0 +1,120 @@
+import hashlib
+import os
+import threading
+from typing import Dict, List, Optional, Set
+
+from facefusion import process_manager, state_manager
+from facefusion.filesystem import is_file, remove_file
+from facefusion.jobs import job_store
+from facefusion.json import read_json, write_json
+from facefusion.temp_helper import get_temp_directory_path, get_temp_frame_paths
+from facefusion.typing import Checkpoint, QueuePayload
+
+CHECKPOINT_LOCK : threading.Lock = threading.Lock()
+
+
+def is_checkpoint_enabled() -> bool:
+	return bool(state_manager.get_item('keep_temp')) and state_manager.get_item('frame_extraction_mode') == 'disk'
+
+
+def create_checkpoint(target_path : str, frame_total : int, duplicate_frame_paths : Dict[str, str]) -> bool:
+	checkpoint : Checkpoint =\
+	{
+		'checkpoint_key': create_checkpoint_key(target_path),
+		'frame_total': frame_total,
+		'frame_pass': None,
+		'frame_passes': [],
+		'duplicate_frame_paths': duplicate_frame_paths
+	}
+	remove_file(get_checkpoint_journal_path(target_path))
+	return write_json(get_checkpoint_path(target_path), checkpoint) #type:ignore[arg-type]
+
+
+def resume_checkpoint(target_path : str) -> Optional[Checkpoint]:
+	checkpoint = read_checkpoint(target_path)
+
+	if checkpoint and checkpoint.get('frame_total') == len(get_temp_frame_paths(target_path)):
+		return checkpoint
+	return None
+
+
+def read_checkpoint(target_path : str) -> Optional[Checkpoint]:
+	checkpoint = read_json(get_checkpoint_path(target_path))
+
+	if checkpoint and checkpoint.get('checkpoint_key') == create_checkpoint_key(target_path):
+		return checkpoint #type:ignore[return-value]
+	return None
+
+
+def is_checkpoint_pass_done(target_path : str, frame_pass : str) -> bool:
+	checkpoint = read_checkpoint(target_path) if is_checkpoint_enabled() else None
+
+	if checkpoint:
+		return frame_pass in checkpoint.get('frame_passes')
+	return False
+
+
+def start_checkpoint_pass(target_path : str, frame_pass : str) -> bool:
+	checkpoint = read_checkpoint(target_path) if is_checkpoint_enabled() and not process_manager.is_stopping() else None
+
+	if checkpoint:
+		if checkpoint.get('frame_pass') != frame_pass:
+			remove_file(get_checkpoint_journal_path(target_path))
+			checkpoint['frame_pass'] = frame_pass
+			return write_json(get_checkpoint_path(target_path), checkpoint) #type:ignore[arg-type]
+		return True
+	return False
+
+
+def finish_checkpoint_pass(target_path : str, frame_pass : str) -> bool:
+	checkpoint = read_checkpoint(target_path) if is_checkpoint_enabled() else None
+
+	if checkpoint and checkpoint.get('frame_pass') == frame_pass:
+		remove_file(get_checkpoint_journal_path(target_path))
+		checkpoint['frame_pass'] = None
+		checkpoint['frame_passes'].append(frame_pass)
+		return write_json(get_checkpoint_path(target_path), checkpoint) #type:ignore[arg-type]
+	return False
+
+
+def read_checkpoint_frames(target_path : str) -> Set[int]:
+	checkpoint_journal_path = get_checkpoint_journal_path(target_path)
+	frame_numbers = set()
+
+	if is_file(checkpoint_journal_path):
+		with open(checkpoint_journal_path) as checkpoint_journal_file:
+			for line in checkpoint_journal_file:
+				if line.strip().isdigit():
+					frame_numbers.add(int(line))
+	return frame_numbers
+
+
+def append_checkpoint_frames(target_path : str, frame_numbers : List[int]) -> None:
+	with CHECKPOINT_LOCK, open(get_checkpoint_journal_path(target_path), 'a') as checkpoint_journal_file:
+		checkpoint_journal_file.write(''.join(str(frame_number) + '\n' for frame_number in frame_numbers))
+		checkpoint_journal_file.flush()
+
+
+def filter_checkpoint_frames(queue_payloads : List[QueuePayload]) -> List[QueuePayload]:
+	if is_checkpoint_enabled():
+		frame_numbers = read_checkpoint_frames(state_manager.get_item('target_path'))
+		return [ queue_payload for queue_payload in queue_payloads if queue_payload.get('frame_number') not in frame_numbers ]
+	return queue_payloads
+
+
+def create_checkpoint_key(target_path : str) -> str:
+	target_stat = os.stat(target_path)
+	checkpoint_settings = [ os.path.abspath(target_path), target_stat.st_size, target_stat.st_mtime ]
+
+	for step_key in job_store.get_step_keys():
+		if step_key != 'output_path':
+			checkpoint_settings.append(state_manager.get_item(step_key)) #type:ignore[arg-type]
+	return hashlib.sha1(str(checkpoint_settings).encode()).hexdigest()
+
+
+def get_checkpoint_path(target_path : str) -> str:
+	return os.path.join(get_temp_directory_path(target_path), 'checkpoint.json')
+
+
+def get_checkpoint_journal_path(target_path : str) -> str:
+	return os.path.join(get_temp_directory_path(target_path), 'checkpoint.txt')
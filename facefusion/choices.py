@@ -1,7 +1,7 @@
 from typing import List
 
 from facefusion.common_helper import create_float_range, create_int_range
-from facefusion.typing import Angle, ExecutionProviderSet, FaceDetectorSet, FaceMaskRegion, FaceMaskType, FaceSelectorAge, FaceSelectorGender, FaceSelectorMode, FaceSelectorOrder, JobStatus, OutputAudioEncoder, OutputVideoEncoder, OutputVideoPreset, Score, TempFrameFormat, UiWorkflow, VideoMemoryStrategy
+from facefusion.typing import Angle, ExecutionGraphOptimizationLevel, ExecutionMemoryArenaStrategy, ExecutionMode, ExecutionModelPrecision, ExecutionPoolType, ExecutionProviderSet, FaceAttribute, FaceDetectorSet, FaceMaskRegion, FaceMaskType, FaceSelectorAge, FaceSelectorGender, FaceSelectorMode, FaceSelectorOrder, FrameExtractionMode, JobStatus, OutputAudioEncoder, OutputVideoEncoder, OutputVideoPreset, QuantizeMethod, Score, TempFrameFormat, UiWorkflow, VideoMemoryStrategy
 
 video_memory_strategies : List[VideoMemoryStrategy] = [ 'strict', 'moderate', 'tolerant' ]
 
@@ -12,12 +12,14 @@ face_detector_set : FaceDetectorSet =\
 	'scrfd': [ '160x160', '320x320', '480x480', '512x512', '640x640' ],
 	'yoloface': [ '640x640' ]
 }
+face_attributes : List[FaceAttribute] = [ 'embedding', 'gender_age' ]
 face_selector_modes : List[FaceSelectorMode] = [ 'many', 'one', 'reference' ]
 face_selector_orders : List[FaceSelectorOrder] = [ 'left-right', 'right-left', 'top-bottom', 'bottom-top', 'small-large', 'large-small', 'best-worst', 'worst-best' ]
 face_selector_ages : List[FaceSelectorAge] = [ 'child', 'teen', 'adult', 'senior' ]
 face_selector_genders : List[FaceSelectorGender] = [ 'female', 'male' ]
 face_mask_types : List[FaceMaskType] = [ 'box', 'occlusion', 'region' ]
 face_mask_regions : List[FaceMaskRegion] = [ 'skin', 'left-eyebrow', 'right-eyebrow', 'left-eye', 'right-eye', 'glasses', 'nose', 'mouth', 'upper-lip', 'lower-lip' ]
+frame_extraction_modes : List[FrameExtractionMode] = [ 'disk', 'pipe' ]
 temp_frame_formats : List[TempFrameFormat] = [ 'bmp', 'jpg', 'png' ]
 output_audio_encoders : List[OutputAudioEncoder] = [ 'aac', 'libmp3lame', 'libopus', 'libvorbis' ]
 output_video_encoders : List[OutputVideoEncoder] = [ 'libx264', 'libx265', 'libvpx-vp9', 'h264_nvenc', 'hevc_nvenc', 'h264_amf', 'hevc_amf' ]
@@ -36,18 +38,36 @@ execution_provider_set : ExecutionProviderSet =\
 	'rocm': 'ROCMExecutionProvider'
 }
 
+execution_graph_optimization_levels : List[ExecutionGraphOptimizationLevel] = [ 'disable', 'basic', 'extended', 'all' ]
+execution_modes : List[ExecutionMode] = [ 'sequential', 'parallel' ]
+execution_memory_arena_strategies : List[ExecutionMemoryArenaStrategy] = [ 'power_of_two', 'same_as_requested', 'disabled' ]
+execution_model_precisions : List[ExecutionModelPrecision] = [ 'fp32', 'int8' ]
+
 ui_workflows : List[UiWorkflow] = [ 'instant_runner', 'job_runner', 'job_manager' ]
 
-job_statuses : List[JobStatus] = [ 'drafted', 'queued', 'completed', 'failed' ]
+job_statuses : List[JobStatus] = [ 'drafted', 'queued', 'running', 'completed', 'failed' ]
+
+quantize_methods : List[QuantizeMethod] = [ 'dynamic', 'static' ]
 
 execution_thread_count_range : List[int] = create_int_range(1, 32, 1)
+execution_pool_types : List[ExecutionPoolType] = [ 'thread', 'process' ]
 execution_queue_count_range : List[int] = create_int_range(1, 4, 1)
+execution_segment_count_range : List[int] = create_int_range(1, 64, 1)
+execution_step_count_range : List[int] = create_int_range(1, 16, 1)
+execution_op_thread_count_range : List[int] = create_int_range(0, 64, 1)
+execution_session_replica_count_range : List[int] = create_int_range(1, 8, 1)
 system_memory_limit_range : List[int] = create_int_range(0, 128, 4)
+face_store_memory_limit_range : List[int] = create_int_range(0, 8192, 128)
+inference_memory_limit_range : List[int] = create_int_range(0, 65536, 512)
 face_detector_angles : List[Angle] = create_int_range(0, 270, 90)
 face_detector_score_range : List[Score] = create_float_range(0.0, 1.0, 0.05)
 face_landmarker_score_range : List[Score] = create_float_range(0.0, 1.0, 0.05)
+face_tracker_interval_range : List[int] = create_int_range(0, 60, 1)
 face_mask_blur_range : List[float] = create_float_range(0.0, 1.0, 0.05)
 face_mask_padding_range : List[int] = create_int_range(0, 100, 1)
+duplicate_frame_threshold_range : List[float] = create_float_range(0.0, 5.0, 0.25)
 reference_face_distance_range : List[float] = create_float_range(0.0, 1.5, 0.05)
 output_image_quality_range : List[int] = create_int_range(0, 100, 1)
 output_video_quality_range : List[int] = create_int_range(0, 100, 1)
+quantize_frame_total_range : List[int] = create_int_range(1, 64, 1)
+quantize_similarity_range : List[float] = create_float_range(0.0, 1.0, 0.01)
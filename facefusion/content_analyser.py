@@ -1,5 +1,4 @@
 from functools import lru_cache
-from time import sleep
 from typing import Any
 
 import cv2
@@ -8,13 +7,12 @@ from tqdm import tqdm
 
 from facefusion import process_manager, state_manager, wording
 from facefusion.download import conditional_download
-from facefusion.execution import create_inference_session
 from facefusion.filesystem import is_file, resolve_relative_path
-from facefusion.thread_helper import conditional_thread_semaphore, thread_lock
+from facefusion.inference_manager import clear_inference_sessions, get_inference_session
+from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.typing import Fps, ModelSet, VisionFrame
 from facefusion.vision import count_video_frame_total, detect_video_fps, get_video_frame, read_image
 
-CONTENT_ANALYSER = None
 MODELS : ModelSet =\
 {
 	'open_nsfw':
@@ -29,21 +27,12 @@ STREAM_COUNTER = 0
 
 
 def get_content_analyser() -> Any:
-	global CONTENT_ANALYSER
-
-	with thread_lock():
-		while process_manager.is_checking():
-			sleep(0.5)
-		if CONTENT_ANALYSER is None:
-			model_path = MODELS.get('open_nsfw').get('path')
-			CONTENT_ANALYSER = create_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-	return CONTENT_ANALYSER
+	model_path = MODELS.get('open_nsfw').get('path')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
 
 
 def clear_content_analyser() -> None:
-	global CONTENT_ANALYSER
-
-	CONTENT_ANALYSER = None
+	clear_inference_sessions([ MODELS.get('open_nsfw').get('path') ])
 
 
 def pre_check() -> bool:
@@ -71,7 +60,7 @@ def analyse_frame(vision_frame : VisionFrame) -> bool:
 	content_analyser = get_content_analyser()
 	vision_frame = prepare_frame(vision_frame)
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(content_analyser):
 		probability = content_analyser.run(None,
 		{
 			content_analyser.get_inputs()[0].name: vision_frame
@@ -1,32 +1,44 @@
 import shutil
 import signal
 import sys
+import threading
+from functools import partial
 from time import sleep, time
+from types import ModuleType
+from typing import List
 
 import numpy
 import onnxruntime
 
 from facefusion import content_analyser, face_analyser, face_masker, logger, process_manager, state_manager, voice_extractor, wording
 from facefusion.args import apply_args, collect_job_args, reduce_step_args
+from facefusion.checkpoint import create_checkpoint, finish_checkpoint_pass, is_checkpoint_enabled, is_checkpoint_pass_done, resume_checkpoint, start_checkpoint_pass
 from facefusion.common_helper import get_first
 from facefusion.content_analyser import analyse_image, analyse_video
 from facefusion.download import conditional_download
 from facefusion.exit_helper import conditional_exit, graceful_exit, hard_exit
 from facefusion.face_analyser import get_average_face, get_many_faces, get_one_face
 from facefusion.face_selector import sort_and_filter_faces
-from facefusion.face_store import append_reference_face, get_reference_faces
+from facefusion.face_store import append_reference_face, clear_frame_faces, get_reference_faces
+from facefusion.face_tracker import clear_face_tracks
 from facefusion.ffmpeg import copy_image, extract_frames, finalize_image, merge_video, replace_audio, restore_audio
-from facefusion.filesystem import filter_audio_paths, is_image, is_video, list_directory, resolve_relative_path
+from facefusion.filesystem import filter_audio_paths, has_image, is_image, is_video, list_directory, resolve_relative_path
+from facefusion.frame_deduplicator import calc_duplicate_frame_ratio, clear_duplicate_frames, detect_duplicate_frames, get_duplicate_frame_store, init_duplicate_frames, restore_duplicate_frames, should_skip_duplicate_frames
+from facefusion.inference_manager import warm_up_inference_sessions
 from facefusion.jobs import job_helper, job_manager, job_runner
 from facefusion.jobs.job_list import compose_job_list
+from facefusion.jobs.job_segmenter import split_step_args
 from facefusion.memory import limit_system_memory
+from facefusion.model_quantizer import quantize_models
 from facefusion.processors.frame import expression_restorer
-from facefusion.processors.frame.core import clear_frame_processors_modules, get_frame_processors_modules
+from facefusion.processors.frame.core import get_frame_processors_modules, multi_process_frames, multi_process_stream, process_chain_frames, reset_frame_processors_modules, share_frame_executor
 from facefusion.program import create_program
 from facefusion.program_helper import validate_args
+from facefusion.shot_detector import detect_shot_index
 from facefusion.statistics import conditional_log_statistics
+from facefusion.telemetry import count_telemetry_frames, start_telemetry_phase, stop_telemetry_phase
 from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_file_path, get_temp_frame_paths, move_temp_file
-from facefusion.typing import Args, ErrorCode
+from facefusion.typing import Args, ErrorCode, InferenceSessionGetter
 from facefusion.vision import get_video_frame, pack_resolution, read_image, read_static_images, restrict_image_resolution, restrict_video_fps, restrict_video_resolution, unpack_resolution
 
 onnxruntime.set_default_logger_severity(3)
@@ -61,12 +73,17 @@ def run(args : Args) -> None:
 		hard_exit(error_code)
 	if not pre_check():
 		return conditional_exit(2)
-	if state_manager.get_item('command') in [ 'run', 'run-headless' ]:
+	if state_manager.get_item('command') in [ 'run', 'run-headless', 'quantize' ]:
 		if not content_analyser.pre_check() or not face_analyser.pre_check() or not face_masker.pre_check() or not voice_extractor.pre_check() or not expression_restorer.pre_check():
 			return conditional_exit(2)
 		for frame_processor_module in get_frame_processors_modules(state_manager.get_item('frame_processors')):
 			if not frame_processor_module.pre_check():
 				return conditional_exit(2)
+	if state_manager.get_item('command') in [ 'run', 'run-headless' ] and can_warm_up_inference_sessions():
+		threading.Thread(target = warm_up_inference_sessions, args = (collect_inference_session_getters(),), daemon = True).start()
+	if state_manager.get_item('command') == 'quantize':
+		error_code = quantize_models(collect_inference_session_getters())
+		hard_exit(error_code)
 	if state_manager.get_item('command') == 'run':
 		import facefusion.uis.core as ui
 
@@ -96,6 +113,39 @@ def pre_check() -> bool:
 	return True
 
 
+def can_warm_up_inference_sessions() -> bool:
+	return state_manager.get_item('execution_pool_type') != 'process' and job_runner.calc_step_worker_total() == 1
+
+
+def collect_inference_session_getters() -> List[InferenceSessionGetter]:
+	inference_session_getters : List[InferenceSessionGetter] = [ content_analyser.get_content_analyser, partial(face_analyser.get_face_landmarker, '68_5') ]
+	face_attributes = face_analyser.get_face_attributes()
+
+	if state_manager.get_item('face_detector_model') in [ 'many', 'retinaface' ]:
+		inference_session_getters.append(partial(face_analyser.get_face_detector, 'retinaface'))
+	if state_manager.get_item('face_detector_model') in [ 'many', 'scrfd' ]:
+		inference_session_getters.append(partial(face_analyser.get_face_detector, 'scrfd'))
+	if state_manager.get_item('face_detector_model') in [ 'many', 'yoloface' ]:
+		inference_session_getters.append(partial(face_analyser.get_face_detector, 'yoloface'))
+	if state_manager.get_item('face_landmarker_score') > 0:
+		inference_session_getters.append(partial(face_analyser.get_face_landmarker, '68'))
+	if has_image(state_manager.get_item('source_paths')) or 'embedding' in face_attributes:
+		inference_session_getters.append(face_analyser.get_face_recognizer)
+	if has_image(state_manager.get_item('source_paths')) or 'gender_age' in face_attributes:
+		inference_session_getters.append(face_analyser.get_gender_age)
+	if 'occlusion' in state_manager.get_item('face_mask_types'):
+		inference_session_getters.append(face_masker.get_face_occluder)
+	if 'region' in state_manager.get_item('face_mask_types'):
+		inference_session_getters.append(face_masker.get_face_parser)
+	if 'lip_syncer' in state_manager.get_item('frame_processors'):
+		inference_session_getters.append(voice_extractor.get_voice_extractor)
+	if 'face_swapper' in state_manager.get_item('frame_processors') and state_manager.get_item('face_swapper_expression_restorer'):
+		inference_session_getters.append(expression_restorer.get_expression_restorer)
+	for frame_processor_module in get_frame_processors_modules(state_manager.get_item('frame_processors')):
+		inference_session_getters.append(frame_processor_module.get_frame_processor)
+	return inference_session_getters
+
+
 def conditional_process() -> ErrorCode:
 	start_time = time()
 	for frame_processor_module in get_frame_processors_modules(state_manager.get_item('frame_processors')):
@@ -185,7 +235,7 @@ def route_job_manager(args : Args) -> ErrorCode:
 		logger.error(wording.get('job_all_not_deleted'), __name__.upper())
 		return 1
 	if state_manager.get_item('command') == 'job-list':
-		job_headers, job_contents = compose_job_list(state_manager.get_item('job_status'))
+		job_headers, job_contents = compose_job_list(state_manager.get_item('job_status'), state_manager.get_item('show_throughput'))
 
 		if job_contents:
 			logger.table(job_headers, job_contents)
@@ -262,7 +312,7 @@ def process_step(job_id : str, step_index : int, step_args : Args) -> bool:
 	step_total = job_manager.count_step_total(job_id)
 	logger.info(wording.get('processing_step').format(step_current = step_index + 1, step_total = step_total), __name__.upper())
 	apply_args(args)
-	clear_frame_processors_modules()
+	reset_frame_processors_modules()
 	error_code = conditional_process()
 	return error_code == 0
 
@@ -270,8 +320,11 @@ def process_step(job_id : str, step_index : int, step_args : Args) -> bool:
 def process_headless(args : Args) -> ErrorCode:
 	job_id = job_helper.suggest_job_id('headless')
 	step_args = reduce_step_args(args)
+	segment_steps_args = split_step_args(step_args, state_manager.get_item('execution_segment_count'))
 
-	if job_manager.create_job(job_id) and job_manager.add_step(job_id, step_args) and job_manager.submit_job(job_id) and job_runner.run_job(job_id, process_step):
+	if len(segment_steps_args) > 1:
+		logger.info(wording.get('splitting_video').format(segment_total = len(segment_steps_args)), __name__.upper())
+	if job_manager.create_job(job_id) and all(job_manager.add_step(job_id, segment_step_args) for segment_step_args in segment_steps_args) and job_manager.submit_job(job_id) and job_runner.run_job(job_id, process_step):
 		return 0
 	return 1
 
@@ -282,6 +335,8 @@ def process_image(start_time : float) -> ErrorCode:
 	# clear temp
 	logger.debug(wording.get('clearing_temp'), __name__.upper())
 	clear_temp_directory(state_manager.get_item('target_path'))
+	clear_frame_faces()
+	clear_face_tracks()
 	# create temp
 	logger.debug(wording.get('creating_temp'), __name__.upper())
 	create_temp_directory(state_manager.get_item('target_path'))
@@ -289,7 +344,9 @@ def process_image(start_time : float) -> ErrorCode:
 	process_manager.start()
 	temp_image_resolution = pack_resolution(restrict_image_resolution(state_manager.get_item('target_path'), unpack_resolution(state_manager.get_item('output_image_resolution'))))
 	logger.info(wording.get('copying_image').format(resolution = temp_image_resolution), __name__.upper())
+	start_telemetry_phase('copy')
 	if copy_image(state_manager.get_item('target_path'), temp_image_resolution):
+		stop_telemetry_phase('copy')
 		logger.debug(wording.get('copying_image_succeed'), __name__.upper())
 	else:
 		logger.error(wording.get('copying_image_failed'), __name__.upper())
@@ -299,20 +356,27 @@ def process_image(start_time : float) -> ErrorCode:
 	temp_file_path = get_temp_file_path(state_manager.get_item('target_path'))
 	for frame_processor_module in get_frame_processors_modules(state_manager.get_item('frame_processors')):
 		logger.info(wording.get('processing'), frame_processor_module.NAME)
+		start_telemetry_phase(get_telemetry_phase_name(frame_processor_module))
 		frame_processor_module.process_image(state_manager.get_item('source_paths'), temp_file_path, temp_file_path)
 		frame_processor_module.post_process()
+		stop_telemetry_phase(get_telemetry_phase_name(frame_processor_module))
 	if is_process_stopping():
 		process_manager.end()
 		return 4
+	count_telemetry_frames(1)
 	# finalize image
 	logger.info(wording.get('finalizing_image').format(resolution = state_manager.get_item('output_image_resolution')), __name__.upper())
+	start_telemetry_phase('finalize')
 	if finalize_image(state_manager.get_item('target_path'), state_manager.get_item('output_path'), state_manager.get_item('output_image_resolution')):
 		logger.debug(wording.get('finalizing_image_succeed'), __name__.upper())
 	else:
 		logger.warn(wording.get('finalizing_image_skipped'), __name__.upper())
+	stop_telemetry_phase('finalize')
 	# clear temp
 	logger.debug(wording.get('clearing_temp'), __name__.upper())
 	clear_temp_directory(state_manager.get_item('target_path'))
+	clear_frame_faces()
+	clear_face_tracks()
 	# validate image
 	if is_image(state_manager.get_item('output_path')):
 		seconds = '{:.2f}'.format((time() - start_time) % 60)
@@ -332,48 +396,117 @@ def process_video(start_time : float) -> ErrorCode:
 	# clear temp
 	logger.debug(wording.get('clearing_temp'), __name__.upper())
 	clear_temp_directory(state_manager.get_item('target_path'))
+	clear_frame_faces()
+	clear_face_tracks()
+	clear_duplicate_frames()
 	# create temp
 	logger.debug(wording.get('creating_temp'), __name__.upper())
 	create_temp_directory(state_manager.get_item('target_path'))
-	# extract frames
 	process_manager.start()
 	temp_video_resolution = pack_resolution(restrict_video_resolution(state_manager.get_item('target_path'), unpack_resolution(state_manager.get_item('output_video_resolution'))))
 	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
-	logger.info(wording.get('extracting_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__.upper())
-	if extract_frames(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps):
-		logger.debug(wording.get('extracting_frames_succeed'), __name__.upper())
-	else:
-		if is_process_stopping():
+	# detect shots
+	if state_manager.get_item('face_tracker_interval'):
+		shot_index = detect_shot_index(state_manager.get_item('target_path'))
+		if shot_index:
+			logger.debug(wording.get('detecting_shots_succeed').format(shot_total = len(shot_index.get('shot_boundaries')) + 1), __name__.upper())
+	if state_manager.get_item('frame_extraction_mode') == 'pipe':
+		# stream frames
+		logger.info(wording.get('streaming_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__.upper())
+		start_telemetry_phase('stream')
+		if multi_process_stream(state_manager.get_item('source_paths'), state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps, state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps')):
+			stop_telemetry_phase('stream')
+			logger.debug(wording.get('streaming_frames_succeed'), __name__.upper())
+		else:
+			if is_process_stopping():
+				process_manager.end()
+				return 4
+			logger.error(wording.get('streaming_frames_failed'), __name__.upper())
 			process_manager.end()
-			return 4
-		logger.error(wording.get('extracting_frames_failed'), __name__.upper())
-		process_manager.end()
-		return 1
-	# process frames
-	temp_frame_paths = get_temp_frame_paths(state_manager.get_item('target_path'))
-	if temp_frame_paths:
+			return 1
 		for frame_processor_module in get_frame_processors_modules(state_manager.get_item('frame_processors')):
-			logger.info(wording.get('processing'), frame_processor_module.NAME)
-			frame_processor_module.process_video(state_manager.get_item('source_paths'), temp_frame_paths)
 			frame_processor_module.post_process()
-		if is_process_stopping():
-			return 4
-	else:
-		logger.error(wording.get('temp_frames_not_found'), __name__.upper())
-		process_manager.end()
-		return 1
-	# merge video
-	logger.info(wording.get('merging_video').format(resolution = state_manager.get_item('output_video_resolution'), fps = state_manager.get_item('output_video_fps')), __name__.upper())
-	if merge_video(state_manager.get_item('target_path'), state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps')):
-		logger.debug(wording.get('merging_video_succeed'), __name__.upper())
 	else:
-		if is_process_stopping():
+		checkpoint = resume_checkpoint(state_manager.get_item('target_path')) if is_checkpoint_enabled() else None
+		if checkpoint:
+			logger.info(wording.get('resuming_checkpoint').format(frame_total = checkpoint.get('frame_total')), __name__.upper())
+		else:
+			# extract frames
+			logger.info(wording.get('extracting_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__.upper())
+			start_telemetry_phase('extract')
+			if extract_frames(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps):
+				stop_telemetry_phase('extract')
+				logger.debug(wording.get('extracting_frames_succeed'), __name__.upper())
+			else:
+				if is_process_stopping():
+					process_manager.end()
+					return 4
+				logger.error(wording.get('extracting_frames_failed'), __name__.upper())
+				process_manager.end()
+				return 1
+		# process frames
+		temp_frame_paths = get_temp_frame_paths(state_manager.get_item('target_path'))
+		if temp_frame_paths:
+			if checkpoint:
+				init_duplicate_frames(checkpoint.get('duplicate_frame_paths'), len(temp_frame_paths))
+			elif should_skip_duplicate_frames():
+				detect_duplicate_frames(temp_frame_paths)
+			if is_checkpoint_enabled() and not checkpoint:
+				create_checkpoint(state_manager.get_item('target_path'), len(temp_frame_paths), get_duplicate_frame_store().get('frame_paths'))
+			with share_frame_executor():
+				if state_manager.get_item('fuse_frame_processors'):
+					if is_checkpoint_pass_done(state_manager.get_item('target_path'), 'fuse_frame_processors'):
+						logger.info(wording.get('processing_checkpoint_skipped'), __name__.upper())
+					else:
+						start_checkpoint_pass(state_manager.get_item('target_path'), 'fuse_frame_processors')
+						logger.info(wording.get('processing'), __name__.upper())
+						start_telemetry_phase('fuse_frame_processors')
+						multi_process_frames(state_manager.get_item('source_paths'), temp_frame_paths, process_chain_frames)
+						for frame_processor_module in get_frame_processors_modules(state_manager.get_item('frame_processors')):
+							frame_processor_module.post_process()
+						stop_telemetry_phase('fuse_frame_processors')
+						if not process_manager.is_stopping():
+							finish_checkpoint_pass(state_manager.get_item('target_path'), 'fuse_frame_processors')
+				else:
+					for frame_processor_module in get_frame_processors_modules(state_manager.get_item('frame_processors')):
+						if is_checkpoint_pass_done(state_manager.get_item('target_path'), frame_processor_module.NAME):
+							logger.info(wording.get('processing_checkpoint_skipped'), frame_processor_module.NAME)
+						else:
+							start_checkpoint_pass(state_manager.get_item('target_path'), frame_processor_module.NAME)
+							logger.info(wording.get('processing'), frame_processor_module.NAME)
+							start_telemetry_phase(get_telemetry_phase_name(frame_processor_module))
+							frame_processor_module.process_video(state_manager.get_item('source_paths'), temp_frame_paths)
+							frame_processor_module.post_process()
+							stop_telemetry_phase(get_telemetry_phase_name(frame_processor_module))
+							if process_manager.is_stopping():
+								break
+							finish_checkpoint_pass(state_manager.get_item('target_path'), frame_processor_module.NAME)
+			if is_process_stopping():
+				return 4
+			if not restore_duplicate_frames():
+				logger.error(wording.get('restoring_duplicate_frames_failed'), __name__.upper())
+				process_manager.end()
+				return 1
+			count_telemetry_frames(len(temp_frame_paths))
+		else:
+			logger.error(wording.get('temp_frames_not_found'), __name__.upper())
 			process_manager.end()
-			return 4
-		logger.error(wording.get('merging_video_failed'), __name__.upper())
-		process_manager.end()
-		return 1
+			return 1
+		# merge video
+		logger.info(wording.get('merging_video').format(resolution = state_manager.get_item('output_video_resolution'), fps = state_manager.get_item('output_video_fps')), __name__.upper())
+		start_telemetry_phase('merge')
+		if merge_video(state_manager.get_item('target_path'), state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps')):
+			stop_telemetry_phase('merge')
+			logger.debug(wording.get('merging_video_succeed'), __name__.upper())
+		else:
+			if is_process_stopping():
+				process_manager.end()
+				return 4
+			logger.error(wording.get('merging_video_failed'), __name__.upper())
+			process_manager.end()
+			return 1
 	# handle audio
+	start_telemetry_phase('audio')
 	if state_manager.get_item('skip_audio'):
 		logger.info(wording.get('skipping_audio'), __name__.upper())
 		move_temp_file(state_manager.get_item('target_path'), state_manager.get_item('output_path'))
@@ -397,12 +530,19 @@ def process_video(start_time : float) -> ErrorCode:
 					return 4
 				logger.warn(wording.get('restoring_audio_skipped'), __name__.upper())
 				move_temp_file(state_manager.get_item('target_path'), state_manager.get_item('output_path'))
+	stop_telemetry_phase('audio')
 	# clear temp
 	logger.debug(wording.get('clearing_temp'), __name__.upper())
 	clear_temp_directory(state_manager.get_item('target_path'))
+	clear_frame_faces()
+	clear_face_tracks()
 	# validate video
 	if is_video(state_manager.get_item('output_path')):
 		seconds = '{:.2f}'.format((time() - start_time))
+		if should_skip_duplicate_frames():
+			duplicate_frame_store = get_duplicate_frame_store()
+			duplicate_frame_ratio = '{:.2f}'.format(calc_duplicate_frame_ratio() * 100)
+			logger.info(wording.get('skipping_duplicate_frames').format(duplicate_frame_total = duplicate_frame_store.get('duplicate_frame_total'), frame_total = duplicate_frame_store.get('frame_total'), duplicate_frame_ratio = duplicate_frame_ratio), __name__.upper())
 		logger.info(wording.get('processing_video_succeed').format(seconds = seconds), __name__.upper())
 		conditional_log_statistics()
 	else:
@@ -413,6 +553,10 @@ def process_video(start_time : float) -> ErrorCode:
 	return 0
 
 
+def get_telemetry_phase_name(frame_processor_module : ModuleType) -> str:
+	return frame_processor_module.__name__.split('.')[-1]
+
+
 def is_process_stopping() -> bool:
 	if process_manager.is_stopping():
 		process_manager.end()
@@ -1,12 +1,32 @@
+import hashlib
+import os
+import platform
 import subprocess
+import uuid
 import xml.etree.ElementTree as ElementTree
 from functools import lru_cache
-from typing import Any, List
+from typing import Any, Dict, List, Optional
 
-from onnxruntime import InferenceSession, get_available_providers
+import onnxruntime
+from onnxruntime import ExecutionMode, GraphOptimizationLevel, InferenceSession, SessionOptions, get_available_providers
 
+from facefusion import state_manager
 from facefusion.choices import execution_provider_set
-from facefusion.typing import ExecutionDevice, ExecutionProviderKey, ExecutionProviderSet, ExecutionProviderValue, ValueAndUnit
+from facefusion.filesystem import create_directory, get_file_size, get_file_time, is_file, remove_file
+from facefusion.typing import ExecutionDevice, ExecutionGraphOptimizationLevel, ExecutionMode as ExecutionModeKey, ExecutionProviderKey, ExecutionProviderSet, ExecutionProviderValue, ValueAndUnit
+
+EXECUTION_GRAPH_OPTIMIZATION_LEVELS : Dict[ExecutionGraphOptimizationLevel, GraphOptimizationLevel] =\
+{
+	'disable': GraphOptimizationLevel.ORT_DISABLE_ALL,
+	'basic': GraphOptimizationLevel.ORT_ENABLE_BASIC,
+	'extended': GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+	'all': GraphOptimizationLevel.ORT_ENABLE_ALL
+}
+EXECUTION_MODES : Dict[ExecutionModeKey, ExecutionMode] =\
+{
+	'sequential': ExecutionMode.ORT_SEQUENTIAL,
+	'parallel': ExecutionMode.ORT_PARALLEL
+}
 
 
 def get_execution_provider_choices() -> List[ExecutionProviderKey]:
@@ -40,7 +60,8 @@ def apply_execution_provider_options(execution_device_id : str, execution_provid
 			execution_providers_with_options.append((execution_provider,
 			{
 				'device_id': execution_device_id,
-				'cudnn_conv_algo_search': 'EXHAUSTIVE' if use_exhaustive() else 'DEFAULT'
+				'cudnn_conv_algo_search': 'EXHAUSTIVE' if use_exhaustive() else 'DEFAULT',
+				**apply_memory_arena_options()
 			}))
 		elif execution_provider == 'OpenVINOExecutionProvider':
 			execution_providers_with_options.append((execution_provider,
@@ -48,7 +69,13 @@ def apply_execution_provider_options(execution_device_id : str, execution_provid
 				'device_type': 'GPU.' + execution_device_id,
 				'precision': 'FP32'
 			}))
-		elif execution_provider in [ 'DmlExecutionProvider', 'ROCMExecutionProvider' ]:
+		elif execution_provider == 'ROCMExecutionProvider':
+			execution_providers_with_options.append((execution_provider,
+			{
+				'device_id': execution_device_id,
+				**apply_memory_arena_options()
+			}))
+		elif execution_provider == 'DmlExecutionProvider':
 			execution_providers_with_options.append((execution_provider,
 			{
 				'device_id': execution_device_id
@@ -62,6 +89,40 @@ def apply_execution_provider_options(execution_device_id : str, execution_provid
 	return execution_providers_with_options
 
 
+def apply_memory_arena_options() -> Dict[str, str]:
+	if state_manager.get_item('execution_memory_arena_strategy') in [ 'same_as_requested', 'disabled' ]:
+		return\
+		{
+			'arena_extend_strategy': 'kSameAsRequested'
+		}
+	return {}
+
+
+def create_session_options(execution_provider_keys : List[ExecutionProviderKey]) -> SessionOptions:
+	session_options = SessionOptions()
+	session_options.graph_optimization_level = EXECUTION_GRAPH_OPTIMIZATION_LEVELS.get(state_manager.get_item('execution_graph_optimization_level'), GraphOptimizationLevel.ORT_ENABLE_ALL)
+	session_options.execution_mode = EXECUTION_MODES.get(state_manager.get_item('execution_mode'), ExecutionMode.ORT_SEQUENTIAL)
+	session_options.intra_op_num_threads = calc_intra_op_thread_count()
+	session_options.inter_op_num_threads = state_manager.get_item('execution_inter_op_thread_count') or 0
+
+	if state_manager.get_item('execution_memory_arena_strategy') == 'disabled':
+		session_options.enable_cpu_mem_arena = False
+		session_options.enable_mem_pattern = False
+	if 'directml' in execution_provider_keys:
+		session_options.execution_mode = ExecutionMode.ORT_SEQUENTIAL
+		session_options.enable_mem_pattern = False
+	return session_options
+
+
+def calc_intra_op_thread_count() -> int:
+	execution_intra_op_thread_count = state_manager.get_item('execution_intra_op_thread_count') or 0
+	execution_session_replica_count = state_manager.get_item('execution_session_replica_count') or 1
+
+	if execution_session_replica_count > 1:
+		return max((execution_intra_op_thread_count or os.cpu_count() or 1) // execution_session_replica_count, 1)
+	return execution_intra_op_thread_count
+
+
 def use_exhaustive() -> bool:
 	execution_devices = detect_static_execution_devices()
 	product_names = ('GeForce GTX 1630', 'GeForce GTX 1650', 'GeForce GTX 1660')
@@ -70,7 +131,70 @@ def use_exhaustive() -> bool:
 
 
 def create_inference_session(model_path : str, execution_device_id : str, execution_provider_keys : List[ExecutionProviderKey]) -> InferenceSession:
-	return InferenceSession(model_path, providers = apply_execution_provider_options(execution_device_id, execution_provider_keys))
+	model_path = resolve_quantized_model_path(model_path, execution_provider_keys)
+	execution_providers = apply_execution_provider_options(execution_device_id, execution_provider_keys)
+	session_options = create_session_options(execution_provider_keys)
+	optimized_model_path = resolve_optimized_model_path(model_path, execution_device_id, execution_provider_keys)
+
+	if optimized_model_path:
+		if is_file(optimized_model_path):
+			session_options.graph_optimization_level = GraphOptimizationLevel.ORT_DISABLE_ALL
+			try:
+				return InferenceSession(optimized_model_path, sess_options = session_options, providers = execution_providers)
+			except Exception:
+				remove_file(optimized_model_path)
+				session_options = create_session_options(execution_provider_keys)
+		else:
+			return create_optimized_inference_session(model_path, optimized_model_path, session_options, execution_providers)
+	return InferenceSession(model_path, sess_options = session_options, providers = execution_providers)
+
+
+def create_optimized_inference_session(model_path : str, optimized_model_path : str, session_options : SessionOptions, execution_providers : List[Any]) -> InferenceSession:
+	optimized_model_temp_path = optimized_model_path + '.' + uuid.uuid4().hex + '.tmp'
+	session_options.optimized_model_filepath = optimized_model_temp_path
+
+	try:
+		inference_session = InferenceSession(model_path, sess_options = session_options, providers = execution_providers)
+	except Exception:
+		remove_file(optimized_model_temp_path)
+		session_options.optimized_model_filepath = ''
+		return InferenceSession(model_path, sess_options = session_options, providers = execution_providers)
+	if is_file(optimized_model_temp_path):
+		os.replace(optimized_model_temp_path, optimized_model_path)
+	return inference_session
+
+
+def resolve_optimized_model_path(model_path : str, execution_device_id : str, execution_provider_keys : List[ExecutionProviderKey]) -> Optional[str]:
+	execution_cache_path = state_manager.get_item('execution_cache_path')
+	execution_graph_optimization_level = state_manager.get_item('execution_graph_optimization_level')
+
+	if execution_cache_path and execution_graph_optimization_level in [ 'basic', 'extended', 'all' ] and can_cache_optimized_model(execution_provider_keys) and is_file(model_path) and create_directory(execution_cache_path):
+		model_name, _ = os.path.splitext(os.path.basename(model_path))
+		model_signature = '.'.join([ os.path.abspath(model_path), str(get_file_size(model_path)), str(get_file_time(model_path)), onnxruntime.__version__, platform.machine(), execution_graph_optimization_level, execution_device_id, *execution_provider_keys ])
+		return os.path.join(execution_cache_path, model_name + '.' + hashlib.sha1(model_signature.encode()).hexdigest()[:16] + '.onnx')
+	return None
+
+
+def resolve_quantized_model_path(model_path : str, execution_provider_keys : List[ExecutionProviderKey]) -> str:
+	if state_manager.get_item('execution_model_precision') == 'int8' and execution_provider_keys == [ 'cpu' ]:
+		quantized_model_path = get_quantized_model_path(model_path)
+
+		if is_file(quantized_model_path):
+			return quantized_model_path
+	return model_path
+
+
+def get_quantized_model_path(model_path : str) -> str:
+	model_base_path, model_extension = os.path.splitext(model_path)
+	return model_base_path + '.int8' + model_extension
+
+
+def can_cache_optimized_model(execution_provider_keys : List[ExecutionProviderKey]) -> bool:
+	return all(execution_provider_key in [ 'cpu', 'cuda', 'rocm' ] for execution_provider_key in execution_provider_keys)
+
+
+def has_dynamic_batch_size(inference_session : InferenceSession) -> bool:
+	return all(not isinstance(inference_session_input.shape[0], int) for inference_session_input in inference_session.get_inputs())
 
 
 def run_nvidia_smi() -> subprocess.Popen[bytes]:
@@ -1,21 +1,23 @@
-from time import sleep
 from typing import Any, List, Optional, Tuple
 
 import cv2
 import numpy
+from onnxruntime import InferenceSession
 
+import facefusion.choices
 from facefusion import process_manager, state_manager
 from facefusion.common_helper import get_first
 from facefusion.download import conditional_download
-from facefusion.execution import create_inference_session
+from facefusion.execution import has_dynamic_batch_size
 from facefusion.face_helper import apply_nms, convert_to_face_landmark_5, create_rotated_matrix_and_size, create_static_anchors, distance_to_bounding_box, distance_to_face_landmark_5, estimate_face_angle_from_face_landmark_68, estimate_matrix_by_face_landmark_5, get_nms_threshold, normalize_bounding_box, transform_bounding_box, transform_points, warp_face_by_face_landmark_5, warp_face_by_translation
-from facefusion.face_store import get_static_faces, set_static_faces
+from facefusion.face_store import get_frame_faces, get_static_faces, set_frame_faces, set_static_faces
+from facefusion.face_tracker import set_face_track, track_faces
 from facefusion.filesystem import is_file, resolve_relative_path
-from facefusion.thread_helper import conditional_thread_semaphore, thread_lock, thread_semaphore
-from facefusion.typing import Angle, BoundingBox, Embedding, Face, FaceLandmark5, FaceLandmark68, FaceLandmarkSet, FaceScoreSet, ModelSet, Score, VisionFrame
+from facefusion.inference_manager import clear_inference_sessions, get_inference_session
+from facefusion.thread_helper import conditional_thread_semaphore, thread_semaphore
+from facefusion.typing import Angle, BoundingBox, Embedding, Face, FaceAttribute, FaceDetectorModel, FaceLandmark5, FaceLandmark68, FaceLandmarkSet, FaceLandmarkerModel, FaceScoreSet, ModelSet, Score, VisionFrame
 from facefusion.vision import resize_frame_resolution, unpack_resolution
 
-FACE_ANALYSER = None
 MODELS : ModelSet =\
 {
 	'face_detector_retinaface':
@@ -76,50 +78,28 @@ MODELS : ModelSet =\
 }
 
 
-def get_face_analyser() -> Any:
-	global FACE_ANALYSER
-
-	face_detectors = {}
-	face_recognizer = None
-	face_landmarkers = {}
-
-	with thread_lock():
-		while process_manager.is_checking():
-			sleep(0.5)
-		if FACE_ANALYSER is None:
-			if state_manager.get_item('face_detector_model') in [ 'many', 'retinaface' ]:
-				face_detectors['retinaface'] = create_inference_session(MODELS.get('face_detector_retinaface').get('path'), state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-			if state_manager.get_item('face_detector_model') in [ 'many', 'scrfd' ]:
-				face_detectors['scrfd'] = create_inference_session(MODELS.get('face_detector_scrfd').get('path'), state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-			if state_manager.get_item('face_detector_model') in [ 'many', 'yoloface' ]:
-				face_detectors['yoloface'] = create_inference_session(MODELS.get('face_detector_yoloface').get('path'), state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-			if state_manager.get_item('face_recognizer_model') == 'arcface_blendswap':
-				face_recognizer = create_inference_session(MODELS.get('face_recognizer_arcface_blendswap').get('path'), state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-			if state_manager.get_item('face_recognizer_model') == 'arcface_ghost':
-				face_recognizer = create_inference_session(MODELS.get('face_recognizer_arcface_ghost').get('path'), state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-			if state_manager.get_item('face_recognizer_model') == 'arcface_inswapper':
-				face_recognizer = create_inference_session(MODELS.get('face_recognizer_arcface_inswapper').get('path'), state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-			if state_manager.get_item('face_recognizer_model') == 'arcface_simswap':
-				face_recognizer = create_inference_session(MODELS.get('face_recognizer_arcface_simswap').get('path'), state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-			if state_manager.get_item('face_recognizer_model') == 'arcface_uniface':
-				face_recognizer = create_inference_session(MODELS.get('face_recognizer_arcface_uniface').get('path'), state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-			face_landmarkers['68'] = create_inference_session(MODELS.get('face_landmarker_68').get('path'), state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-			face_landmarkers['68_5'] = create_inference_session(MODELS.get('face_landmarker_68_5').get('path'), state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-			gender_age = create_inference_session(MODELS.get('gender_age').get('path'), state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-			FACE_ANALYSER =\
-			{
-				'face_detectors': face_detectors,
-				'face_recognizer': face_recognizer,
-				'face_landmarkers': face_landmarkers,
-				'gender_age': gender_age
-			}
-	return FACE_ANALYSER
+def get_face_detector(face_detector_model : FaceDetectorModel) -> Any:
+	model_path = MODELS.get('face_detector_' + face_detector_model).get('path')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
 
 
-def clear_face_analyser() -> Any:
-	global FACE_ANALYSER
+def get_face_recognizer() -> Any:
+	model_path = MODELS.get('face_recognizer_' + state_manager.get_item('face_recognizer_model')).get('path')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
+
+
+def get_face_landmarker(face_landmarker_model : FaceLandmarkerModel) -> Any:
+	model_path = MODELS.get('face_landmarker_' + face_landmarker_model).get('path')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
 
-	FACE_ANALYSER = None
+
+def get_gender_age() -> Any:
+	model_path = MODELS.get('gender_age').get('path')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
+
+
+def clear_face_analyser() -> Any:
+	clear_inference_sessions([ model.get('path') for model in MODELS.values() ])
 
 
 def pre_check() -> bool:
@@ -170,7 +150,7 @@ def pre_check() -> bool:
 
 
 def detect_with_retinaface(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[FaceLandmark5], List[Score]]:
-	face_detector = get_face_analyser().get('face_detectors').get('retinaface')
+	face_detector = get_face_detector('retinaface')
 	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
 	temp_vision_frame = resize_frame_resolution(vision_frame, (face_detector_width, face_detector_height))
 	ratio_height = vision_frame.shape[0] / temp_vision_frame.shape[0]
@@ -183,7 +163,7 @@ def detect_with_retinaface(vision_frame : VisionFrame, face_detector_size : str)
 	face_scores = []
 
 	detect_vision_frame = prepare_detect_frame(temp_vision_frame, face_detector_size)
-	with thread_semaphore():
+	with thread_semaphore(face_detector):
 		detections = face_detector.run(None,
 		{
 			face_detector.get_inputs()[0].name: detect_vision_frame
@@ -213,7 +193,7 @@ def detect_with_retinaface(vision_frame : VisionFrame, face_detector_size : str)
 
 
 def detect_with_scrfd(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[FaceLandmark5], List[Score]]:
-	face_detector = get_face_analyser().get('face_detectors').get('scrfd')
+	face_detector = get_face_detector('scrfd')
 	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
 	temp_vision_frame = resize_frame_resolution(vision_frame, (face_detector_width, face_detector_height))
 	ratio_height = vision_frame.shape[0] / temp_vision_frame.shape[0]
@@ -226,7 +206,7 @@ def detect_with_scrfd(vision_frame : VisionFrame, face_detector_size : str) -> T
 	face_scores = []
 
 	detect_vision_frame = prepare_detect_frame(temp_vision_frame, face_detector_size)
-	with thread_semaphore():
+	with thread_semaphore(face_detector):
 		detections = face_detector.run(None,
 		{
 			face_detector.get_inputs()[0].name: detect_vision_frame
@@ -256,7 +236,7 @@ def detect_with_scrfd(vision_frame : VisionFrame, face_detector_size : str) -> T
 
 
 def detect_with_yoloface(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[FaceLandmark5], List[Score]]:
-	face_detector = get_face_analyser().get('face_detectors').get('yoloface')
+	face_detector = get_face_detector('yoloface')
 	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
 	temp_vision_frame = resize_frame_resolution(vision_frame, (face_detector_width, face_detector_height))
 	ratio_height = vision_frame.shape[0] / temp_vision_frame.shape[0]
@@ -266,7 +246,7 @@ def detect_with_yoloface(vision_frame : VisionFrame, face_detector_size : str) -
 	face_scores = []
 
 	detect_vision_frame = prepare_detect_frame(temp_vision_frame, face_detector_size)
-	with thread_semaphore():
+	with thread_semaphore(face_detector):
 		detections = face_detector.run(None,
 		{
 			face_detector.get_inputs()[0].name: detect_vision_frame
@@ -336,127 +316,146 @@ def prepare_detect_frame(temp_vision_frame : VisionFrame, face_detector_size : s
 	return detect_vision_frame
 
 
-def create_faces(vision_frame : VisionFrame, bounding_boxes : List[BoundingBox], face_landmarks_5 : List[FaceLandmark5], face_scores : List[Score]) -> List[Face]:
-	faces = []
+def create_faces(vision_frame : VisionFrame, bounding_boxes : List[BoundingBox], face_landmarks_5 : List[FaceLandmark5], face_scores : List[Score], face_attributes : List[FaceAttribute]) -> List[Face]:
+	faces : List[Face] = []
 	nms_threshold = get_nms_threshold(state_manager.get_item('face_detector_model'), state_manager.get_item('face_detector_angles'))
 	keep_indices = apply_nms(bounding_boxes, face_scores, state_manager.get_item('face_detector_score'), nms_threshold)
 
-	for index in keep_indices:
-		bounding_box = bounding_boxes[index]
-		face_landmark_5_68 = face_landmarks_5[index]
-		face_landmark_68_5 = expand_face_landmark_68_from_5(face_landmark_5_68)
-		face_landmark_68 = face_landmark_68_5
-		face_landmark_68_score = 0.0
-		face_angle = estimate_face_angle_from_face_landmark_68(face_landmark_68_5)
-		if state_manager.get_item('face_landmarker_score') > 0:
-			face_landmark_68, face_landmark_68_score = detect_face_landmark_68(vision_frame, bounding_box, face_angle)
-			if face_landmark_68_score > state_manager.get_item('face_landmarker_score'):
-				face_landmark_5_68 = convert_to_face_landmark_5(face_landmark_68)
+	if len(keep_indices) == 0:
+		return faces
+	keep_bounding_boxes = [ bounding_boxes[index] for index in keep_indices ]
+	keep_face_landmarks_5 = [ face_landmarks_5[index] for index in keep_indices ]
+	face_landmarks_68_5 = expand_face_landmarks_68_from_5(keep_face_landmarks_5)
+	face_landmarks_68 = face_landmarks_68_5
+	face_landmark_68_scores = [ 0.0 ] * len(keep_indices)
+	face_landmarks_5_68 = keep_face_landmarks_5
+	face_angles = [ estimate_face_angle_from_face_landmark_68(face_landmark_68_5) for face_landmark_68_5 in face_landmarks_68_5 ]
+	if state_manager.get_item('face_landmarker_score') > 0:
+		face_landmarks_68, face_landmark_68_scores = detect_face_landmarks_68(vision_frame, keep_bounding_boxes, face_angles)
+		face_landmarks_5_68 = [ convert_to_face_landmark_5(face_landmark_68) if face_landmark_68_score > state_manager.get_item('face_landmarker_score') else face_landmark_5 for face_landmark_5, face_landmark_68, face_landmark_68_score in zip(keep_face_landmarks_5, face_landmarks_68, face_landmark_68_scores) ]
+
+	for index, keep_index in enumerate(keep_indices):
 		face_landmark_set : FaceLandmarkSet =\
 		{
-			'5': face_landmarks_5[index],
-			'5/68': face_landmark_5_68,
-			'68': face_landmark_68,
-			'68/5': face_landmark_68_5
+			'5': face_landmarks_5[keep_index],
+			'5/68': face_landmarks_5_68[index],
+			'68': face_landmarks_68[index],
+			'68/5': face_landmarks_68_5[index]
 		}
 		face_score_set : FaceScoreSet =\
 		{
-			'detector': face_scores[index],
-			'landmarker': face_landmark_68_score
+			'detector': face_scores[keep_index],
+			'landmarker': face_landmark_68_scores[index]
 		}
-		embedding, normed_embedding = calc_embedding(vision_frame, face_landmark_set.get('5/68'))
-		gender, age = detect_gender_age(vision_frame, bounding_box)
 		faces.append(Face(
-			bounding_box = bounding_box,
+			bounding_box = bounding_boxes[keep_index],
 			landmark_set = face_landmark_set,
 			score_set = face_score_set,
-			angle = face_angle,
-			embedding = embedding,
-			normed_embedding = normed_embedding,
-			gender = gender,
-			age = age
+			angle = face_angles[index],
+			embedding = None,
+			normed_embedding = None,
+			gender = None,
+			age = None
 		))
-	return faces
-
-
-def calc_embedding(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> Tuple[Embedding, Embedding]:
-	face_recognizer = get_face_analyser().get('face_recognizer')
-	crop_vision_frame, matrix = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, 'arcface_112_v2', (112, 112))
-	crop_vision_frame = crop_vision_frame / 127.5 - 1
-	crop_vision_frame = crop_vision_frame[:, :, ::-1].transpose(2, 0, 1).astype(numpy.float32)
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0)
-
-	with conditional_thread_semaphore():
-		embedding = face_recognizer.run(None,
-		{
-			face_recognizer.get_inputs()[0].name: crop_vision_frame
-		})[0]
-
-	embedding = embedding.ravel()
-	normed_embedding = embedding / numpy.linalg.norm(embedding)
-	return embedding, normed_embedding
-
-
-def detect_face_landmark_68(temp_vision_frame : VisionFrame, bounding_box : BoundingBox, face_angle : Angle) -> Tuple[FaceLandmark68, Score]:
-	face_landmarker = get_face_analyser().get('face_landmarkers').get('68')
-	scale = 195 / numpy.subtract(bounding_box[2:], bounding_box[:2]).max().clip(1, None)
-	translation = (256 - numpy.add(bounding_box[2:], bounding_box[:2]) * scale) * 0.5
-	rotated_matrix, rotated_size = create_rotated_matrix_and_size(face_angle, (256, 256))
-	crop_vision_frame, affine_matrix = warp_face_by_translation(temp_vision_frame, translation, scale, (256, 256))
-	crop_vision_frame = cv2.warpAffine(crop_vision_frame, rotated_matrix, rotated_size)
-	crop_vision_frame = cv2.cvtColor(crop_vision_frame, cv2.COLOR_RGB2Lab)
-	if numpy.mean(crop_vision_frame[:, :, 0]) < 30: #type:ignore[arg-type]
-		crop_vision_frame[:, :, 0] = cv2.createCLAHE(clipLimit = 2).apply(crop_vision_frame[:, :, 0])
-	crop_vision_frame = cv2.cvtColor(crop_vision_frame, cv2.COLOR_Lab2RGB)
-	crop_vision_frame = crop_vision_frame.transpose(2, 0, 1).astype(numpy.float32) / 255.0
-
-	with conditional_thread_semaphore():
-		face_landmark_68, face_heatmap = face_landmarker.run(None,
-		{
-			face_landmarker.get_inputs()[0].name: [ crop_vision_frame ]
-		})
+	return complete_faces(vision_frame, faces, face_attributes)
 
-	face_landmark_68 = face_landmark_68[:, :, :2][0] / 64 * 256
-	face_landmark_68 = transform_points(face_landmark_68, cv2.invertAffineTransform(rotated_matrix))
-	face_landmark_68 = transform_points(face_landmark_68, cv2.invertAffineTransform(affine_matrix))
-	face_landmark_68_score = numpy.amax(face_heatmap, axis = (2, 3))
-	face_landmark_68_score = numpy.mean(face_landmark_68_score)
-	return face_landmark_68, face_landmark_68_score
-
-
-def expand_face_landmark_68_from_5(face_landmark_5 : FaceLandmark5) -> FaceLandmark68:
-	face_landmarker = get_face_analyser().get('face_landmarkers').get('68_5')
-	affine_matrix = estimate_matrix_by_face_landmark_5(face_landmark_5, 'ffhq_512', (1, 1))
-	face_landmark_5 = cv2.transform(face_landmark_5.reshape(1, -1, 2), affine_matrix).reshape(-1, 2)
-
-	with conditional_thread_semaphore():
-		face_landmark_68_5 = face_landmarker.run(None,
-		{
-			face_landmarker.get_inputs()[0].name: [ face_landmark_5 ]
-		})[0][0]
-
-	face_landmark_68_5 = cv2.transform(face_landmark_68_5.reshape(1, -1, 2), cv2.invertAffineTransform(affine_matrix)).reshape(-1, 2)
-	return face_landmark_68_5
 
+def complete_faces(vision_frame : VisionFrame, faces : List[Face], face_attributes : List[FaceAttribute]) -> List[Face]:
+	if 'embedding' in face_attributes and any(face.embedding is None for face in faces):
+		embeddings, normed_embeddings = calc_embeddings(vision_frame, [ face.landmark_set.get('5/68') for face in faces ])
+		faces = [ face._replace(embedding = embedding, normed_embedding = normed_embedding) for face, embedding, normed_embedding in zip(faces, embeddings, normed_embeddings) ]
+	if 'gender_age' in face_attributes and any(face.gender is None for face in faces):
+		genders, ages = detect_gender_ages(vision_frame, [ face.bounding_box for face in faces ])
+		faces = [ face._replace(gender = gender, age = age) for face, gender, age in zip(faces, genders, ages) ]
+	return faces
 
-def detect_gender_age(temp_vision_frame : VisionFrame, bounding_box : BoundingBox) -> Tuple[int, int]:
-	gender_age = get_face_analyser().get('gender_age')
-	bounding_box = bounding_box.reshape(2, -1)
-	scale = 64 / numpy.subtract(*bounding_box[::-1]).max()
-	translation = 48 - bounding_box.sum(axis = 0) * scale * 0.5
-	crop_vision_frame, affine_matrix = warp_face_by_translation(temp_vision_frame, translation, scale, (96, 96))
-	crop_vision_frame = crop_vision_frame[:, :, ::-1].transpose(2, 0, 1).astype(numpy.float32)
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0)
 
-	with conditional_thread_semaphore():
-		prediction = gender_age.run(None,
+def calc_embeddings(temp_vision_frame : VisionFrame, face_landmarks_5 : List[FaceLandmark5]) -> Tuple[List[Embedding], List[Embedding]]:
+	face_recognizer = get_face_recognizer()
+	crop_vision_frames = []
+
+	for face_landmark_5 in face_landmarks_5:
+		crop_vision_frame, matrix = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, 'arcface_112_v2', (112, 112))
+		crop_vision_frame = crop_vision_frame / 127.5 - 1
+		crop_vision_frame = crop_vision_frame[:, :, ::-1].transpose(2, 0, 1).astype(numpy.float32)
+		crop_vision_frames.append(crop_vision_frame)
+
+	embeddings = forward_batch(face_recognizer, numpy.stack(crop_vision_frames))[0]
+	embeddings = list(embeddings.reshape(len(face_landmarks_5), -1))
+	normed_embeddings = [ embedding / numpy.linalg.norm(embedding) for embedding in embeddings ]
+	return embeddings, normed_embeddings
+
+
+def detect_face_landmarks_68(temp_vision_frame : VisionFrame, bounding_boxes : List[BoundingBox], face_angles : List[Angle]) -> Tuple[List[FaceLandmark68], List[Score]]:
+	face_landmarker = get_face_landmarker('68')
+	crop_vision_frames = []
+	inverse_matrices = []
+
+	for bounding_box, face_angle in zip(bounding_boxes, face_angles):
+		scale = 195 / numpy.subtract(bounding_box[2:], bounding_box[:2]).max().clip(1, None)
+		translation = (256 - numpy.add(bounding_box[2:], bounding_box[:2]) * scale) * 0.5
+		rotated_matrix, rotated_size = create_rotated_matrix_and_size(face_angle, (256, 256))
+		crop_vision_frame, affine_matrix = warp_face_by_translation(temp_vision_frame, translation, scale, (256, 256))
+		crop_vision_frame = cv2.warpAffine(crop_vision_frame, rotated_matrix, rotated_size)
+		crop_vision_frame = cv2.cvtColor(crop_vision_frame, cv2.COLOR_RGB2Lab)
+		if numpy.mean(crop_vision_frame[:, :, 0]) < 30: #type:ignore[arg-type]
+			crop_vision_frame[:, :, 0] = cv2.createCLAHE(clipLimit = 2).apply(crop_vision_frame[:, :, 0])
+		crop_vision_frame = cv2.cvtColor(crop_vision_frame, cv2.COLOR_Lab2RGB)
+		crop_vision_frame = crop_vision_frame.transpose(2, 0, 1).astype(numpy.float32) / 255.0
+		crop_vision_frames.append(crop_vision_frame)
+		inverse_matrices.append((cv2.invertAffineTransform(rotated_matrix), cv2.invertAffineTransform(affine_matrix)))
+
+	face_landmarks_68, face_heatmaps = forward_batch(face_landmarker, numpy.stack(crop_vision_frames))
+	face_landmarks_68 = list(face_landmarks_68[:, :, :2] / 64 * 256)
+	face_landmark_68_scores = list(numpy.amax(face_heatmaps, axis = (2, 3)).mean(axis = 1))
+
+	for index, (inverse_rotated_matrix, inverse_affine_matrix) in enumerate(inverse_matrices):
+		face_landmarks_68[index] = transform_points(face_landmarks_68[index], inverse_rotated_matrix)
+		face_landmarks_68[index] = transform_points(face_landmarks_68[index], inverse_affine_matrix)
+	return face_landmarks_68, face_landmark_68_scores
+
+
+def expand_face_landmarks_68_from_5(face_landmarks_5 : List[FaceLandmark5]) -> List[FaceLandmark68]:
+	face_landmarker = get_face_landmarker('68_5')
+	affine_matrices = [ estimate_matrix_by_face_landmark_5(face_landmark_5, 'ffhq_512', (1, 1)) for face_landmark_5 in face_landmarks_5 ]
+	face_landmarks_5 = [ cv2.transform(face_landmark_5.reshape(1, -1, 2), affine_matrix).reshape(-1, 2) for face_landmark_5, affine_matrix in zip(face_landmarks_5, affine_matrices) ]
+	face_landmarks_68_5 = forward_batch(face_landmarker, numpy.stack(face_landmarks_5))[0]
+	face_landmarks_68_5 = [ cv2.transform(face_landmark_68_5.reshape(1, -1, 2), cv2.invertAffineTransform(affine_matrix)).reshape(-1, 2) for face_landmark_68_5, affine_matrix in zip(face_landmarks_68_5, affine_matrices) ]
+	return face_landmarks_68_5
+
+
+def detect_gender_ages(temp_vision_frame : VisionFrame, bounding_boxes : List[BoundingBox]) -> Tuple[List[int], List[int]]:
+	gender_age = get_gender_age()
+	crop_vision_frames = []
+
+	for bounding_box in bounding_boxes:
+		bounding_box = bounding_box.reshape(2, -1)
+		scale = 64 / numpy.subtract(*bounding_box[::-1]).max()
+		translation = 48 - bounding_box.sum(axis = 0) * scale * 0.5
+		crop_vision_frame, affine_matrix = warp_face_by_translation(temp_vision_frame, translation, scale, (96, 96))
+		crop_vision_frame = crop_vision_frame[:, :, ::-1].transpose(2, 0, 1).astype(numpy.float32)
+		crop_vision_frames.append(crop_vision_frame)
+
+	predictions = forward_batch(gender_age, numpy.stack(crop_vision_frames))[0]
+	genders = [ int(numpy.argmax(prediction[:2])) for prediction in predictions ]
+	ages = [ int(numpy.round(prediction[2] * 100)) for prediction in predictions ]
+	return genders, ages
+
+
+def forward_batch(inference_session : InferenceSession, batch_vision_frame : VisionFrame) -> List[Any]:
+	inference_session_input_name = inference_session.get_inputs()[0].name
+
+	with conditional_thread_semaphore(inference_session):
+		if has_dynamic_batch_size(inference_session):
+			return inference_session.run(None,
+			{
+				inference_session_input_name: batch_vision_frame
+			})
+		batch_outputs = [ inference_session.run(None,
 		{
-			gender_age.get_inputs()[0].name: crop_vision_frame
-		})[0][0]
-
-	gender = int(numpy.argmax(prediction[:2]))
-	age = int(numpy.round(prediction[2] * 100))
-	return gender, age
+			inference_session_input_name: vision_frame[numpy.newaxis]
+		}) for vision_frame in batch_vision_frame ]
+	return [ numpy.concatenate(outputs) for outputs in zip(*batch_outputs) ]
 
 
 def get_one_face(faces : List[Face], position : int = 0) -> Optional[Face]:
@@ -490,14 +489,20 @@ def get_average_face(faces : List[Face]) -> Optional[Face]:
 	return None
 
 
-def get_many_faces(vision_frames : List[VisionFrame]) -> List[Face]:
+def get_many_faces(vision_frames : List[VisionFrame], face_attributes : Optional[List[FaceAttribute]] = None) -> List[Face]:
 	many_faces : List[Face] = []
 
+	if face_attributes is None:
+		face_attributes = facefusion.choices.face_attributes
+
 	for vision_frame in vision_frames:
 		if numpy.any(vision_frame):
 			static_faces = get_static_faces(vision_frame)
 			if static_faces:
-				many_faces.extend(static_faces)
+				faces = complete_faces(vision_frame, static_faces, face_attributes)
+				if faces is not static_faces:
+					set_static_faces(vision_frame, faces)
+				many_faces.extend(faces)
 			else:
 				all_bounding_boxes = []
 				all_face_landmarks_5 = []
@@ -513,9 +518,36 @@ def get_many_faces(vision_frames : List[VisionFrame]) -> List[Face]:
 					all_face_scores.extend(face_scores)
 
 				if all_bounding_boxes and all_face_landmarks_5 and all_face_scores and state_manager.get_item('face_detector_score') > 0:
-					faces = create_faces(vision_frame, all_bounding_boxes, all_face_landmarks_5, all_face_scores)
+					faces = create_faces(vision_frame, all_bounding_boxes, all_face_landmarks_5, all_face_scores, face_attributes)
 
 					if faces:
 						many_faces.extend(faces)
 						set_static_faces(vision_frame, faces)
 	return many_faces
+
+
+def get_many_frame_faces(vision_frame : VisionFrame, frame_number : Optional[int]) -> List[Face]:
+	face_attributes = get_face_attributes()
+
+	if isinstance(frame_number, int):
+		frame_faces = get_frame_faces(frame_number, vision_frame)
+		if frame_faces is None:
+			frame_faces = track_faces(vision_frame, frame_number)
+			if frame_faces is None:
+				frame_faces = get_many_faces([ vision_frame ], face_attributes)
+				set_face_track(vision_frame, frame_number, frame_faces)
+			set_frame_faces(frame_number, vision_frame, frame_faces)
+		return frame_faces
+	return get_many_faces([ vision_frame ], face_attributes)
+
+
+def get_face_attributes() -> List[FaceAttribute]:
+	face_attributes : List[FaceAttribute] = []
+
+	if state_manager.get_item('face_selector_mode') == 'reference':
+		face_attributes.append('embedding')
+	if state_manager.get_item('face_selector_age') or state_manager.get_item('face_selector_gender'):
+		face_attributes.append('gender_age')
+	elif 'face_debugger' in state_manager.get_item('frame_processors') and set(state_manager.get_item('face_debugger_items')) & { 'age', 'gender' }:
+		face_attributes.append('gender_age')
+	return face_attributes
@@ -1,5 +1,4 @@
 from functools import lru_cache
-from time import sleep
 from typing import Any, Dict, List
 
 import cv2
@@ -8,13 +7,11 @@ from cv2.typing import Size
 
 from facefusion import process_manager, state_manager
 from facefusion.download import conditional_download
-from facefusion.execution import create_inference_session
 from facefusion.filesystem import is_file, resolve_relative_path
-from facefusion.thread_helper import conditional_thread_semaphore, thread_lock
+from facefusion.inference_manager import clear_inference_sessions, get_inference_session
+from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.typing import FaceLandmark68, FaceMaskRegion, Mask, ModelSet, Padding, VisionFrame
 
-FACE_OCCLUDER = None
-FACE_PARSER = None
 MODELS : ModelSet =\
 {
 	'face_occluder':
@@ -44,39 +41,21 @@ FACE_MASK_REGIONS : Dict[FaceMaskRegion, int] =\
 
 
 def get_face_occluder() -> Any:
-	global FACE_OCCLUDER
-
-	with thread_lock():
-		while process_manager.is_checking():
-			sleep(0.5)
-		if FACE_OCCLUDER is None:
-			model_path = MODELS.get('face_occluder').get('path')
-			FACE_OCCLUDER = create_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-	return FACE_OCCLUDER
+	model_path = MODELS.get('face_occluder').get('path')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
 
 
 def get_face_parser() -> Any:
-	global FACE_PARSER
-
-	with thread_lock():
-		while process_manager.is_checking():
-			sleep(0.5)
-		if FACE_PARSER is None:
-			model_path = MODELS.get('face_parser').get('path')
-			FACE_PARSER = create_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-	return FACE_PARSER
+	model_path = MODELS.get('face_parser').get('path')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
 
 
 def clear_face_occluder() -> None:
-	global FACE_OCCLUDER
-
-	FACE_OCCLUDER = None
+	clear_inference_sessions([ MODELS.get('face_occluder').get('path') ])
 
 
 def clear_face_parser() -> None:
-	global FACE_PARSER
-
-	FACE_PARSER = None
+	clear_inference_sessions([ MODELS.get('face_parser').get('path') ])
 
 
 def pre_check() -> bool:
@@ -119,7 +98,7 @@ def create_occlusion_mask(crop_vision_frame : VisionFrame) -> Mask:
 	prepare_vision_frame = numpy.expand_dims(prepare_vision_frame, axis = 0).astype(numpy.float32) / 255
 	prepare_vision_frame = prepare_vision_frame.transpose(0, 1, 2, 3)
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(face_occluder):
 		occlusion_mask : Mask = face_occluder.run(None,
 		{
 			face_occluder.get_inputs()[0].name: prepare_vision_frame
@@ -140,7 +119,7 @@ def create_region_mask(crop_vision_frame : VisionFrame, face_mask_regions : List
 	prepare_vision_frame = numpy.expand_dims(prepare_vision_frame, axis = 0)
 	prepare_vision_frame = prepare_vision_frame.transpose(0, 3, 1, 2)
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(face_parser):
 		region_mask : Mask = face_parser.run(None,
 		{
 			face_parser.get_inputs()[0].name: prepare_vision_frame
@@ -1,15 +1,24 @@
 import hashlib
+import sys
+import threading
+import zlib
+from collections import OrderedDict
 from typing import List, Optional
 
 import numpy
 
+from facefusion import state_manager
 from facefusion.typing import Face, FaceSet, FaceStore, VisionFrame
 
 FACE_STORE : FaceStore =\
 {
-	'static_faces': {},
+	'static_faces': OrderedDict(),
+	'static_faces_size': 0,
+	'frame_faces': OrderedDict(),
+	'frame_faces_size': 0,
 	'reference_faces': {}
 }
+FACE_STORE_LOCK : threading.Lock = threading.Lock()
 
 
 def get_face_store() -> FaceStore:
@@ -17,24 +26,119 @@ def get_face_store() -> FaceStore:
 
 
 def get_static_faces(vision_frame : VisionFrame) -> Optional[List[Face]]:
-	frame_hash = create_frame_hash(vision_frame)
-	if frame_hash in FACE_STORE['static_faces']:
-		return FACE_STORE['static_faces'][frame_hash]
+	static_key = create_static_key(vision_frame)
+
+	with FACE_STORE_LOCK:
+		if static_key in FACE_STORE['static_faces']:
+			FACE_STORE['static_faces'].move_to_end(static_key)
+			return FACE_STORE['static_faces'][static_key]
 	return None
 
 
 def set_static_faces(vision_frame : VisionFrame, faces : List[Face]) -> None:
-	frame_hash = create_frame_hash(vision_frame)
-	if frame_hash:
-		FACE_STORE['static_faces'][frame_hash] = faces
+	static_key = create_static_key(vision_frame)
+
+	if static_key:
+		with FACE_STORE_LOCK:
+			if static_key in FACE_STORE['static_faces']:
+				FACE_STORE['static_faces_size'] -= calc_faces_size(FACE_STORE['static_faces'].pop(static_key))
+			FACE_STORE['static_faces'][static_key] = faces
+			FACE_STORE['static_faces_size'] += calc_faces_size(faces)
+			reduce_static_faces()
+
+
+def reduce_static_faces() -> None:
+	face_store_memory_limit = state_manager.get_item('face_store_memory_limit')
+
+	if face_store_memory_limit and face_store_memory_limit > 0:
+		while FACE_STORE['static_faces_size'] > face_store_memory_limit * 1024 * 1024 and len(FACE_STORE['static_faces']) > 1:
+			_, faces = FACE_STORE['static_faces'].popitem(last = False)
+			FACE_STORE['static_faces_size'] -= calc_faces_size(faces)
+
+
+def reduce_frame_faces() -> None:
+	face_store_memory_limit = state_manager.get_item('face_store_memory_limit')
+
+	if face_store_memory_limit and face_store_memory_limit > 0:
+		while FACE_STORE['frame_faces_size'] > face_store_memory_limit * 1024 * 1024 and len(FACE_STORE['frame_faces']) > 1:
+			_, faces = FACE_STORE['frame_faces'].popitem(last = False)
+			FACE_STORE['frame_faces_size'] -= calc_faces_size(faces)
 
 
 def clear_static_faces() -> None:
-	FACE_STORE['static_faces'] = {}
+	with FACE_STORE_LOCK:
+		FACE_STORE['static_faces'] = OrderedDict()
+		FACE_STORE['static_faces_size'] = 0
+
+
+def calc_faces_size(faces : List[Face]) -> int:
+	faces_size = 0
+
+	for face in faces:
+		faces_size += sys.getsizeof(face)
+		for face_value in [ face.bounding_box, face.embedding, face.normed_embedding, *face.landmark_set.values() ]:
+			if isinstance(face_value, numpy.ndarray):
+				faces_size += face_value.nbytes
+	return faces_size
+
+
+def create_static_key(vision_frame : VisionFrame) -> Optional[str]:
+	frame_hash = create_frame_hash(vision_frame)
+
+	if frame_hash:
+		face_analyser_settings =\
+		[
+			state_manager.get_item('face_detector_model'),
+			state_manager.get_item('face_detector_size'),
+			state_manager.get_item('face_detector_angles'),
+			state_manager.get_item('face_detector_score'),
+			state_manager.get_item('face_landmarker_score'),
+			state_manager.get_item('face_recognizer_model')
+		]
+		return frame_hash + '-' + hashlib.sha1(str(face_analyser_settings).encode()).hexdigest()[:8]
+	return None
 
 
 def create_frame_hash(vision_frame : VisionFrame) -> Optional[str]:
-	return hashlib.sha1(vision_frame.tobytes()).hexdigest() if numpy.any(vision_frame) else None
+	if numpy.any(vision_frame):
+		frame_checksum = zlib.crc32(numpy.ascontiguousarray(vision_frame).data)
+		return 'x'.join(map(str, vision_frame.shape)) + '-' + '{:08x}'.format(frame_checksum)
+	return None
+
+
+def get_frame_faces(frame_number : int, vision_frame : VisionFrame) -> Optional[List[Face]]:
+	frame_key = create_frame_key(frame_number, vision_frame)
+
+	with FACE_STORE_LOCK:
+		if frame_key in FACE_STORE['frame_faces']:
+			FACE_STORE['frame_faces'].move_to_end(frame_key)
+			return FACE_STORE['frame_faces'][frame_key]
+	return None
+
+
+def set_frame_faces(frame_number : int, vision_frame : VisionFrame, faces : List[Face]) -> None:
+	frame_key = create_frame_key(frame_number, vision_frame)
+
+	if frame_key:
+		with FACE_STORE_LOCK:
+			if frame_key in FACE_STORE['frame_faces']:
+				FACE_STORE['frame_faces_size'] -= calc_faces_size(FACE_STORE['frame_faces'].pop(frame_key))
+			FACE_STORE['frame_faces'][frame_key] = faces
+			FACE_STORE['frame_faces_size'] += calc_faces_size(faces)
+			reduce_frame_faces()
+
+
+def clear_frame_faces() -> None:
+	with FACE_STORE_LOCK:
+		FACE_STORE['frame_faces'] = OrderedDict()
+		FACE_STORE['frame_faces_size'] = 0
+
+
+def create_frame_key(frame_number : int, vision_frame : VisionFrame) -> Optional[str]:
+	if numpy.any(vision_frame):
+		height, width = vision_frame.shape[:2]
+		return str(frame_number) + '-' + str(width) + 'x' + str(height)
+	return None
 
 
 def get_reference_faces() -> Optional[FaceSet]:
@@ -0,0 +1,96 @@
+import threading
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy
+
+from facefusion import state_manager
+from facefusion.face_helper import transform_points
+from facefusion.shot_detector import has_shot_boundary
+from facefusion.typing import BoundingBox, Face, FaceLandmark5, FaceLandmarkSet, FaceTrack, FaceTrackSet, Matrix, VisionFrame
+
+FACE_TRACKS : FaceTrackSet = {}
+
+
+def get_face_tracks() -> FaceTrackSet:
+	return FACE_TRACKS
+
+
+def track_faces(vision_frame : VisionFrame, frame_number : int) -> Optional[List[Face]]:
+	face_track = FACE_TRACKS.get(threading.get_ident())
+
+	if face_track and can_track_faces(face_track, vision_frame, frame_number):
+		track_vision_frame = prepare_track_frame(vision_frame)
+		faces = []
+
+		for face in face_track.get('faces'):
+			face_landmark_5, track_matrix = track_face_landmark_5(face_track.get('track_vision_frame'), track_vision_frame, face.landmark_set.get('5/68'))
+			if face_landmark_5 is None or track_matrix is None:
+				return None
+			faces.append(transform_face(face, face_landmark_5, track_matrix))
+		face_track['frame_number'] = frame_number
+		face_track['track_vision_frame'] = track_vision_frame
+		face_track['faces'] = faces
+		return faces
+	return None
+
+
+def can_track_faces(face_track : FaceTrack, vision_frame : VisionFrame, frame_number : int) -> bool:
+	face_tracker_interval = state_manager.get_item('face_tracker_interval')
+
+	if face_tracker_interval and face_track.get('faces') and numpy.any(vision_frame):
+		if face_track.get('frame_number') + 1 == frame_number and frame_number - face_track.get('detect_frame_number') < face_tracker_interval and face_track.get('track_vision_frame').shape == vision_frame.shape[:2]:
+			return not has_shot_boundary(state_manager.get_item('target_path'), face_track.get('frame_number'), frame_number)
+	return False
+
+
+def set_face_track(vision_frame : VisionFrame, frame_number : int, faces : List[Face]) -> None:
+	FACE_TRACKS.pop(threading.get_ident(), None)
+
+	if state_manager.get_item('face_tracker_interval') and faces:
+		FACE_TRACKS[threading.get_ident()] =\
+		{
+			'detect_frame_number': frame_number,
+			'frame_number': frame_number,
+			'track_vision_frame': prepare_track_frame(vision_frame),
+			'faces': faces
+		}
+
+
+def clear_face_tracks() -> None:
+	FACE_TRACKS.clear()
+
+
+def prepare_track_frame(vision_frame : VisionFrame) -> VisionFrame:
+	return cv2.cvtColor(vision_frame, cv2.COLOR_BGR2GRAY)
+
+
+def track_face_landmark_5(previous_vision_frame : VisionFrame, next_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> Tuple[Optional[FaceLandmark5], Optional[Matrix]]:
+	previous_points = face_landmark_5.reshape(-1, 1, 2).astype(numpy.float32)
+	next_points, next_status, _ = cv2.calcOpticalFlowPyrLK(previous_vision_frame, next_vision_frame, previous_points, None, winSize = (21, 21), maxLevel = 3) #type:ignore[call-overload]
+	back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(next_vision_frame, previous_vision_frame, next_points, None, winSize = (21, 21), maxLevel = 3) #type:ignore[call-overload]
+
+	if numpy.all(next_status) and numpy.all(back_status):
+		track_error = numpy.linalg.norm(previous_points - back_points, axis = 2).max()
+		track_error_limit = max(numpy.ptp(face_landmark_5, axis = 0).max() * 0.02, 1.0)
+		if track_error < track_error_limit:
+			track_matrix, _ = cv2.estimateAffinePartial2D(previous_points, next_points)
+			return next_points.reshape(-1, 2), track_matrix
+	return None, None
+
+
+def transform_face(face : Face, face_landmark_5 : FaceLandmark5, track_matrix : Matrix) -> Face:
+	face_landmark_set : FaceLandmarkSet =\
+	{
+		'5': transform_points(face.landmark_set.get('5'), track_matrix),
+		'5/68': face_landmark_5,
+		'68': transform_points(face.landmark_set.get('68'), track_matrix),
+		'68/5': transform_points(face.landmark_set.get('68/5'), track_matrix)
+	}
+	return face._replace(bounding_box = track_bounding_box(face.bounding_box, track_matrix), landmark_set = face_landmark_set)
+
+
+def track_bounding_box(bounding_box : BoundingBox, track_matrix : Matrix) -> BoundingBox:
+	bounding_box_center = transform_points(numpy.add(bounding_box[:2], bounding_box[2:]) * 0.5, track_matrix).ravel()
+	bounding_box_size = numpy.subtract(bounding_box[2:], bounding_box[:2]) * numpy.hypot(track_matrix[0, 0], track_matrix[1, 0])
+	return numpy.concatenate([ bounding_box_center - bounding_box_size * 0.5, bounding_box_center + bounding_box_size * 0.5 ])
@@ -4,11 +4,12 @@ import tempfile
 from typing import List, Optional
 
 import filetype
+import numpy
 
 from facefusion import logger, process_manager, state_manager
 from facefusion.filesystem import remove_file
 from facefusion.temp_helper import get_temp_file_path, get_temp_frames_pattern
-from facefusion.typing import AudioBuffer, Fps, OutputVideoPreset
+from facefusion.typing import AudioBuffer, Fps, OutputVideoPreset, Resolution, VisionFrame
 from facefusion.vision import restrict_video_fps
 
 
@@ -47,43 +48,95 @@ def log_debug(process : subprocess.Popen[bytes]) -> None:
 
 
 def extract_frames(target_path : str, temp_video_resolution : str, temp_video_fps : Fps) -> bool:
+	temp_frames_pattern = get_temp_frames_pattern(target_path, '%04d')
+	commands = [ '-i', target_path, '-s', str(temp_video_resolution), '-q:v', '0', '-vf', create_extract_filter(temp_video_fps), '-vsync', '0', temp_frames_pattern ]
+	return run_ffmpeg(commands).returncode == 0
+
+
+def pipe_extract_frames(target_path : str, temp_video_resolution : str, temp_video_fps : Fps) -> subprocess.Popen[bytes]:
+	commands = [ '-i', target_path, '-s', str(temp_video_resolution), '-vf', create_extract_filter(temp_video_fps), '-vsync', '0', '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-' ]
+	return open_ffmpeg(commands)
+
+
+def create_extract_filter(temp_video_fps : Fps) -> str:
 	trim_frame_start = state_manager.get_item('trim_frame_start')
 	trim_frame_end = state_manager.get_item('trim_frame_end')
-	temp_frames_pattern = get_temp_frames_pattern(target_path, '%04d')
-	commands = [ '-i', target_path, '-s', str(temp_video_resolution), '-q:v', '0' ]
 
 	if isinstance(trim_frame_start, int) and isinstance(trim_frame_end, int):
-		commands.extend([ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ':end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ])
-	elif isinstance(trim_frame_start, int):
-		commands.extend([ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ',fps=' + str(temp_video_fps) ])
-	elif isinstance(trim_frame_end, int):
-		commands.extend([ '-vf', 'trim=end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ])
-	else:
-		commands.extend([ '-vf', 'fps=' + str(temp_video_fps) ])
-	commands.extend([ '-vsync', '0', temp_frames_pattern ])
-	return run_ffmpeg(commands).returncode == 0
+		return 'trim=start_frame=' + str(trim_frame_start) + ':end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps)
+	if isinstance(trim_frame_start, int):
+		return 'trim=start_frame=' + str(trim_frame_start) + ',fps=' + str(temp_video_fps)
+	if isinstance(trim_frame_end, int):
+		return 'trim=end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps)
+	return 'fps=' + str(temp_video_fps)
 
 
 def merge_video(target_path : str, output_video_resolution : str, output_video_fps : Fps) -> bool:
 	temp_video_fps = restrict_video_fps(target_path, output_video_fps)
 	temp_file_path = get_temp_file_path(target_path)
 	temp_frames_pattern = get_temp_frames_pattern(target_path, '%04d')
-	commands = [ '-r', str(temp_video_fps), '-i', temp_frames_pattern, '-s', str(output_video_resolution), '-c:v', state_manager.get_item('output_video_encoder') ]
+	commands = [ '-r', str(temp_video_fps), '-i', temp_frames_pattern, '-s', str(output_video_resolution) ]
+	commands.extend(create_encoder_commands())
+	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_file_path ])
+	return run_ffmpeg(commands).returncode == 0
+
+
+def pipe_merge_video(target_path : str, temp_video_resolution : str, output_video_resolution : str, output_video_fps : Fps) -> subprocess.Popen[bytes]:
+	temp_video_fps = restrict_video_fps(target_path, output_video_fps)
+	temp_file_path = get_temp_file_path(target_path)
+	commands = [ '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', str(temp_video_resolution), '-r', str(temp_video_fps), '-i', '-', '-s', str(output_video_resolution) ]
+	commands.extend(create_encoder_commands())
+	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_file_path ])
+	return open_ffmpeg(commands)
+
 
-	if state_manager.get_item('output_video_encoder') in [ 'libx264', 'libx265' ]:
+def create_encoder_commands() -> List[str]:
+	output_video_encoder = state_manager.get_item('output_video_encoder')
+	commands = [ '-c:v', output_video_encoder ]
+
+	if output_video_encoder in [ 'libx264', 'libx265' ]:
 		output_video_compression = round(51 - (state_manager.get_item('output_video_quality') * 0.51))
 		commands.extend([ '-crf', str(output_video_compression), '-preset', state_manager.get_item('output_video_preset') ])
-	if state_manager.get_item('output_video_encoder') in [ 'libvpx-vp9' ]:
+	if output_video_encoder in [ 'libvpx-vp9' ]:
 		output_video_compression = round(63 - (state_manager.get_item('output_video_quality') * 0.63))
 		commands.extend([ '-crf', str(output_video_compression) ])
-	if state_manager.get_item('output_video_encoder') in [ 'h264_nvenc', 'hevc_nvenc' ]:
+	if output_video_encoder in [ 'h264_nvenc', 'hevc_nvenc' ]:
 		output_video_compression = round(51 - (state_manager.get_item('output_video_quality') * 0.51))
 		commands.extend([ '-cq', str(output_video_compression), '-preset', map_nvenc_preset(state_manager.get_item('output_video_preset')) ])
-	if state_manager.get_item('output_video_encoder') in [ 'h264_amf', 'hevc_amf' ]:
+	if output_video_encoder in [ 'h264_amf', 'hevc_amf' ]:
 		output_video_compression = round(51 - (state_manager.get_item('output_video_quality') * 0.51))
 		commands.extend([ '-qp_i', str(output_video_compression), '-qp_p', str(output_video_compression), '-quality', map_amf_preset(state_manager.get_item('output_video_preset')) ])
-	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_file_path ])
-	return run_ffmpeg(commands).returncode == 0
+	return commands
+
+
+def read_pipe_frame(process : subprocess.Popen[bytes], temp_video_resolution : Resolution) -> Optional[VisionFrame]:
+	width, height = temp_video_resolution
+	frame_buffer = process.stdout.read(width * height * 3)
+
+	if len(frame_buffer) == width * height * 3:
+		return numpy.frombuffer(frame_buffer, dtype = numpy.uint8).reshape(height, width, 3)
+	return None
+
+
+def write_pipe_frame(process : subprocess.Popen[bytes], vision_frame : VisionFrame) -> bool:
+	try:
+		process.stdin.write(numpy.ascontiguousarray(vision_frame, dtype = numpy.uint8).tobytes())
+		return True
+	except (BrokenPipeError, ValueError):
+		return False
+
+
+def close_pipe(process : subprocess.Popen[bytes]) -> bool:
+	if process_manager.is_stopping():
+		process.terminate()
+	if process.stdin:
+		try:
+			process.stdin.close()
+		except BrokenPipeError:
+			pass
+	if process.stdout:
+		process.stdout.close()
+	return process.wait() == 0
 
 
 def concat_video(output_path : str, temp_output_paths : List[str]) -> bool:
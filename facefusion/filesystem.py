@@ -17,6 +17,13 @@ def get_file_size(file_path : str) -> int:
 	return 0
 
 
+def get_file_time(file_path : str) -> Optional[float]:
+	try:
+		return os.path.getmtime(file_path)
+	except OSError:
+		return None
+
+
 def same_file_extension(file_paths : List[str]) -> bool:
 	file_extensions : List[str] = []
 
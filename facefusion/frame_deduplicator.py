@@ -0,0 +1,97 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import cv2
+import numpy
+
+from facefusion import state_manager
+from facefusion.common_helper import is_windows
+from facefusion.filesystem import copy_file, sanitize_path_for_windows
+from facefusion.typing import DuplicateFrameStore, FrameFingerprint, QueuePayload, VisionFrame
+
+DUPLICATE_FRAME_STORE : DuplicateFrameStore =\
+{
+	'frame_paths': {},
+	'frame_total': 0,
+	'duplicate_frame_total': 0
+}
+
+
+def get_duplicate_frame_store() -> DuplicateFrameStore:
+	return DUPLICATE_FRAME_STORE
+
+
+def should_skip_duplicate_frames() -> bool:
+	return state_manager.get_item('duplicate_frame_threshold') is not None and 'lip_syncer' not in state_manager.get_item('frame_processors')
+
+
+def detect_duplicate_frames(temp_frame_paths : List[str]) -> None:
+	original_frame_path = None
+	original_frame_fingerprint = None
+
+	with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count')) as executor:
+		frame_fingerprints = list(executor.map(create_file_fingerprint, temp_frame_paths))
+
+	for temp_frame_path, frame_fingerprint in zip(temp_frame_paths, frame_fingerprints):
+		if original_frame_path and is_duplicate_fingerprint(original_frame_fingerprint, frame_fingerprint):
+			DUPLICATE_FRAME_STORE['frame_paths'][temp_frame_path] = original_frame_path
+			count_frame(True)
+		else:
+			original_frame_path = temp_frame_path
+			original_frame_fingerprint = frame_fingerprint
+			count_frame(False)
+
+
+def init_duplicate_frames(duplicate_frame_paths : Dict[str, str], frame_total : int) -> None:
+	DUPLICATE_FRAME_STORE['frame_paths'] = duplicate_frame_paths
+	DUPLICATE_FRAME_STORE['frame_total'] = frame_total
+	DUPLICATE_FRAME_STORE['duplicate_frame_total'] = len(duplicate_frame_paths)
+
+
+def filter_duplicate_frames(queue_payloads : List[QueuePayload]) -> List[QueuePayload]:
+	return [ queue_payload for queue_payload in queue_payloads if queue_payload.get('frame_path') not in DUPLICATE_FRAME_STORE['frame_paths'] ]
+
+
+def restore_duplicate_frames() -> bool:
+	return all(copy_file(original_frame_path, duplicate_frame_path) for duplicate_frame_path, original_frame_path in DUPLICATE_FRAME_STORE['frame_paths'].items())
+
+
+def is_duplicate_fingerprint(original_frame_fingerprint : FrameFingerprint, frame_fingerprint : FrameFingerprint) -> bool:
+	if isinstance(original_frame_fingerprint, numpy.ndarray) and isinstance(frame_fingerprint, numpy.ndarray):
+		return bool(numpy.abs(original_frame_fingerprint - frame_fingerprint).mean() <= state_manager.get_item('duplicate_frame_threshold'))
+	return original_frame_fingerprint == frame_fingerprint
+
+
+def create_frame_fingerprint(vision_frame : VisionFrame) -> FrameFingerprint:
+	if state_manager.get_item('duplicate_frame_threshold') > 0:
+		vision_frame = cv2.cvtColor(vision_frame, cv2.COLOR_BGR2GRAY)
+		return cv2.resize(vision_frame, (64, 36), interpolation = cv2.INTER_AREA).astype(numpy.float32)
+	return hashlib.sha1(str(vision_frame.shape).encode() + vision_frame.tobytes()).hexdigest()
+
+
+def create_file_fingerprint(frame_path : str) -> FrameFingerprint:
+	if state_manager.get_item('duplicate_frame_threshold') > 0:
+		if is_windows():
+			frame_path = sanitize_path_for_windows(frame_path)
+		return create_frame_fingerprint(cv2.imread(frame_path))
+	with open(frame_path, 'rb') as frame_file:
+		return hashlib.sha1(frame_file.read()).hexdigest()
+
+
+def count_frame(is_duplicate : bool) -> None:
+	DUPLICATE_FRAME_STORE['frame_total'] += 1
+	if is_duplicate:
+		DUPLICATE_FRAME_STORE['duplicate_frame_total'] += 1
+
+
+def calc_duplicate_frame_ratio() -> float:
+	if DUPLICATE_FRAME_STORE['frame_total'] > 0:
+		return DUPLICATE_FRAME_STORE['duplicate_frame_total'] / DUPLICATE_FRAME_STORE['frame_total']
+	return 0.0
+
+
+def clear_duplicate_frames() -> None:
+	DUPLICATE_FRAME_STORE['frame_paths'] = {}
+	DUPLICATE_FRAME_STORE['frame_total'] = 0
+	DUPLICATE_FRAME_STORE['duplicate_frame_total'] = 0
@@ -0,0 +1,222 @@
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from time import perf_counter, sleep
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+import numpy
+from onnxruntime import InferenceSession
+
+from facefusion import logger, process_manager, state_manager, wording
+from facefusion.execution import create_inference_session
+from facefusion.filesystem import get_file_size
+from facefusion.memory import get_resident_memory
+from facefusion.typing import ExecutionProviderKey, InferenceInputs, InferenceSessionGetter, InferenceSessionSet, WarmUpReport
+
+INFERENCE_SESSIONS : InferenceSessionSet = {}
+INFERENCE_WORKING_SET : Set[str] = set()
+INFERENCE_LOCKS : Dict[str, threading.Lock] = {}
+INFERENCE_LOADS : Dict[str, bool] = {}
+INFERENCE_LOCK : threading.Lock = threading.Lock()
+INFERENCE_THREAD_COUNTER : Iterator[int] = itertools.count()
+INFERENCE_THREAD_LOCAL : threading.local = threading.local()
+INFERENCE_INPUT_TYPES : Dict[str, Any] =\
+{
+	'tensor(bool)': numpy.bool_,
+	'tensor(double)': numpy.float64,
+	'tensor(float)': numpy.float32,
+	'tensor(float16)': numpy.float16,
+	'tensor(int32)': numpy.int32,
+	'tensor(int64)': numpy.int64,
+	'tensor(uint8)': numpy.uint8
+}
+
+
+def get_inference_sessions() -> InferenceSessionSet:
+	return INFERENCE_SESSIONS
+
+
+def get_inference_session(model_path : str, execution_device_id : str, execution_provider_keys : List[ExecutionProviderKey]) -> InferenceSession:
+	session_key = create_session_key(model_path, execution_device_id, execution_provider_keys, get_replica_index())
+	inference_session_entry = INFERENCE_SESSIONS.get(session_key)
+
+	if process_manager.is_processing():
+		INFERENCE_WORKING_SET.add(session_key)
+	if inference_session_entry:
+		inference_session_entry['time_used'] = perf_counter()
+		return inference_session_entry.get('inference_session')
+
+	with get_inference_lock(session_key):
+		while process_manager.is_checking():
+			sleep(0.5)
+		inference_session_entry = INFERENCE_SESSIONS.get(session_key)
+
+		if not inference_session_entry:
+			start_inference_load(session_key)
+			resident_memory = get_resident_memory()
+			try:
+				inference_session = create_inference_session(model_path, execution_device_id, execution_provider_keys)
+				session_memory = get_resident_memory() - resident_memory
+			finally:
+				is_load_overlapped = stop_inference_load(session_key)
+			inference_session_entry =\
+			{
+				'model_path': model_path,
+				'inference_session': inference_session,
+				'session_size': get_file_size(model_path) if is_load_overlapped else max(session_memory, get_file_size(model_path)),
+				'time_used': perf_counter()
+			}
+
+			with INFERENCE_LOCK:
+				INFERENCE_SESSIONS[session_key] = inference_session_entry
+				reduce_inference_sessions(session_key)
+		return inference_session_entry.get('inference_session')
+
+
+def get_replica_index() -> int:
+	execution_session_replica_count = state_manager.get_item('execution_session_replica_count') or 1
+
+	if execution_session_replica_count > 1:
+		if hasattr(INFERENCE_THREAD_LOCAL, 'replica_index'):
+			return INFERENCE_THREAD_LOCAL.replica_index % execution_session_replica_count
+		if not hasattr(INFERENCE_THREAD_LOCAL, 'thread_index'):
+			INFERENCE_THREAD_LOCAL.thread_index = next(INFERENCE_THREAD_COUNTER)
+		return INFERENCE_THREAD_LOCAL.thread_index % execution_session_replica_count
+	return 0
+
+
+def start_inference_load(session_key : str) -> None:
+	with INFERENCE_LOCK:
+		for load_session_key in INFERENCE_LOADS:
+			INFERENCE_LOADS[load_session_key] = True
+		INFERENCE_LOADS[session_key] = bool(INFERENCE_LOADS)
+
+
+def stop_inference_load(session_key : str) -> bool:
+	with INFERENCE_LOCK:
+		return INFERENCE_LOADS.pop(session_key)
+
+
+def get_inference_lock(session_key : str) -> threading.Lock:
+	with INFERENCE_LOCK:
+		return INFERENCE_LOCKS.setdefault(session_key, threading.Lock())
+
+
+def reduce_inference_sessions(session_key : str) -> None:
+	inference_memory_limit = state_manager.get_item('inference_memory_limit')
+
+	if inference_memory_limit and inference_memory_limit > 0:
+		if not process_manager.is_processing():
+			INFERENCE_WORKING_SET.clear()
+		while calc_inference_sessions_size() > inference_memory_limit * 1024 * 1024:
+			evictable_session_keys = [ key for key in INFERENCE_SESSIONS if key != session_key and key not in INFERENCE_WORKING_SET ]
+
+			if not evictable_session_keys:
+				logger.warn(wording.get('inference_memory_limit_exceeded').format(inference_memory_limit = inference_memory_limit, session_total = len(INFERENCE_SESSIONS)), __name__.upper())
+				break
+			least_used_session_key = min(evictable_session_keys, key = lambda key: INFERENCE_SESSIONS[key].get('time_used'))
+			INFERENCE_SESSIONS.pop(least_used_session_key)
+
+
+def clear_inference_sessions(model_paths : List[str]) -> None:
+	with INFERENCE_LOCK:
+		for session_key in [ session_key for session_key, inference_session_entry in INFERENCE_SESSIONS.items() if inference_session_entry.get('model_path') in model_paths ]:
+			INFERENCE_SESSIONS.pop(session_key)
+
+
+def calc_inference_sessions_size() -> int:
+	return sum(inference_session_entry.get('session_size') for inference_session_entry in INFERENCE_SESSIONS.values())
+
+
+def create_session_key(model_path : str, execution_device_id : str, execution_provider_keys : List[ExecutionProviderKey], replica_index : int = 0) -> str:
+	if replica_index > 0:
+		return '.'.join([ model_path, execution_device_id, *execution_provider_keys, str(replica_index) ])
+	return '.'.join([ model_path, execution_device_id, *execution_provider_keys ])
+
+
+def find_model_path(inference_session : InferenceSession) -> Optional[str]:
+	with INFERENCE_LOCK:
+		for inference_session_entry in INFERENCE_SESSIONS.values():
+			if inference_session_entry.get('inference_session') is inference_session:
+				return inference_session_entry.get('model_path')
+	return None
+
+
+def warm_up_inference_sessions(inference_session_getters : List[InferenceSessionGetter]) -> List[WarmUpReport]:
+	start_time = perf_counter()
+	warm_up_reports = []
+	replica_count = state_manager.get_item('execution_session_replica_count') or 1
+	replica_indices = [ replica_index for _ in inference_session_getters for replica_index in range(replica_count) ]
+	inference_session_getters = [ inference_session_getter for inference_session_getter in inference_session_getters for _ in range(replica_count) ]
+
+	with ThreadPoolExecutor(max_workers = max(min(len(inference_session_getters), state_manager.get_item('execution_thread_count') or 1), 1)) as executor:
+		for warm_up_report in executor.map(warm_up_inference_session, inference_session_getters, replica_indices):
+			if warm_up_report:
+				warm_up_reports.append(warm_up_report)
+				model_name = os.path.basename(warm_up_report.get('model_path'))
+				load_seconds = '{:.2f}'.format(warm_up_report.get('load_time'))
+
+				if warm_up_report.get('inference_time') is None:
+					logger.debug(wording.get('warming_up_model_skipped').format(model_name = model_name, load_seconds = load_seconds), __name__.upper())
+				else:
+					inference_seconds = '{:.2f}'.format(warm_up_report.get('inference_time'))
+					logger.debug(wording.get('warming_up_model_succeed').format(model_name = model_name, load_seconds = load_seconds, inference_seconds = inference_seconds), __name__.upper())
+	if warm_up_reports:
+		seconds = '{:.2f}'.format(perf_counter() - start_time)
+		model_total = len(set(warm_up_report.get('model_path') for warm_up_report in warm_up_reports))
+		logger.info(wording.get('warming_up_models_succeed').format(model_total = model_total, seconds = seconds), __name__.upper())
+	return warm_up_reports
+
+
+def warm_up_inference_session(inference_session_getter : InferenceSessionGetter, replica_index : int = 0) -> Optional[WarmUpReport]:
+	start_time = perf_counter()
+	INFERENCE_THREAD_LOCAL.replica_index = replica_index
+	try:
+		inference_session = inference_session_getter()
+	except Exception as exception:
+		logger.debug(wording.get('warming_up_model_failed').format(model_name = get_inference_session_getter_name(inference_session_getter), exception = exception), __name__.upper())
+		return None
+	finally:
+		del INFERENCE_THREAD_LOCAL.replica_index
+	load_time = perf_counter() - start_time
+	model_path = find_model_path(inference_session)
+
+	if inference_session and model_path:
+		inference_time = None
+		inference_inputs = create_inference_inputs(inference_session)
+
+		if inference_inputs:
+			start_time = perf_counter()
+			try:
+				inference_session.run(None, inference_inputs)
+				inference_time = perf_counter() - start_time
+			except Exception as exception:
+				logger.debug(wording.get('warming_up_model_failed').format(model_name = os.path.basename(model_path), exception = exception), __name__.upper())
+		warm_up_report : WarmUpReport =\
+		{
+			'model_path': model_path,
+			'replica_index': replica_index,
+			'load_time': load_time,
+			'inference_time': inference_time
+		}
+		return warm_up_report
+	return None
+
+
+def get_inference_session_getter_name(inference_session_getter : InferenceSessionGetter) -> str:
+	if isinstance(inference_session_getter, partial):
+		return get_inference_session_getter_name(inference_session_getter.func)
+	return getattr(inference_session_getter, '__module__', '') + '.' + getattr(inference_session_getter, '__name__', '')
+
+
+def create_inference_inputs(inference_session : InferenceSession) -> Optional[InferenceInputs]:
+	inference_inputs : InferenceInputs = {}
+
+	for inference_input in inference_session.get_inputs():
+		if inference_input.type not in INFERENCE_INPUT_TYPES:
+			return None
+		inference_input_shape = [ input_size if isinstance(input_size, int) and input_size > 0 else 1 if index == 0 else 256 for index, input_size in enumerate(inference_input.shape) ]
+		inference_inputs[inference_input.name] = numpy.zeros(inference_input_shape, dtype = INFERENCE_INPUT_TYPES.get(inference_input.type))
+	return inference_inputs
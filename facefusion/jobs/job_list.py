@@ -1,34 +1,65 @@
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from facefusion.date_helper import describe_time_ago
 from facefusion.jobs import job_manager
-from facefusion.typing import JobStatus, TableContents, TableHeaders
+from facefusion.typing import Job, JobStatus, JobStepTelemetry, TableContents, TableHeaders
 
 
-def compose_job_list(job_status : JobStatus) -> Tuple[TableHeaders, TableContents]:
+def compose_job_list(job_status : JobStatus, show_throughput : bool = False) -> Tuple[TableHeaders, TableContents]:
 	jobs = job_manager.find_jobs(job_status)
 	job_headers : TableHeaders = [ 'job id', 'steps', 'date created', 'date updated', 'job status' ]
 	job_contents : TableContents = []
 
+	if show_throughput:
+		job_headers.extend([ 'frames', 'fps', 'peak memory' ])
+
 	for index, job_id in enumerate(jobs):
 		if job_manager.validate_job(job_id):
 			job = jobs[job_id]
 			step_total = job_manager.count_step_total(job_id)
 			date_created = prepare_describe_datetime(job.get('date_created'))
 			date_updated = prepare_describe_datetime(job.get('date_updated'))
-			job_contents.append(
+			job_content : List[int | float | str] =\
 			[
 				job_id,
 				step_total,
 				date_created,
 				date_updated,
 				job_status
-			])
+			]
+
+			if show_throughput:
+				job_content.extend(compose_job_throughput(job))
+			job_contents.append(job_content)
 	return job_headers, job_contents
 
 
+def compose_job_throughput(job : Job) -> List[int | float | str]:
+	step_telemetries = [ step.get('telemetry') for step in job.get('steps') if step.get('telemetry') ]
+
+	if step_telemetries:
+		frame_total = sum(step_telemetry.get('frame_total') for step_telemetry in step_telemetries)
+		process_time = calc_job_process_time(step_telemetries)
+		frame_rate = round(frame_total / process_time, 2) if process_time > 0 else 0.0
+		peak_memory = max(step_telemetry.get('peak_memory') for step_telemetry in step_telemetries)
+		return [ frame_total, frame_rate, prepare_describe_memory(peak_memory) ]
+	return [ None, None, None ]
+
+
+def calc_job_process_time(step_telemetries : List[JobStepTelemetry]) -> float:
+	if all(step_telemetry.get('date_started') for step_telemetry in step_telemetries):
+		start_times = [ datetime.fromisoformat(step_telemetry.get('date_started')).timestamp() for step_telemetry in step_telemetries ]
+		end_times = [ start_time + step_telemetry.get('process_time') for start_time, step_telemetry in zip(start_times, step_telemetries) ]
+		return max(end_times) - min(start_times)
+	return sum(step_telemetry.get('process_time') for step_telemetry in step_telemetries)
+
+
 def prepare_describe_datetime(date_time : Optional[str]) -> Optional[str]:
 	if date_time:
 		return describe_time_ago(datetime.fromisoformat(date_time))
 	return None
+
+
+def prepare_describe_memory(memory : int) -> str:
+	return str(round(memory / 1024 ** 2)) + ' MB'
@@ -1,23 +1,35 @@
 import glob
 import os
-from copy import copy
-from typing import List, Optional
+import socket
+from contextlib import contextmanager
+from copy import copy, deepcopy
+from time import time
+from typing import Iterator, List, Optional, Set
 
 from facefusion.choices import job_statuses
 from facefusion.date_helper import get_current_date_time
-from facefusion.filesystem import create_directory, is_directory, is_file, move_file, remove_directory, remove_file
+from facefusion.filesystem import create_directory, get_file_time, is_directory, is_file, move_file, remove_directory, remove_file
 from facefusion.jobs.job_helper import get_step_output_path
 from facefusion.json import read_json, write_json
 from facefusion.temp_helper import create_base_directory
-from facefusion.typing import Args, Job, JobSet, JobStatus, JobStep, JobStepStatus
+from facefusion.typing import Args, Job, JobIndex, JobLease, JobSet, JobSignature, JobStatus, JobStatusIndex, JobStep, JobStepStatus, JobStepTelemetry
 
 JOBS_PATH : Optional[str] = None
+JOB_INDEX : JobIndex = {}
+JOB_STATUS_INDEX : JobStatusIndex = {}
+JOB_TRANSACTIONS : JobSet = {}
+JOB_CLAIMS : Set[str] = set()
+JOB_LEASE_TIMEOUT = 60
 
 
 def init_jobs(jobs_path : str) -> bool:
 	global JOBS_PATH
 
 	JOBS_PATH = jobs_path
+	JOB_INDEX.clear()
+	JOB_STATUS_INDEX.clear()
+	JOB_TRANSACTIONS.clear()
+	JOB_CLAIMS.clear()
 	job_status_paths = [ os.path.join(JOBS_PATH, job_status) for job_status in job_statuses ]
 
 	create_base_directory()
@@ -27,6 +39,8 @@ def init_jobs(jobs_path : str) -> bool:
 
 
 def clear_jobs(jobs_path : str) -> bool:
+	JOB_INDEX.clear()
+	JOB_STATUS_INDEX.clear()
 	return remove_directory(jobs_path)
 
 
@@ -47,7 +61,9 @@ def submit_job(job_id : str) -> bool:
 	steps = get_steps(job_id)
 
 	if job_id in drafted_job_ids and steps:
-		return set_steps_status(job_id, 'queued') and move_job_file(job_id, 'queued')
+		with job_transaction(job_id) as is_job_transaction:
+			if is_job_transaction and set_steps_status(job_id, 'queued') and commit_job_transaction(job_id):
+				return move_job_file(job_id, 'queued')
 	return False
 
 
@@ -62,6 +78,83 @@ def submit_jobs() -> bool:
 	return False
 
 
+def claim_job(job_id : str) -> bool:
+	job_path = suggest_job_path(job_id, 'queued')
+	job_claim_path = suggest_job_path(job_id, 'running')
+
+	if is_file(job_path):
+		try:
+			os.rename(job_path, job_claim_path)
+		except OSError:
+			return False
+		os.utime(job_claim_path)
+		JOB_CLAIMS.add(job_id)
+		return write_job_lease(job_id)
+	return False
+
+
+def release_job(job_id : str, job_status : JobStatus) -> bool:
+	JOB_CLAIMS.discard(job_id)
+
+	if has_job_lease(job_id):
+		remove_file(get_job_lease_path(job_id))
+		return move_job_file(job_id, job_status)
+	return False
+
+
+def recover_jobs() -> bool:
+	for job_id in find_job_ids('running'):
+		if time() - get_job_lease_time(job_id) > JOB_LEASE_TIMEOUT:
+			remove_file(get_job_lease_path(job_id))
+			try:
+				os.rename(suggest_job_path(job_id, 'running'), suggest_job_path(job_id, 'queued'))
+			except OSError:
+				continue
+	return True
+
+
+def renew_job_lease(job_id : str) -> bool:
+	current_job_lease = read_json(get_job_lease_path(job_id))
+
+	if is_file(suggest_job_path(job_id, 'running')) and (not current_job_lease or current_job_lease.get('worker_id') == get_worker_id()):
+		return write_job_lease(job_id)
+	return False
+
+
+def write_job_lease(job_id : str) -> bool:
+	job_lease : JobLease =\
+	{
+		'worker_id': get_worker_id(),
+		'date_renewed': get_current_date_time().isoformat()
+	}
+	return write_json(get_job_lease_path(job_id), job_lease) #type:ignore[arg-type]
+
+
+def has_job_lease(job_id : str) -> bool:
+	job_lease = read_json(get_job_lease_path(job_id))
+	return bool(job_lease and job_lease.get('worker_id') == get_worker_id())
+
+
+def is_job_fenced(job_id : str) -> bool:
+	return job_id in JOB_CLAIMS and not has_job_lease(job_id)
+
+
+def get_job_lease_time(job_id : str) -> float:
+	for job_lease_path in [ get_job_lease_path(job_id), suggest_job_path(job_id, 'running') ]:
+		job_lease_time = get_file_time(job_lease_path)
+		if job_lease_time is not None:
+			return job_lease_time
+	return time()
+
+
+def get_job_lease_path(job_id : str) -> str:
+	return os.path.join(JOBS_PATH, 'running', job_id + '.lease')
+
+
+def get_worker_id() -> str:
+	return socket.gethostname() + '-' + str(os.getpid())
+
+
 def delete_job(job_id : str) -> bool:
 	return delete_job_file(job_id)
 
@@ -87,19 +180,40 @@ def find_jobs(job_status : JobStatus) -> JobSet:
 
 
 def find_job_ids(job_status : JobStatus) -> List[str]:
+	status_signature = get_job_signature(os.path.join(JOBS_PATH, job_status))
+
+	if is_job_status_indexed(job_status, status_signature):
+		return copy(JOB_STATUS_INDEX[job_status].get('job_ids'))
+	date_indexed = time()
 	job_pattern = os.path.join(JOBS_PATH, job_status, '*.json')
 	job_files = glob.glob(job_pattern)
-	job_files.sort(key = os.path.getmtime)
+	job_files.sort(key = lambda job_file: get_file_time(job_file) or 0)
 	job_ids = []
 
 	for job_file in job_files:
 		job_id, _ = os.path.splitext(os.path.basename(job_file))
 		job_ids.append(job_id)
-	return job_ids
+		if job_id not in JOB_INDEX or JOB_INDEX[job_id].get('job_path') != job_file:
+			index_job_file(job_id, job_file, None)
+	JOB_STATUS_INDEX[job_status] =\
+	{
+		'status_signature': status_signature,
+		'date_indexed': date_indexed,
+		'job_ids': job_ids
+	}
+	return copy(job_ids)
+
+
+def is_job_status_indexed(job_status : JobStatus, status_signature : Optional[JobSignature]) -> bool:
+	job_status_index = JOB_STATUS_INDEX.get(job_status)
+
+	if job_status_index and status_signature and job_status_index.get('status_signature') == status_signature:
+		return job_status_index.get('date_indexed') - status_signature[2] / 1e9 > 1
+	return False
 
 
 def validate_job(job_id : str) -> bool:
-	job = read_job_file(job_id)
+	job = get_indexed_job(job_id)
 	return bool(job and 'version' in job and 'date_created' in job and 'date_updated' in job and 'steps' in job)
 
 
@@ -115,7 +229,8 @@ def add_step(job_id : str, step_args : Args) -> bool:
 		job.get('steps').append(
 		{
 			'args': step_args,
-			'status': 'drafted'
+			'status': 'drafted',
+			'telemetry': None
 		})
 		return update_job_file(job_id, job)
 	return False
@@ -146,7 +261,8 @@ def insert_step(job_id : str, step_index : int, step_args : Args) -> bool:
 		job.get('steps').insert(step_index,
 		{
 			'args': step_args,
-			'status': 'drafted'
+			'status': 'drafted',
+			'telemetry': None
 		})
 		return update_job_file(job_id, job)
 	return False
@@ -173,10 +289,10 @@ def get_steps(job_id : str) -> List[JobStep]:
 
 
 def count_step_total(job_id : str) -> int:
-	steps = get_steps(job_id)
+	job = get_indexed_job(job_id)
 
-	if steps:
-		return len(steps)
+	if job:
+		return len(job.get('steps'))
 	return 0
 
 
@@ -192,6 +308,18 @@ def set_step_status(job_id : str, step_index : int, step_status : JobStepStatus)
 	return False
 
 
+def set_step_telemetry(job_id : str, step_index : int, step_telemetry : JobStepTelemetry) -> bool:
+	job = read_job_file(job_id)
+
+	if job:
+		steps = job.get('steps')
+
+		if has_step(job_id, step_index):
+			steps[step_index]['telemetry'] = step_telemetry
+			return update_job_file(job_id, job)
+	return False
+
+
 def set_steps_status(job_id : str, step_status : JobStepStatus) -> bool:
 	job = read_job_file(job_id)
 
@@ -203,8 +331,23 @@ def set_steps_status(job_id : str, step_status : JobStepStatus) -> bool:
 
 
 def read_job_file(job_id : str) -> Optional[Job]:
+	job = get_indexed_job(job_id)
+	return deepcopy(job)
+
+
+def get_indexed_job(job_id : str) -> Optional[Job]:
+	if job_id in JOB_TRANSACTIONS:
+		return JOB_TRANSACTIONS.get(job_id)
 	job_path = find_job_path(job_id)
-	return read_json(job_path) #type:ignore[return-value]
+	job_signature = get_job_signature(job_path)
+
+	if job_id in JOB_INDEX and JOB_INDEX[job_id].get('job_signature') == job_signature and JOB_INDEX[job_id].get('job'):
+		return JOB_INDEX[job_id].get('job')
+	job = read_json(job_path)
+
+	if job_path and job:
+		index_job_file(job_id, job_path, job) #type:ignore[arg-type]
+	return job #type:ignore[return-value]
 
 
 def create_job_file(job_id : str, job : Job) -> bool:
@@ -212,30 +355,92 @@ def create_job_file(job_id : str, job : Job) -> bool:
 
 	if not is_file(job_path):
 		job_create_path = suggest_job_path(job_id, 'drafted')
-		return write_json(job_create_path, job) #type:ignore[arg-type]
+		if write_json(job_create_path, job): #type:ignore[arg-type]
+			return index_job_file(job_id, job_create_path, deepcopy(job))
 	return False
 
 
 def update_job_file(job_id : str, job : Job) -> bool:
 	job_path = find_job_path(job_id)
 
-	if is_file(job_path):
+	if is_file(job_path) and not is_job_fenced(job_id):
 		job['date_updated'] = get_current_date_time().isoformat()
-		return write_json(job_path, job) #type:ignore[arg-type]
+		if job_id in JOB_TRANSACTIONS:
+			JOB_TRANSACTIONS[job_id] = deepcopy(job)
+			return True
+		if write_json(job_path, job): #type:ignore[arg-type]
+			return index_job_file(job_id, job_path, deepcopy(job))
+	return False
+
+
+@contextmanager
+def job_transaction(job_id : str) -> Iterator[bool]:
+	is_job_transaction = start_job_transaction(job_id)
+
+	try:
+		yield is_job_transaction
+	finally:
+		if is_job_transaction:
+			discard_job_transaction(job_id)
+
+
+def start_job_transaction(job_id : str) -> bool:
+	job = read_job_file(job_id)
+
+	if job and job_id not in JOB_TRANSACTIONS:
+		JOB_TRANSACTIONS[job_id] = job
+		return True
+	return False
+
+
+def commit_job_transaction(job_id : str) -> bool:
+	job = JOB_TRANSACTIONS.pop(job_id, None)
+	job_path = find_job_path(job_id)
+
+	if job and job_path and not is_job_fenced(job_id) and write_json(job_path, job): #type:ignore[arg-type]
+		return index_job_file(job_id, job_path, job)
 	return False
 
 
+def discard_job_transaction(job_id : str) -> bool:
+	return JOB_TRANSACTIONS.pop(job_id, None) is not None
+
+
 def move_job_file(job_id : str, job_status : JobStatus) -> bool:
 	job_path = find_job_path(job_id)
 	job_move_path = suggest_job_path(job_id, job_status)
-	return move_file(job_path, job_move_path)
+
+	if move_file(job_path, job_move_path):
+		return index_job_file(job_id, job_move_path, JOB_INDEX[job_id].get('job'))
+	return False
 
 
 def delete_job_file(job_id : str) -> bool:
 	job_path = find_job_path(job_id)
+	JOB_INDEX.pop(job_id, None)
 	return remove_file(job_path)
 
 
+def index_job_file(job_id : str, job_path : str, job : Optional[Job]) -> bool:
+	JOB_INDEX[job_id] =\
+	{
+		'job_path': job_path,
+		'job_signature': get_job_signature(job_path),
+		'job': job
+	}
+	return True
+
+
+def get_job_signature(job_path : Optional[str]) -> Optional[JobSignature]:
+	if job_path:
+		try:
+			job_stat = os.stat(job_path)
+			return job_stat.st_ino, job_stat.st_size, job_stat.st_mtime_ns
+		except OSError:
+			pass
+	return None
+
+
 def suggest_job_path(job_id : str, job_status : JobStatus) -> Optional[str]:
 	job_file_name = get_job_file_name(job_id)
 
@@ -245,15 +450,16 @@ def suggest_job_path(job_id : str, job_status : JobStatus) -> Optional[str]:
 
 
 def find_job_path(job_id : str) -> Optional[str]:
-	job_file_name = get_job_file_name(job_id)
+	if job_id in JOB_INDEX and is_file(JOB_INDEX[job_id].get('job_path')):
+		return JOB_INDEX[job_id].get('job_path')
+	JOB_INDEX.pop(job_id, None)
 
-	if job_file_name:
-		for job_status in job_statuses:
-			job_pattern = os.path.join(JOBS_PATH, job_status, job_file_name)
-			job_paths = glob.glob(job_pattern)
+	for job_status in job_statuses:
+		job_path = suggest_job_path(job_id, job_status)
 
-			for job_path in job_paths:
-				return job_path
+		if is_file(job_path):
+			index_job_file(job_id, job_path, None)
+			return job_path
 	return None
 
 
@@ -1,37 +1,70 @@
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Set, Tuple
+
+from facefusion import logger, state_manager, telemetry
 from facefusion.ffmpeg import concat_video
 from facefusion.filesystem import is_image, is_video, move_file, remove_file
-from facefusion.jobs import job_helper, job_manager
-from facefusion.typing import JobOutputSet, JobStep, ProcessStep
+from facefusion.jobs import job_helper, job_manager, job_store
+from facefusion.state_manager import UnionState
+from facefusion.temp_helper import resolve_temp_directory_path
+from facefusion.typing import Args, JobOutputSet, JobStep, JobStepGraph, JobStepTelemetry, ProcessStep
+
+JOB_HEARTBEAT_INTERVAL = 10
 
 
 def run_job(job_id : str, process_step : ProcessStep) -> bool:
+	job_manager.recover_jobs()
 	queued_job_ids = job_manager.find_job_ids('queued')
 
-	if job_id in queued_job_ids:
-		if run_steps(job_id, process_step) and finalize_steps(job_id):
-			clean_steps(job_id)
-			return job_manager.move_job_file(job_id, 'completed')
-		clean_steps(job_id)
-		job_manager.move_job_file(job_id, 'failed')
+	if job_id in queued_job_ids and job_manager.claim_job(job_id):
+		return run_claimed_job(job_id, process_step)
 	return False
 
 
 def run_jobs(process_step : ProcessStep) -> bool:
+	job_manager.recover_jobs()
 	queued_job_ids = job_manager.find_job_ids('queued')
 
 	if queued_job_ids:
 		for job_id in queued_job_ids:
-			if not run_job(job_id, process_step):
+			if job_manager.claim_job(job_id) and not run_claimed_job(job_id, process_step):
 				return False
 		return True
 	return False
 
 
+def run_claimed_job(job_id : str, process_step : ProcessStep) -> bool:
+	heartbeat_event = start_job_heartbeat(job_id)
+	is_job_completed = run_steps(job_id, process_step) and finalize_steps(job_id)
+	heartbeat_event.set()
+	clean_steps(job_id)
+
+	if is_job_completed:
+		return job_manager.release_job(job_id, 'completed')
+	job_manager.release_job(job_id, 'failed')
+	return False
+
+
+def start_job_heartbeat(job_id : str) -> threading.Event:
+	heartbeat_event = threading.Event()
+	threading.Thread(target = renew_job_heartbeat, args = (job_id, heartbeat_event), daemon = True).start()
+	return heartbeat_event
+
+
+def renew_job_heartbeat(job_id : str, heartbeat_event : threading.Event) -> None:
+	while not heartbeat_event.wait(JOB_HEARTBEAT_INTERVAL):
+		job_manager.renew_job_lease(job_id)
+
+
 def retry_job(job_id : str, process_step : ProcessStep) -> bool:
 	failed_job_ids = job_manager.find_job_ids('failed')
 
 	if job_id in failed_job_ids:
-		return job_manager.set_steps_status(job_id, 'queued') and job_manager.move_job_file(job_id, 'queued') and run_job(job_id, process_step)
+		with job_manager.job_transaction(job_id) as is_job_transaction:
+			is_job_queued = is_job_transaction and job_manager.set_steps_status(job_id, 'queued') and job_manager.commit_job_transaction(job_id)
+		return is_job_queued and job_manager.move_job_file(job_id, 'queued') and run_job(job_id, process_step)
 	return False
 
 
@@ -49,19 +82,30 @@ def retry_jobs(process_step : ProcessStep) -> bool:
 def run_step(job_id : str, step_index : int, step : JobStep, process_step : ProcessStep) -> bool:
 	step_args = step.get('args')
 
-	if job_manager.set_step_status(job_id, step_index, 'started') and process_step(job_id, step_index, step_args):
-		output_path = step_args.get('output_path')
-		step_output_path = job_helper.get_step_output_path(job_id, step_index, output_path)
+	if job_manager.set_step_status(job_id, step_index, 'started'):
+		is_step_processed, step_telemetry = process_telemetry_step(process_step, job_id, step_index, step_args)
+
+		if job_manager.set_step_telemetry(job_id, step_index, step_telemetry) and is_step_processed:
+			output_path = step_args.get('output_path')
+			step_output_path = job_helper.get_step_output_path(job_id, step_index, output_path)
 
-		return move_file(output_path, step_output_path) and job_manager.set_step_status(job_id, step_index, 'completed')
+			return move_file(output_path, step_output_path) and job_manager.set_step_status(job_id, step_index, 'completed')
 	job_manager.set_step_status(job_id, step_index, 'failed')
 	return False
 
 
+def process_telemetry_step(process_step : ProcessStep, job_id : str, step_index : int, step_args : Args) -> Tuple[bool, JobStepTelemetry]:
+	telemetry.start_telemetry()
+	is_step_processed = process_step(job_id, step_index, step_args)
+	return is_step_processed, telemetry.collect_telemetry()
+
+
 def run_steps(job_id : str, process_step : ProcessStep) -> bool:
 	steps = job_manager.get_steps(job_id)
 
 	if steps:
+		if can_run_parallel_steps(steps):
+			return run_parallel_steps(job_id, steps, process_step)
 		for index, step in enumerate(steps):
 			if not run_step(job_id, index, step, process_step):
 				return False
@@ -69,6 +113,102 @@ def run_steps(job_id : str, process_step : ProcessStep) -> bool:
 	return False
 
 
+def can_run_parallel_steps(steps : List[JobStep]) -> bool:
+	return calc_step_worker_total() > 1 and len(steps) > 1
+
+
+def run_parallel_steps(job_id : str, steps : List[JobStep], process_step : ProcessStep) -> bool:
+	step_graph = create_step_graph(job_id, steps)
+	pending_step_indices = list(step_graph.keys())
+	completed_step_indices : Set[int] = set()
+	step_futures : Dict[Future[Tuple[bool, JobStepTelemetry]], int] = {}
+
+	with create_step_executor() as executor:
+		while pending_step_indices or step_futures:
+			with job_manager.job_transaction(job_id):
+				for step_index in [ step_index for step_index in pending_step_indices if step_graph.get(step_index).issubset(completed_step_indices) ]:
+					step_args = steps[step_index].get('args').copy()
+					step_args['output_path'] = job_helper.get_step_output_path(job_id, step_index, step_args.get('output_path'))
+					pending_step_indices.remove(step_index)
+					job_manager.set_step_status(job_id, step_index, 'started')
+					step_futures[executor.submit(process_telemetry_step, process_step, job_id, step_index, step_args)] = step_index
+				is_step_failed = not job_manager.commit_job_transaction(job_id)
+
+			if not is_step_failed:
+				done_step_futures, _ = wait(step_futures, return_when = FIRST_COMPLETED)
+				is_step_failed = not resolve_step_futures(job_id, step_futures, done_step_futures, completed_step_indices)
+
+			if is_step_failed:
+				for step_future in step_futures:
+					step_future.cancel()
+				resolve_step_futures(job_id, step_futures, set(step_futures), completed_step_indices)
+				return False
+	return len(completed_step_indices) == len(steps)
+
+
+def resolve_step_futures(job_id : str, step_futures : Dict[Future[Tuple[bool, JobStepTelemetry]], int], done_step_futures : Set[Future[Tuple[bool, JobStepTelemetry]]], completed_step_indices : Set[int]) -> bool:
+	is_step_failed = False
+	wait([ step_future for step_future in done_step_futures if not step_future.cancelled() ])
+
+	with job_manager.job_transaction(job_id):
+		for step_future in done_step_futures:
+			step_index = step_futures.pop(step_future)
+			is_step_processed = False
+
+			if not step_future.cancelled() and step_future.exception() is None:
+				is_step_processed, step_telemetry = step_future.result()
+				job_manager.set_step_telemetry(job_id, step_index, step_telemetry)
+			if is_step_processed:
+				job_manager.set_step_status(job_id, step_index, 'completed')
+				completed_step_indices.add(step_index)
+			else:
+				job_manager.set_step_status(job_id, step_index, 'failed')
+				is_step_failed = True
+		return job_manager.commit_job_transaction(job_id) and not is_step_failed
+
+
+def create_step_graph(job_id : str, steps : List[JobStep]) -> JobStepGraph:
+	step_graph : JobStepGraph = {}
+
+	for step_index, step in enumerate(steps):
+		step_graph[step_index] = set()
+
+		for previous_step_index, previous_step in enumerate(steps[:step_index]):
+			if is_step_dependent(job_id, previous_step_index, previous_step, step):
+				step_graph[step_index].add(previous_step_index)
+	return step_graph
+
+
+def is_step_dependent(job_id : str, previous_step_index : int, previous_step : JobStep, step : JobStep) -> bool:
+	previous_step_args = previous_step.get('args')
+	step_args = step.get('args')
+	previous_step_output_path = job_helper.get_step_output_path(job_id, previous_step_index, previous_step_args.get('output_path'))
+
+	if step_args.get('target_path') == previous_step_output_path:
+		return True
+	return resolve_step_temp_directory_path(step_args) == resolve_step_temp_directory_path(previous_step_args)
+
+
+def resolve_step_temp_directory_path(step_args : Args) -> str:
+	return resolve_temp_directory_path(step_args.get('target_path'), step_args.get('trim_frame_start'), step_args.get('trim_frame_end'))
+
+
+def create_step_executor() -> ProcessPoolExecutor:
+	return ProcessPoolExecutor(max_workers = calc_step_worker_total(), mp_context = multiprocessing.get_context('spawn'), initializer = init_step_worker, initargs = (state_manager.get_state(), job_store.get_job_keys(), job_manager.JOBS_PATH))
+
+
+def calc_step_worker_total() -> int:
+	return max(state_manager.get_item('execution_step_count') or 1, state_manager.get_item('execution_segment_count') or 1)
+
+
+def init_step_worker(state : UnionState, job_keys : List[str], jobs_path : str) -> None:
+	for key, value in state.items():
+		state_manager.init_item(key, value) #type:ignore[arg-type]
+	job_store.register_job_keys(job_keys)
+	logger.init(state_manager.get_item('log_level'))
+	job_manager.init_jobs(jobs_path)
+
+
 def finalize_steps(job_id : str) -> bool:
 	output_set = collect_output_set(job_id)
 
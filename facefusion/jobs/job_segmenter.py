@@ -0,0 +1,31 @@
+from copy import copy
+from typing import List, Optional, Tuple
+
+from facefusion.filesystem import is_video
+from facefusion.typing import Args
+from facefusion.vision import count_video_frame_total
+
+
+def split_step_args(step_args : Args, segment_count : int) -> List[Args]:
+	target_path = step_args.get('target_path')
+
+	if segment_count > 1 and is_video(target_path):
+		trim_frame_start = step_args.get('trim_frame_start')
+		trim_frame_end = step_args.get('trim_frame_end')
+		segment_steps_args = []
+
+		for segment_frame_start, segment_frame_end in calc_segment_frame_ranges(trim_frame_start, trim_frame_end, count_video_frame_total(target_path), segment_count):
+			segment_step_args = copy(step_args)
+			segment_step_args['trim_frame_start'] = segment_frame_start
+			segment_step_args['trim_frame_end'] = segment_frame_end
+			segment_steps_args.append(segment_step_args)
+		return segment_steps_args
+	return [ step_args ]
+
+
+def calc_segment_frame_ranges(trim_frame_start : Optional[int], trim_frame_end : Optional[int], video_frame_total : int, segment_count : int) -> List[Tuple[Optional[int], Optional[int]]]:
+	frame_start = trim_frame_start or 0
+	frame_end = min(trim_frame_end or video_frame_total, video_frame_total)
+	segment_count = max(min(segment_count, frame_end - frame_start), 1)
+	segment_frame_numbers = [ frame_start + (frame_end - frame_start) * segment_index // segment_count for segment_index in range(1, segment_count) ]
+	return list(zip([ trim_frame_start ] + segment_frame_numbers, segment_frame_numbers + [ trim_frame_end ])) #type:ignore[arg-type]
@@ -1,8 +1,10 @@
 import json
+import os
+import uuid
 from json import JSONDecodeError
 from typing import Optional
 
-from facefusion.filesystem import is_file
+from facefusion.filesystem import is_file, remove_file
 from facefusion.typing import Content
 
 
@@ -17,6 +19,14 @@ def read_json(json_path : str) -> Optional[Content]:
 
 
 def write_json(json_path : str, content : Content) -> bool:
-	with open(json_path, 'w') as json_file:
-		json.dump(content, json_file, indent = 4)
+	json_temp_path = json_path + '.' + uuid.uuid4().hex + '.tmp'
+
+	try:
+		with open(json_temp_path, 'w') as json_file:
+			json.dump(content, json_file, indent = 4)
+			json_file.flush()
+			os.fsync(json_file.fileno())
+		os.replace(json_temp_path, json_path)
+	finally:
+		remove_file(json_temp_path)
 	return is_file(json_path)
@@ -1,3 +1,5 @@
+import psutil
+
 from facefusion.common_helper import is_macos, is_windows
 
 if is_windows():
@@ -19,3 +21,19 @@ def limit_system_memory(system_memory_limit : int = 1) -> bool:
 		return True
 	except Exception:
 		return False
+
+
+def get_process_memory() -> int:
+	process = psutil.Process()
+	process_memory = process.memory_info().rss
+
+	for child_process in process.children(recursive = True):
+		try:
+			process_memory += child_process.memory_info().rss
+		except psutil.Error:
+			continue
+	return process_memory
+
+
+def get_resident_memory() -> int:
+	return psutil.Process().memory_info().rss
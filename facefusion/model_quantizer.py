@@ -0,0 +1,169 @@
+import os
+import uuid
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy
+from numpy.typing import NDArray
+from onnxruntime import InferenceSession
+from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_dynamic, quantize_static
+
+from facefusion import content_analyser, logger, state_manager, wording
+from facefusion.execution import get_quantized_model_path
+from facefusion.filesystem import is_file, is_image, is_video, remove_file
+from facefusion.inference_manager import find_model_path, get_inference_session_getter_name
+from facefusion.processors.frame.core import get_frame_processors_modules
+from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_directory_path
+from facefusion.typing import ErrorCode, InferenceInputs, InferenceSessionGetter, VisionFrame
+from facefusion.vision import count_video_frame_total, get_video_frame, read_static_image, write_image
+
+
+class CalibrationReader(CalibrationDataReader):
+	def __init__(self, calibration_inputs : List[InferenceInputs]) -> None:
+		self.calibration_inputs : Iterator[InferenceInputs] = iter(calibration_inputs)
+
+	def get_next(self) -> Optional[InferenceInputs]:
+		return next(self.calibration_inputs, None)
+
+
+def quantize_models(inference_session_getters : List[InferenceSessionGetter]) -> ErrorCode:
+	target_path = state_manager.get_item('target_path')
+
+	if not is_image(target_path) and not is_video(target_path):
+		logger.error(wording.get('choose_image_or_video_target') + wording.get('exclamation_mark'), __name__.upper())
+		return 1
+	for frame_processor_module in get_frame_processors_modules(state_manager.get_item('frame_processors')):
+		if not frame_processor_module.pre_process('preview'):
+			return 2
+	calibration_frames, validation_frames = split_calibration_frames(read_calibration_frames(target_path, state_manager.get_item('quantize_frame_total')))
+	calibration_inputs_set = collect_calibration_inputs(inference_session_getters, calibration_frames)
+	validation_inputs_set = collect_calibration_inputs(inference_session_getters, validation_frames)
+	quantized_model_total = 0
+
+	for model_path, calibration_inputs in calibration_inputs_set.items():
+		model_name = os.path.basename(model_path)
+		validation_inputs = validation_inputs_set.get(model_path) or calibration_inputs
+
+		if calibration_inputs:
+			if quantize_model(model_path, calibration_inputs, validation_inputs):
+				quantized_model_total += 1
+		else:
+			logger.warn(wording.get('quantizing_model_skipped').format(model_name = model_name), __name__.upper())
+	if quantized_model_total:
+		return 0
+	return 1
+
+
+def read_calibration_frames(target_path : str, frame_total : int) -> List[VisionFrame]:
+	if is_video(target_path):
+		trim_frame_start = state_manager.get_item('trim_frame_start') or 0
+		trim_frame_end = state_manager.get_item('trim_frame_end') or count_video_frame_total(target_path)
+		frame_numbers = numpy.unique(numpy.linspace(trim_frame_start, max(trim_frame_end - 1, trim_frame_start), frame_total).astype(int))
+		return [ vision_frame for vision_frame in (get_video_frame(target_path, frame_number) for frame_number in frame_numbers) if numpy.any(vision_frame) ]
+	return [ read_static_image(target_path) ]
+
+
+def split_calibration_frames(calibration_frames : List[VisionFrame]) -> Tuple[List[VisionFrame], List[VisionFrame]]:
+	if len(calibration_frames) > 1:
+		validation_frames = calibration_frames[1::4]
+		calibration_frames = [ calibration_frame for index, calibration_frame in enumerate(calibration_frames) if index % 4 != 1 ]
+		return calibration_frames, validation_frames
+	return calibration_frames, []
+
+
+def collect_calibration_inputs(inference_session_getters : List[InferenceSessionGetter], calibration_frames : List[VisionFrame]) -> Dict[str, List[InferenceInputs]]:
+	target_path = state_manager.get_item('target_path')
+	content_analyser_model_paths = [ model.get('path') for model in content_analyser.MODELS.values() ]
+	calibration_inputs_set : Dict[str, List[InferenceInputs]] = {}
+	inference_sessions : List[InferenceSession] = []
+
+	if not calibration_frames:
+		return calibration_inputs_set
+
+	face_selector_mode = state_manager.get_item('face_selector_mode')
+	execution_model_precision = state_manager.get_item('execution_model_precision')
+	state_manager.set_item('face_selector_mode', 'many')
+	state_manager.set_item('execution_model_precision', 'fp32')
+	create_temp_directory(target_path)
+	try:
+		for inference_session_getter in inference_session_getters:
+			try:
+				inference_session = inference_session_getter()
+			except Exception as exception:
+				logger.debug(wording.get('quantizing_model_error').format(model_name = get_inference_session_getter_name(inference_session_getter), exception = exception), __name__.upper())
+				continue
+			model_path = find_model_path(inference_session) if inference_session else None
+
+			if model_path and model_path not in content_analyser_model_paths and model_path not in calibration_inputs_set:
+				calibration_inputs_set[model_path] = []
+				inference_session.run = partial(run_calibration, inference_session.run, calibration_inputs_set[model_path]) #type:ignore[method-assign]
+				inference_sessions.append(inference_session)
+
+		for index, calibration_frame in enumerate(calibration_frames):
+			calibration_frame_path = os.path.join(get_temp_directory_path(target_path), 'calibration-' + str(index).zfill(4) + '.png')
+			write_image(calibration_frame_path, calibration_frame)
+			for frame_processor_module in get_frame_processors_modules(state_manager.get_item('frame_processors')):
+				frame_processor_module.process_image(state_manager.get_item('source_paths'), calibration_frame_path, calibration_frame_path)
+	finally:
+		for inference_session in inference_sessions:
+			del inference_session.run
+		state_manager.set_item('face_selector_mode', face_selector_mode)
+		state_manager.set_item('execution_model_precision', execution_model_precision)
+		clear_temp_directory(target_path)
+	return calibration_inputs_set
+
+
+def run_calibration(run : Callable[..., Any], calibration_inputs : List[InferenceInputs], output_names : Any, input_feed : Dict[str, Any], run_options : Any = None) -> Any:
+	calibration_inputs.append({ input_name: numpy.asarray(input_value) for input_name, input_value in input_feed.items() })
+	return run(output_names, input_feed, run_options)
+
+
+def quantize_model(model_path : str, calibration_inputs : List[InferenceInputs], validation_inputs : List[InferenceInputs]) -> bool:
+	model_name = os.path.basename(model_path)
+	quantized_model_path = get_quantized_model_path(model_path)
+	quantized_model_temp_path = quantized_model_path + '.' + uuid.uuid4().hex + '.tmp'
+	similarity = 0.0
+
+	try:
+		if state_manager.get_item('quantize_method') == 'static':
+			quantize_static(model_path, quantized_model_temp_path, CalibrationReader(calibration_inputs), quant_format = QuantFormat.QDQ, per_channel = True, activation_type = QuantType.QUInt8, weight_type = QuantType.QInt8)
+		else:
+			quantize_dynamic(model_path, quantized_model_temp_path, weight_type = QuantType.QUInt8)
+		similarity = calc_model_similarity(model_path, quantized_model_temp_path, validation_inputs)
+	except Exception as exception:
+		logger.error(wording.get('quantizing_model_error').format(model_name = model_name, exception = exception), __name__.upper())
+
+	if is_file(quantized_model_temp_path) and similarity >= state_manager.get_item('quantize_similarity'):
+		os.replace(quantized_model_temp_path, quantized_model_path)
+		logger.info(wording.get('quantizing_model_succeed').format(model_name = model_name, similarity = '{:.4f}'.format(similarity)), __name__.upper())
+		return True
+	remove_file(quantized_model_temp_path)
+	logger.error(wording.get('quantizing_model_failed').format(model_name = model_name, similarity = '{:.4f}'.format(similarity)), __name__.upper())
+	return False
+
+
+def calc_model_similarity(model_path : str, quantized_model_path : str, validation_inputs : List[InferenceInputs]) -> float:
+	inference_session = InferenceSession(model_path, providers = [ 'CPUExecutionProvider' ])
+	quantized_inference_session = InferenceSession(quantized_model_path, providers = [ 'CPUExecutionProvider' ])
+	similarities = [ 1.0 ]
+
+	for validation_input in validation_inputs:
+		outputs = inference_session.run(None, validation_input)
+		quantized_outputs = quantized_inference_session.run(None, validation_input)
+
+		for output, quantized_output in zip(outputs, quantized_outputs):
+			if numpy.issubdtype(output.dtype, numpy.floating):
+				similarities.append(calc_output_similarity(output, quantized_output))
+	return min(similarities)
+
+
+def calc_output_similarity(output : NDArray[Any], quantized_output : NDArray[Any]) -> float:
+	if output.shape != quantized_output.shape:
+		return 0.0
+	output = output.astype(numpy.float64).ravel()
+	quantized_output = quantized_output.astype(numpy.float64).ravel()
+	output_norm = numpy.linalg.norm(output) * numpy.linalg.norm(quantized_output)
+
+	if output_norm > 0:
+		return float(numpy.dot(output, quantized_output) / output_norm)
+	return float(numpy.array_equal(output, quantized_output))
@@ -28,3 +28,4 @@ face_enhancer_blend_range : List[int] = create_int_range(0, 100, 1)
 frame_colorizer_blend_range : List[int] = create_int_range(0, 100, 1)
 frame_enhancer_blend_range : List[int] = create_int_range(0, 100, 1)
 face_swapper_expression_restorer_range : List[float] = create_float_range(0, 2, 0.1)
+face_swapper_batch_size_range : List[int] = create_int_range(1, 16, 1)
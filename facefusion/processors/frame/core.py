@@ -1,17 +1,41 @@
 import importlib
+import multiprocessing
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from collections import deque
+from concurrent.futures import Executor, FIRST_COMPLETED, Future, InvalidStateError, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import ExitStack, contextmanager, nullcontext, suppress
+from functools import partial
+from itertools import islice
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Event
 from queue import Queue
+from time import perf_counter
 from types import ModuleType
-from typing import Any, List
+from typing import Any, ContextManager, Deque, Dict, Iterator, List, Optional, Set
 
+import numpy
 from tqdm import tqdm
 
-from facefusion import logger, state_manager, wording
+from facefusion import logger, process_manager, state_manager, wording
+from facefusion.audio import create_empty_audio_frame, get_voice_frame
+from facefusion.checkpoint import append_checkpoint_frames, filter_checkpoint_frames, is_checkpoint_enabled
+from facefusion.common_helper import get_first
 from facefusion.exit_helper import hard_exit
-from facefusion.typing import ProcessFrames, QueuePayload
+from facefusion.face_analyser import get_average_face, get_many_faces
+from facefusion.face_store import append_reference_face, get_reference_faces
+from facefusion.ffmpeg import close_pipe, pipe_extract_frames, pipe_merge_video, read_pipe_frame, write_pipe_frame
+from facefusion.filesystem import filter_audio_paths, filter_image_paths
+from facefusion.frame_deduplicator import count_frame, create_frame_fingerprint, filter_duplicate_frames, is_duplicate_fingerprint, should_skip_duplicate_frames
+from facefusion.processors.frame.typing import FrameProcessorInputs, FrameProcessorSharedFrame, FrameProcessorWorkerReport
+from facefusion.state_manager import UnionState
+from facefusion.telemetry import count_telemetry_frames
+from facefusion.typing import AudioFrame, Face, FaceSet, Fps, ProcessFrames, QueuePayload, UpdateProgress, VisionFrame
+from facefusion.vision import count_video_frame_total, detect_video_fps, pack_resolution, read_image, read_static_images, restrict_video_fps, unpack_resolution, write_image
 
 FRAME_PROCESSORS_MODULES : List[ModuleType] = []
+FRAME_EXECUTOR : Optional[Executor] = None
+FRAME_STOP_EVENT : Optional[Event] = None
 FRAME_PROCESSORS_METHODS =\
 [
 	'get_frame_processor',
@@ -66,26 +90,345 @@ def clear_frame_processors_modules() -> None:
 	FRAME_PROCESSORS_MODULES = []
 
 
+def reset_frame_processors_modules() -> None:
+	global FRAME_PROCESSORS_MODULES
+
+	FRAME_PROCESSORS_MODULES = []
+
+
 def multi_process_frames(source_paths : List[str], temp_frame_paths : List[str], process_frames : ProcessFrames) -> None:
-	queue_payloads = create_queue_payloads(temp_frame_paths)
+	queue_payloads = filter_checkpoint_frames(filter_duplicate_frames(create_queue_payloads(temp_frame_paths)))
 	with tqdm(total = len(queue_payloads), desc = wording.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
-		progress.set_postfix(
+		postfix =\
 		{
 			'execution_providers': state_manager.get_item('execution_providers'),
 			'execution_thread_count': state_manager.get_item('execution_thread_count'),
+			'execution_pool_type': state_manager.get_item('execution_pool_type'),
 			'execution_queue_count': state_manager.get_item('execution_queue_count')
-		})
-		with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count')) as executor:
-			futures = []
+		}
+		progress.set_postfix(postfix)
+		with get_frame_executor() as executor:
+			futures : Set[Future[FrameProcessorWorkerReport]] = set()
 			queue : Queue[QueuePayload] = create_queue(queue_payloads)
-			queue_per_future = max(len(queue_payloads) // state_manager.get_item('execution_thread_count') * state_manager.get_item('execution_queue_count'), 1)
+			worker_times : Dict[int, float] = {}
+			start_time = perf_counter()
+
+			while futures or (not queue.empty() and process_manager.is_processing()):
+				while len(futures) < state_manager.get_item('execution_thread_count') and not queue.empty() and process_manager.is_processing():
+					future = submit_frames(executor, process_frames, source_paths, pick_queue(queue, calc_queue_per_future(queue.qsize())), progress.update)
+					futures.add(future)
+				futures_done, futures = wait(futures, timeout = 0.5, return_when = FIRST_COMPLETED)
+				forward_stop_request()
+
+				for future_done in futures_done:
+					worker_report = future_done.result()
+					worker_id = worker_report.get('worker_id')
+					worker_times[worker_id] = worker_times.get(worker_id, 0) + worker_report.get('process_time')
+				postfix['worker_utilisation'] = describe_worker_utilisation(worker_times, perf_counter() - start_time)
+				progress.set_postfix(postfix)
+
+
+def multi_process_stream(source_paths : List[str], target_path : str, temp_video_resolution : str, temp_video_fps : Fps, output_video_resolution : str, output_video_fps : Fps) -> bool:
+	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+	source_face = get_chain_source_face(source_paths)
+	source_audio_path = get_chain_source_audio_path(source_paths)
+	frame_total = estimate_stream_frame_total(target_path, temp_video_fps)
+	frame_limit = state_manager.get_item('execution_thread_count') * max(state_manager.get_item('execution_queue_count'), calc_stream_run_length())
+	skip_duplicate_frames = should_skip_duplicate_frames()
+	extract_process = pipe_extract_frames(target_path, temp_video_resolution, temp_video_fps)
+	merge_process = None
+	is_stream_valid = True
+
+	try:
+		with tqdm(total = frame_total, desc = wording.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+			progress.set_postfix(
+			{
+				'execution_providers': state_manager.get_item('execution_providers'),
+				'execution_thread_count': state_manager.get_item('execution_thread_count'),
+				'execution_pool_type': state_manager.get_item('execution_pool_type'),
+				'execution_queue_count': state_manager.get_item('execution_queue_count')
+			})
+			with ExitStack() as executor_stack:
+				executors = [ executor_stack.enter_context(create_frame_executor(1)) for _ in range(state_manager.get_item('execution_thread_count')) ]
+				futures : Deque[Future[VisionFrame]] = deque()
+				executor_stack.callback(cancel_futures, futures)
+				original_future = None
+				original_frame_fingerprint = None
+				frame_number = 0
+
+				while process_manager.is_processing() and is_stream_valid:
+					target_vision_frame = read_pipe_frame(extract_process, unpack_resolution(temp_video_resolution))
+
+					if target_vision_frame is not None:
+						frame_fingerprint = create_frame_fingerprint(target_vision_frame) if skip_duplicate_frames else None
+						is_duplicate = bool(original_future and skip_duplicate_frames and is_duplicate_fingerprint(original_frame_fingerprint, frame_fingerprint))
+
+						if is_duplicate:
+							futures.append(original_future)
+						else:
+							original_future = submit_chain_frame(pick_stream_executor(executors, frame_number),
+							{
+								'reference_faces': reference_faces,
+								'source_face': source_face,
+								'source_audio_frame': get_chain_source_audio_frame(source_audio_path, temp_video_fps, frame_number),
+								'target_vision_frame': target_vision_frame,
+								'frame_number': frame_number
+							})
+							original_frame_fingerprint = frame_fingerprint
+							futures.append(original_future)
+						if skip_duplicate_frames:
+							count_frame(is_duplicate)
+						frame_number += 1
+
+					while futures and (len(futures) >= frame_limit or target_vision_frame is None):
+						output_vision_frame = futures.popleft().result()
+						if merge_process is None:
+							output_vision_height, output_vision_width = output_vision_frame.shape[:2]
+							merge_process = pipe_merge_video(target_path, pack_resolution((output_vision_width, output_vision_height)), output_video_resolution, output_video_fps)
+						is_stream_valid = write_pipe_frame(merge_process, output_vision_frame)
+						count_telemetry_frames(1)
+						progress.update()
+
+					if target_vision_frame is None:
+						break
+	finally:
+		is_extract_valid = close_pipe(extract_process)
+		is_merge_valid = close_pipe(merge_process) if merge_process else False
+	return is_merge_valid and is_extract_valid and is_stream_valid
+
+
+@contextmanager
+def share_frame_executor() -> Iterator[Executor]:
+	global FRAME_EXECUTOR
+
+	with create_frame_executor() as executor:
+		FRAME_EXECUTOR = executor
+		try:
+			yield executor
+		finally:
+			FRAME_EXECUTOR = None
+
+
+def get_frame_executor() -> ContextManager[Executor]:
+	if FRAME_EXECUTOR:
+		return nullcontext(FRAME_EXECUTOR)
+	return create_frame_executor()
+
+
+def create_frame_executor(worker_total : Optional[int] = None) -> Executor:
+	global FRAME_STOP_EVENT
+
+	worker_total = worker_total or state_manager.get_item('execution_thread_count')
+
+	if state_manager.get_item('execution_pool_type') == 'process':
+		mp_context = multiprocessing.get_context('spawn')
+		if FRAME_STOP_EVENT is None or FRAME_STOP_EVENT.is_set():
+			FRAME_STOP_EVENT = mp_context.Event()
+		return ProcessPoolExecutor(max_workers = worker_total, mp_context = mp_context, initializer = init_frame_worker, initargs = (state_manager.get_state(), get_reference_faces(), FRAME_STOP_EVENT))
+	return ThreadPoolExecutor(max_workers = worker_total)
+
+
+def forward_stop_request() -> None:
+	if FRAME_STOP_EVENT and process_manager.is_stopping():
+		FRAME_STOP_EVENT.set()
+
+
+def watch_stop_request(stop_event : Event) -> None:
+	stop_event.wait()
+	process_manager.stop()
+
+
+def cancel_futures(futures : Deque[Future[VisionFrame]]) -> None:
+	for future in futures:
+		future.cancel()
+
+
+def calc_stream_run_length() -> int:
+	return max(state_manager.get_item('face_tracker_interval') or 1, 1)
+
+
+def pick_stream_executor(executors : List[Executor], frame_number : int) -> Executor:
+	return executors[frame_number // calc_stream_run_length() % len(executors)]
+
+
+def init_frame_worker(state : UnionState, reference_faces : Optional[FaceSet], stop_event : Event) -> None:
+	for key, value in state.items():
+		state_manager.init_item(key, value) #type:ignore[arg-type]
+	if reference_faces:
+		for name, faces in reference_faces.items():
+			for face in faces:
+				append_reference_face(name, face)
+	logger.init(state_manager.get_item('log_level'))
+	process_manager.start()
+	threading.Thread(target = watch_stop_request, args = (stop_event,), daemon = True).start()
+
 
-			while not queue.empty():
-				future = executor.submit(process_frames, source_paths, pick_queue(queue, queue_per_future), progress.update)
-				futures.append(future)
+def submit_frames(executor : Executor, process_frames : ProcessFrames, source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> Future[FrameProcessorWorkerReport]:
+	if isinstance(executor, ProcessPoolExecutor):
+		future = executor.submit(process_worker_frames, process_frames, source_paths, queue_payloads, None)
+		future.add_done_callback(lambda _: update_progress(len(queue_payloads)))
+		return future
+	return executor.submit(process_worker_frames, process_frames, source_paths, queue_payloads, update_progress)
 
-			for future_done in as_completed(futures):
-				future_done.result()
+
+def process_worker_frames(process_frames : ProcessFrames, source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : Optional[UpdateProgress]) -> FrameProcessorWorkerReport:
+	start_time = perf_counter()
+	process_frames(source_paths, queue_payloads, partial(update_worker_progress, iter(queue_payloads), update_progress))
+	return\
+	{
+		'worker_id': threading.get_native_id(),
+		'process_time': perf_counter() - start_time
+	}
+
+
+def update_worker_progress(queue_payloads : Iterator[QueuePayload], update_progress : Optional[UpdateProgress], frame_total : int) -> None:
+	if is_checkpoint_enabled():
+		frame_numbers = [ queue_payload.get('frame_number') for queue_payload in islice(queue_payloads, frame_total) ]
+		append_checkpoint_frames(state_manager.get_item('target_path'), frame_numbers)
+	if update_progress:
+		update_progress(frame_total)
+
+
+def describe_worker_utilisation(worker_times : Dict[int, float], elapsed_time : float) -> str:
+	worker_utilisations = [ format(min(worker_time / elapsed_time, 1), '.0%') for worker_time in worker_times.values() ]
+	return ' '.join(worker_utilisations)
+
+
+def submit_chain_frame(executor : Executor, inputs : FrameProcessorInputs) -> Future[VisionFrame]:
+	if isinstance(executor, ProcessPoolExecutor):
+		target_vision_frame = inputs.get('target_vision_frame')
+		shared_memory = SharedMemory(create = True, size = target_vision_frame.nbytes)
+		shared_frame = write_shared_frame(shared_memory, target_vision_frame)
+		shared_future = executor.submit(process_shared_chain_frame, shared_frame,
+		{ #type:ignore[typeddict-item]
+			'reference_faces': inputs.get('reference_faces'),
+			'source_face': inputs.get('source_face'),
+			'source_audio_frame': inputs.get('source_audio_frame'),
+			'frame_number': inputs.get('frame_number')
+		})
+		future : Future[VisionFrame] = Future()
+		future.add_done_callback(lambda _: shared_future.cancel())
+		shared_future.add_done_callback(partial(resolve_shared_chain_frame, future, shared_memory))
+		return future
+	return executor.submit(process_chain_frame, inputs)
+
+
+def process_shared_chain_frame(shared_frame : FrameProcessorSharedFrame, inputs : FrameProcessorInputs) -> FrameProcessorSharedFrame:
+	shared_memory = SharedMemory(name = shared_frame.get('name'))
+	inputs['target_vision_frame'] = read_shared_frame(shared_memory, shared_frame)
+	output_vision_frame = process_chain_frame(inputs)
+
+	if output_vision_frame.nbytes > shared_memory.size:
+		shared_memory.close()
+		shared_memory = SharedMemory(create = True, size = output_vision_frame.nbytes)
+	output_shared_frame = write_shared_frame(shared_memory, output_vision_frame)
+	shared_memory.close()
+	return output_shared_frame
+
+
+def resolve_shared_chain_frame(future : Future[VisionFrame], shared_memory : SharedMemory, shared_future : Future[FrameProcessorSharedFrame]) -> None:
+	if shared_future.cancelled():
+		future.cancel()
+	elif shared_future.exception():
+		with suppress(InvalidStateError):
+			future.set_exception(shared_future.exception())
+	else:
+		output_shared_frame = shared_future.result()
+
+		if output_shared_frame.get('name') == shared_memory.name:
+			output_vision_frame = read_shared_frame(shared_memory, output_shared_frame)
+		else:
+			output_shared_memory = SharedMemory(name = output_shared_frame.get('name'))
+			output_vision_frame = read_shared_frame(output_shared_memory, output_shared_frame)
+			output_shared_memory.close()
+			output_shared_memory.unlink()
+		with suppress(InvalidStateError):
+			future.set_result(output_vision_frame)
+	shared_memory.close()
+	shared_memory.unlink()
+
+
+def read_shared_frame(shared_memory : SharedMemory, shared_frame : FrameProcessorSharedFrame) -> VisionFrame:
+	return numpy.ndarray(shared_frame.get('shape'), dtype = numpy.uint8, buffer = shared_memory.buf).copy()
+
+
+def write_shared_frame(shared_memory : SharedMemory, vision_frame : VisionFrame) -> FrameProcessorSharedFrame:
+	numpy.ndarray(vision_frame.shape, dtype = numpy.uint8, buffer = shared_memory.buf)[:] = vision_frame
+	return\
+	{
+		'name': shared_memory.name,
+		'shape': vision_frame.shape
+	}
+
+
+def process_chain_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
+	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+	source_face = get_chain_source_face(source_paths)
+	source_audio_path = get_chain_source_audio_path(source_paths)
+	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
+
+	for queue_payload in process_manager.manage(queue_payloads):
+		frame_number = queue_payload['frame_number']
+		target_vision_path = queue_payload['frame_path']
+		target_vision_frame = read_image(target_vision_path)
+		output_vision_frame = process_chain_frame(
+		{
+			'reference_faces': reference_faces,
+			'source_face': source_face,
+			'source_audio_frame': get_chain_source_audio_frame(source_audio_path, temp_video_fps, frame_number),
+			'target_vision_frame': target_vision_frame,
+			'frame_number': frame_number
+		})
+		write_image(target_vision_path, output_vision_frame)
+		update_progress(1)
+
+
+def process_chain_frame(inputs : FrameProcessorInputs) -> VisionFrame:
+	target_vision_frame = inputs.get('target_vision_frame')
+
+	for frame_processor_module in get_frame_processors_modules(state_manager.get_item('frame_processors')):
+		target_vision_frame = frame_processor_module.process_frame(
+		{
+			'reference_faces': inputs.get('reference_faces'),
+			'source_face': inputs.get('source_face'),
+			'source_audio_frame': inputs.get('source_audio_frame'),
+			'target_vision_frame': target_vision_frame,
+			'frame_number': inputs.get('frame_number')
+		})
+	return target_vision_frame
+
+
+def get_chain_source_face(source_paths : List[str]) -> Optional[Face]:
+	if 'face_swapper' in state_manager.get_item('frame_processors'):
+		source_frames = read_static_images(filter_image_paths(source_paths))
+		source_faces = get_many_faces(source_frames)
+		return get_average_face(source_faces)
+	return None
+
+
+def get_chain_source_audio_path(source_paths : List[str]) -> Optional[str]:
+	if 'lip_syncer' in state_manager.get_item('frame_processors'):
+		return get_first(filter_audio_paths(source_paths))
+	return None
+
+
+def get_chain_source_audio_frame(source_audio_path : Optional[str], temp_video_fps : Fps, frame_number : int) -> AudioFrame:
+	if source_audio_path:
+		source_audio_frame = get_voice_frame(source_audio_path, temp_video_fps, frame_number)
+		if numpy.any(source_audio_frame):
+			return source_audio_frame
+	return create_empty_audio_frame()
+
+
+def estimate_stream_frame_total(target_path : str, temp_video_fps : Fps) -> Optional[int]:
+	video_frame_total = count_video_frame_total(target_path)
+	video_fps = detect_video_fps(target_path)
+
+	if video_frame_total and video_fps:
+		trim_frame_start = state_manager.get_item('trim_frame_start') or 0
+		trim_frame_end = state_manager.get_item('trim_frame_end') or video_frame_total
+		return round((min(trim_frame_end, video_frame_total) - trim_frame_start) * temp_video_fps / video_fps)
+	return None
 
 
 def create_queue(queue_payloads : List[QueuePayload]) -> Queue[QueuePayload]:
@@ -95,6 +438,10 @@ def create_queue(queue_payloads : List[QueuePayload]) -> Queue[QueuePayload]:
 	return queue
 
 
+def calc_queue_per_future(queue_total : int) -> int:
+	return max(queue_total // (state_manager.get_item('execution_thread_count') * 2), state_manager.get_item('execution_queue_count'))
+
+
 def pick_queue(queue : Queue[QueuePayload], queue_per_future : int) -> List[QueuePayload]:
 	queues = []
 	for _ in range(queue_per_future):
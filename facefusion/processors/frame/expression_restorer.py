@@ -1,4 +1,3 @@
-from time import sleep
 from typing import Any, Tuple
 
 import cv2
@@ -6,13 +5,12 @@ import numpy
 
 from facefusion import process_manager, state_manager
 from facefusion.download import conditional_download
-from facefusion.execution import create_inference_session
 from facefusion.face_masker import create_face_mask
 from facefusion.filesystem import is_file, resolve_relative_path
-from facefusion.thread_helper import conditional_thread_semaphore, thread_lock
+from facefusion.inference_manager import clear_inference_sessions, get_inference_session
+from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.typing import ModelSet, VisionFrame
 
-EXPRESSION_RESTORER = None
 MODELS : ModelSet =\
 {
 	'expression_restorer':
@@ -24,21 +22,12 @@ MODELS : ModelSet =\
 
 
 def get_expression_restorer() -> Any:
-	global EXPRESSION_RESTORER
-
-	with thread_lock():
-		while process_manager.is_checking():
-			sleep(0.5)
-		if EXPRESSION_RESTORER is None:
-			model_path = MODELS.get('expression_restorer').get('path')
-			EXPRESSION_RESTORER = create_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-	return EXPRESSION_RESTORER
+	model_path = MODELS.get('expression_restorer').get('path')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
 
 
 def clear_expression_restorer() -> None:
-	global EXPRESSION_RESTORER
-
-	EXPRESSION_RESTORER = None
+	clear_inference_sessions([ MODELS.get('expression_restorer').get('path') ])
 
 
 def pre_check() -> bool:
@@ -65,7 +54,7 @@ def restore_expression(source_vision_frame : VisionFrame, target_vision_frame :
 	prepare_target_frame = cv2.resize(target_vision_frame, (512, 512))[:, :, ::-1].transpose(2, 0, 1).astype(numpy.float32) / 255
 	prepare_restore_amount = numpy.array(restore_amount).astype(numpy.float32)
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(expression_restorer):
 		restore_frame : VisionFrame = expression_restorer.run(None,
 		{
 			'source': [ prepare_source_frame ],
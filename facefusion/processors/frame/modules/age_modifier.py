@@ -1,5 +1,4 @@
 from argparse import ArgumentParser
-from time import sleep
 from typing import Any, List, Literal, Optional
 
 import cv2
@@ -14,21 +13,21 @@ from facefusion import config, logger, process_manager, state_manager, wording
 from facefusion.common_helper import create_metavar, map_float
 from facefusion.content_analyser import clear_content_analyser
 from facefusion.download import conditional_download, is_download_done
-from facefusion.execution import create_inference_session, has_execution_provider
-from facefusion.face_analyser import clear_face_analyser, get_many_faces, get_one_face
+from facefusion.execution import has_execution_provider
+from facefusion.face_analyser import clear_face_analyser, get_many_frame_faces, get_one_face
 from facefusion.face_helper import merge_matrix, paste_back, warp_face_by_face_landmark_5
 from facefusion.face_masker import clear_face_occluder, create_occlusion_mask, create_static_box_mask
 from facefusion.face_selector import find_similar_faces, sort_and_filter_faces
 from facefusion.face_store import get_reference_faces
 from facefusion.filesystem import in_directory, is_file, is_image, is_video, resolve_relative_path, same_file_extension
+from facefusion.inference_manager import clear_inference_sessions, get_inference_session
 from facefusion.processors.frame import choices as frame_processors_choices
 from facefusion.processors.frame.typing import AgeModifierInputs
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import thread_lock, thread_semaphore
+from facefusion.thread_helper import thread_semaphore
 from facefusion.typing import Args, Face, Mask, ModelSet, OptionsWithModel, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import read_image, read_static_image, write_image
 
-FRAME_PROCESSOR = None
 NAME = __name__.upper()
 MODELS : ModelSet =\
 {
@@ -44,22 +43,13 @@ OPTIONS : Optional[OptionsWithModel] = None
 
 
 def get_frame_processor() -> Any:
-	global FRAME_PROCESSOR
-
-	with thread_lock():
-		while process_manager.is_checking():
-			sleep(0.5)
-		if FRAME_PROCESSOR is None:
-			model_path = get_options('model').get('path')
-			execution_providers = ['cpu'] if has_execution_provider('coreml') else state_manager.get_item('execution_providers')
-			FRAME_PROCESSOR = create_inference_session(model_path, state_manager.get_item('execution_device_id'), execution_providers)
-	return FRAME_PROCESSOR
+	model_path = get_options('model').get('path')
+	execution_providers = ['cpu'] if has_execution_provider('coreml') else state_manager.get_item('execution_providers')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), execution_providers)
 
 
 def clear_frame_processor() -> None:
-	global FRAME_PROCESSOR
-
-	FRAME_PROCESSOR = None
+	clear_inference_sessions([ model.get('path') for model in MODELS.values() ])
 
 
 def get_options(key : Literal['model']) -> Any:
@@ -209,7 +199,7 @@ def apply_age(crop_vision_frame : VisionFrame, crop_vision_frame_extended : Visi
 		if frame_processor_input.name == 'direction':
 			frame_processor_inputs[frame_processor_input.name] = prepare_direction(state_manager.get_item('age_modifier_direction'))
 
-	with thread_semaphore():
+	with thread_semaphore(frame_processor):
 		crop_vision_frame = frame_processor.run(None, frame_processor_inputs)[0][0]
 
 	return crop_vision_frame
@@ -244,7 +234,7 @@ def get_reference_frame(source_face : Face, target_face : Face, temp_vision_fram
 def process_frame(inputs : AgeModifierInputs) -> VisionFrame:
 	reference_faces = inputs.get('reference_faces')
 	target_vision_frame = inputs.get('target_vision_frame')
-	many_faces = sort_and_filter_faces(get_many_faces([ target_vision_frame ]))
+	many_faces = sort_and_filter_faces(get_many_frame_faces(target_vision_frame, inputs.get('frame_number')))
 
 	if state_manager.get_item('face_selector_mode') == 'many':
 		if many_faces:
@@ -266,12 +256,14 @@ def process_frames(source_path : List[str], queue_payloads : List[QueuePayload],
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 
 	for queue_payload in process_manager.manage(queue_payloads):
+		frame_number = queue_payload['frame_number']
 		target_vision_path = queue_payload['frame_path']
 		target_vision_frame = read_image(target_vision_path)
 		output_vision_frame = process_frame(
 		{
 			'reference_faces': reference_faces,
-			'target_vision_frame': target_vision_frame
+			'target_vision_frame': target_vision_frame,
+			'frame_number': frame_number
 		})
 		write_image(target_vision_path, output_vision_frame)
 		update_progress(1)
@@ -283,7 +275,8 @@ def process_image(source_path : str, target_path : str, output_path : str) -> No
 	output_vision_frame = process_frame(
 	{
 		'reference_faces': reference_faces,
-		'target_vision_frame': target_vision_frame
+		'target_vision_frame': target_vision_frame,
+		'frame_number': 0
 	})
 	write_image(output_path, output_vision_frame)
 
@@ -9,7 +9,7 @@ import facefusion.jobs.job_store
 import facefusion.processors.frame.core as frame_processors
 from facefusion import config, logger, process_manager, state_manager, wording
 from facefusion.content_analyser import clear_content_analyser
-from facefusion.face_analyser import clear_face_analyser, get_many_faces, get_one_face
+from facefusion.face_analyser import clear_face_analyser, get_many_frame_faces, get_one_face
 from facefusion.face_helper import warp_face_by_face_landmark_5
 from facefusion.face_masker import clear_face_occluder, clear_face_parser, create_occlusion_mask, create_region_mask, create_static_box_mask
 from facefusion.face_selector import categorize_age, categorize_gender, find_similar_faces, sort_and_filter_faces
@@ -179,7 +179,7 @@ def get_reference_frame(source_face : Face, target_face : Face, temp_vision_fram
 def process_frame(inputs : FaceDebuggerInputs) -> VisionFrame:
 	reference_faces = inputs.get('reference_faces')
 	target_vision_frame = inputs.get('target_vision_frame')
-	many_faces = sort_and_filter_faces(get_many_faces([ target_vision_frame ]))
+	many_faces = sort_and_filter_faces(get_many_frame_faces(target_vision_frame, inputs.get('frame_number')))
 
 	if state_manager.get_item('face_selector_mode') == 'many':
 		if many_faces:
@@ -201,12 +201,14 @@ def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload]
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 
 	for queue_payload in process_manager.manage(queue_payloads):
+		frame_number = queue_payload['frame_number']
 		target_vision_path = queue_payload['frame_path']
 		target_vision_frame = read_image(target_vision_path)
 		output_vision_frame = process_frame(
 		{
 			'reference_faces': reference_faces,
-			'target_vision_frame': target_vision_frame
+			'target_vision_frame': target_vision_frame,
+			'frame_number': frame_number
 		})
 		write_image(target_vision_path, output_vision_frame)
 		update_progress(1)
@@ -218,7 +220,8 @@ def process_image(source_paths : List[str], target_path : str, output_path : str
 	output_vision_frame = process_frame(
 	{
 		'reference_faces': reference_faces,
-		'target_vision_frame': target_vision_frame
+		'target_vision_frame': target_vision_frame,
+		'frame_number': 0
 	})
 	write_image(output_path, output_vision_frame)
 
@@ -14,23 +14,23 @@ from facefusion import config, logger, process_manager, state_manager, wording
 from facefusion.common_helper import create_metavar, get_first
 from facefusion.content_analyser import clear_content_analyser
 from facefusion.download import conditional_download, is_download_done
-from facefusion.execution import create_inference_session, has_execution_provider
-from facefusion.face_analyser import clear_face_analyser, get_average_face, get_many_faces, get_one_face
+from facefusion.execution import has_dynamic_batch_size, has_execution_provider
+from facefusion.face_analyser import clear_face_analyser, get_average_face, get_many_faces, get_many_frame_faces, get_one_face
 from facefusion.face_helper import paste_back, warp_face_by_face_landmark_5
 from facefusion.face_masker import clear_face_occluder, clear_face_parser, create_occlusion_mask, create_region_mask, create_static_box_mask
 from facefusion.face_selector import find_similar_faces, sort_and_filter_faces
 from facefusion.face_store import get_reference_faces
 from facefusion.filesystem import filter_image_paths, has_image, in_directory, is_file, is_image, is_video, resolve_relative_path, same_file_extension
+from facefusion.inference_manager import clear_inference_sessions, get_inference_session
 from facefusion.processors.frame import choices as frame_processors_choices
 from facefusion.processors.frame.expression_restorer import clear_expression_restorer, restore_expression
 from facefusion.processors.frame.pixel_boost import explode_pixel_boost, implode_pixel_boost
 from facefusion.processors.frame.typing import FaceSwapperInputs
 from facefusion.program_helper import find_argument_group, suggest_face_swapper_pixel_boost_choices
 from facefusion.thread_helper import conditional_thread_semaphore, thread_lock
-from facefusion.typing import Args, Embedding, Face, ModelSet, OptionsWithModel, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
+from facefusion.typing import Args, Embedding, Face, FaceSet, Matrix, ModelSet, OptionsWithModel, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import read_image, read_static_image, read_static_images, unpack_resolution, write_image
 
-FRAME_PROCESSOR = None
 MODEL_INITIALIZER = None
 NAME = __name__.upper()
 MODELS : ModelSet =\
@@ -130,21 +130,12 @@ OPTIONS : Optional[OptionsWithModel] = None
 
 
 def get_frame_processor() -> Any:
-	global FRAME_PROCESSOR
-
-	with thread_lock():
-		while process_manager.is_checking():
-			sleep(0.5)
-		if FRAME_PROCESSOR is None:
-			model_path = get_options('model').get('path')
-			FRAME_PROCESSOR = create_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-	return FRAME_PROCESSOR
+	model_path = get_options('model').get('path')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
 
 
 def clear_frame_processor() -> None:
-	global FRAME_PROCESSOR
-
-	FRAME_PROCESSOR = None
+	clear_inference_sessions([ model.get('path') for model in MODELS.values() ])
 
 
 def get_model_initializer() -> Any:
@@ -191,13 +182,15 @@ def register_args(program : ArgumentParser) -> None:
 		face_swapper_pixel_boost_choices = suggest_face_swapper_pixel_boost_choices(program)
 		group_frame_processors.add_argument('--face-swapper-pixel-boost', help = wording.get('help.face_swapper_pixel_boost'), default = config.get_str_value('frame_processors.face_swapper_pixel_boost', get_first(face_swapper_pixel_boost_choices)), choices = face_swapper_pixel_boost_choices)
 		group_frame_processors.add_argument('--face-swapper-expression-restorer', help = wording.get('help.face_swapper_expression_restorer'), type = float, default = config.get_int_value('frame_processors.face_swapper_expression_restorer', '0'), choices = frame_processors_choices.face_swapper_expression_restorer_range, metavar = create_metavar(frame_processors_choices.face_swapper_expression_restorer_range))
-		facefusion.jobs.job_store.register_step_keys([ 'face_swapper_model', 'face_swapper_pixel_boost', 'face_swapper_expression_restorer' ])
+		group_frame_processors.add_argument('--face-swapper-batch-size', help = wording.get('help.face_swapper_batch_size'), type = int, default = config.get_int_value('frame_processors.face_swapper_batch_size', '1'), choices = frame_processors_choices.face_swapper_batch_size_range, metavar = create_metavar(frame_processors_choices.face_swapper_batch_size_range))
+		facefusion.jobs.job_store.register_step_keys([ 'face_swapper_model', 'face_swapper_pixel_boost', 'face_swapper_expression_restorer', 'face_swapper_batch_size' ])
 
 
 def apply_args(args : Args) -> None:
 	state_manager.init_item('face_swapper_model', args.get('face_swapper_model'))
 	state_manager.init_item('face_swapper_pixel_boost', args.get('face_swapper_pixel_boost'))
 	state_manager.init_item('face_swapper_expression_restorer', args.get('face_swapper_expression_restorer'))
+	state_manager.init_item('face_swapper_batch_size', args.get('face_swapper_batch_size'))
 
 	if state_manager.get_item('face_swapper_model') == 'blendswap_256':
 		state_manager.init_item('face_recognizer_model', 'arcface_blendswap')
@@ -255,6 +248,8 @@ def pre_process(mode : ProcessMode) -> bool:
 	if mode == 'output' and not same_file_extension([ state_manager.get_item('target_path'), state_manager.get_item('output_path') ]):
 		logger.error(wording.get('match_target_and_output_extension') + wording.get('exclamation_mark'), NAME)
 		return False
+	if mode == 'output' and state_manager.get_item('face_swapper_batch_size') > 1 and (state_manager.get_item('frame_extraction_mode') == 'pipe' or state_manager.get_item('fuse_frame_processors')):
+		logger.warn(wording.get('face_swapper_batch_size_ignored'), NAME)
 	return True
 
 
@@ -272,14 +267,41 @@ def post_process() -> None:
 
 
 def swap_face(source_face : Face, target_face : Face, temp_vision_frame : VisionFrame) -> VisionFrame:
+	return swap_batch_faces(source_face, [ [ target_face ] ], [ temp_vision_frame ])[0]
+
+
+def swap_batch_faces(source_face : Face, many_target_faces : List[List[Face]], temp_vision_frames : List[VisionFrame]) -> List[VisionFrame]:
 	model_template = get_options('model').get('template')
 	model_size = get_options('model').get('size')
 	pixel_boost_size = unpack_resolution(state_manager.get_item('face_swapper_pixel_boost'))
 	pixel_boost_total = pixel_boost_size[0] // model_size[0]
-	crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, target_face.landmark_set.get('5/68'), model_template, pixel_boost_size)
-	source_vision_frame = crop_vision_frame.copy()
+	output_vision_frames = list(temp_vision_frames)
+	frame_indices = []
+	crop_vision_frames = []
+	affine_matrices = []
+	pixel_boost_vision_frames = []
+
+	for frame_index, target_faces in enumerate(many_target_faces):
+		for target_face in target_faces:
+			crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frames[frame_index], target_face.landmark_set.get('5/68'), model_template, pixel_boost_size)
+			frame_indices.append(frame_index)
+			crop_vision_frames.append(crop_vision_frame)
+			affine_matrices.append(affine_matrix)
+			for pixel_boost_vision_frame in implode_pixel_boost(crop_vision_frame, pixel_boost_total, model_size):
+				pixel_boost_vision_frames.append(prepare_crop_frame(pixel_boost_vision_frame))
+
+	if pixel_boost_vision_frames:
+		pixel_boost_vision_frames = list(apply_swap(source_face, numpy.concatenate(pixel_boost_vision_frames)))
+
+	for index, frame_index in enumerate(frame_indices):
+		swap_vision_frames = [ normalize_crop_frame(pixel_boost_vision_frame) for pixel_boost_vision_frame in pixel_boost_vision_frames[index * pixel_boost_total ** 2:(index + 1) * pixel_boost_total ** 2] ]
+		swap_vision_frame = explode_pixel_boost(swap_vision_frames, pixel_boost_total, model_size, pixel_boost_size)
+		output_vision_frames[frame_index] = paste_swap_frame(output_vision_frames[frame_index], crop_vision_frames[index], swap_vision_frame, affine_matrices[index])
+	return output_vision_frames
+
+
+def paste_swap_frame(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, swap_vision_frame : VisionFrame, affine_matrix : Matrix) -> VisionFrame:
 	crop_masks = []
-	temp_vision_frames = []
 
 	if 'box' in state_manager.get_item('face_mask_types'):
 		box_mask = create_static_box_mask(crop_vision_frame.shape[:2][::-1], state_manager.get_item('face_mask_blur'), state_manager.get_item('face_mask_padding'))
@@ -287,26 +309,27 @@ def swap_face(source_face : Face, target_face : Face, temp_vision_frame : Vision
 	if 'occlusion' in state_manager.get_item('face_mask_types'):
 		occlusion_mask = create_occlusion_mask(crop_vision_frame)
 		crop_masks.append(occlusion_mask)
-	pixel_boost_vision_frames = implode_pixel_boost(crop_vision_frame, pixel_boost_total, model_size)
-	for pixel_boost_vision_frame in pixel_boost_vision_frames:
-		pixel_boost_vision_frame = prepare_crop_frame(pixel_boost_vision_frame)
-		pixel_boost_vision_frame = apply_swap(source_face, pixel_boost_vision_frame)
-		pixel_boost_vision_frame = normalize_crop_frame(pixel_boost_vision_frame)
-		temp_vision_frames.append(pixel_boost_vision_frame)
-	crop_vision_frame = explode_pixel_boost(temp_vision_frames, pixel_boost_total, model_size, pixel_boost_size)
 	if 'region' in state_manager.get_item('face_mask_types'):
-		region_mask = create_region_mask(crop_vision_frame, state_manager.get_item('face_mask_regions'))
+		region_mask = create_region_mask(swap_vision_frame, state_manager.get_item('face_mask_regions'))
 		crop_masks.append(region_mask)
 	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
 	if state_manager.get_item('face_swapper_expression_restorer') > 0:
-		crop_vision_frame, matrix_scale = restore_expression(source_vision_frame, crop_vision_frame, state_manager.get_item('face_swapper_expression_restorer'))
-		crop_mask = cv2.resize(crop_mask, crop_vision_frame.shape[:2][::-1])
+		swap_vision_frame, matrix_scale = restore_expression(crop_vision_frame, swap_vision_frame, state_manager.get_item('face_swapper_expression_restorer'))
+		crop_mask = cv2.resize(crop_mask, swap_vision_frame.shape[:2][::-1])
 		affine_matrix *= matrix_scale
-	temp_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
+	temp_vision_frame = paste_back(temp_vision_frame, swap_vision_frame, crop_mask, affine_matrix)
 	return temp_vision_frame
 
 
-def apply_swap(source_face : Face, crop_vision_frame : VisionFrame) -> VisionFrame:
+def apply_swap(source_face : Face, crop_vision_frames : VisionFrame) -> VisionFrame:
+	frame_processor = get_frame_processor()
+
+	if has_dynamic_batch_size(frame_processor):
+		return forward_swap_face(source_face, crop_vision_frames)
+	return numpy.concatenate([ forward_swap_face(source_face, crop_vision_frame[numpy.newaxis]) for crop_vision_frame in crop_vision_frames ])
+
+
+def forward_swap_face(source_face : Face, crop_vision_frames : VisionFrame) -> VisionFrame:
 	frame_processor = get_frame_processor()
 	model_type = get_options('model').get('type')
 	frame_processor_inputs = {}
@@ -314,16 +337,18 @@ def apply_swap(source_face : Face, crop_vision_frame : VisionFrame) -> VisionFra
 	for frame_processor_input in frame_processor.get_inputs():
 		if frame_processor_input.name == 'source':
 			if model_type == 'blendswap' or model_type == 'uniface':
-				frame_processor_inputs[frame_processor_input.name] = prepare_source_frame(source_face)
+				source_vision_frame = prepare_source_frame(source_face)
+				frame_processor_inputs[frame_processor_input.name] = numpy.repeat(source_vision_frame, len(crop_vision_frames), axis = 0)
 			else:
-				frame_processor_inputs[frame_processor_input.name] = prepare_source_embedding(source_face)
+				source_embedding = prepare_source_embedding(source_face)
+				frame_processor_inputs[frame_processor_input.name] = numpy.repeat(source_embedding, len(crop_vision_frames), axis = 0)
 		if frame_processor_input.name == 'target':
-			frame_processor_inputs[frame_processor_input.name] = crop_vision_frame
+			frame_processor_inputs[frame_processor_input.name] = crop_vision_frames
 
-	with conditional_thread_semaphore():
-		crop_vision_frame = frame_processor.run(None, frame_processor_inputs)[0][0]
+	with conditional_thread_semaphore(frame_processor):
+		crop_vision_frames = frame_processor.run(None, frame_processor_inputs)[0]
 
-	return crop_vision_frame
+	return crop_vision_frames
 
 
 def prepare_source_frame(source_face : Face) -> VisionFrame:
@@ -389,22 +414,27 @@ def process_frame(inputs : FaceSwapperInputs) -> VisionFrame:
 	reference_faces = inputs.get('reference_faces')
 	source_face = inputs.get('source_face')
 	target_vision_frame = inputs.get('target_vision_frame')
-	many_faces = sort_and_filter_faces(get_many_faces([ target_vision_frame ]))
+
+	for target_face in select_target_faces(reference_faces, target_vision_frame, inputs.get('frame_number')):
+		target_vision_frame = swap_face(source_face, target_face, target_vision_frame)
+	return target_vision_frame
+
+
+def select_target_faces(reference_faces : FaceSet, target_vision_frame : VisionFrame, frame_number : int) -> List[Face]:
+	many_faces = sort_and_filter_faces(get_many_frame_faces(target_vision_frame, frame_number))
 
 	if state_manager.get_item('face_selector_mode') == 'many':
 		if many_faces:
-			for target_face in many_faces:
-				target_vision_frame = swap_face(source_face, target_face, target_vision_frame)
+			return many_faces
 	if state_manager.get_item('face_selector_mode') == 'one':
 		target_face = get_one_face(many_faces)
 		if target_face:
-			target_vision_frame = swap_face(source_face, target_face, target_vision_frame)
+			return [ target_face ]
 	if state_manager.get_item('face_selector_mode') == 'reference':
 		similar_faces = find_similar_faces(many_faces, reference_faces, state_manager.get_item('reference_face_distance'))
 		if similar_faces:
-			for similar_face in similar_faces:
-				target_vision_frame = swap_face(source_face, similar_face, target_vision_frame)
-	return target_vision_frame
+			return similar_faces
+	return []
 
 
 def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
@@ -412,20 +442,38 @@ def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload]
 	source_frames = read_static_images(source_paths)
 	source_faces = get_many_faces(source_frames)
 	source_face = get_average_face(source_faces)
+	face_swapper_batch_size = state_manager.get_item('face_swapper_batch_size')
+
+	if face_swapper_batch_size > 1:
+		for index in range(0, len(queue_payloads), face_swapper_batch_size):
+			process_batch_frames(reference_faces, source_face, list(process_manager.manage(queue_payloads[index:index + face_swapper_batch_size])), update_progress)
+		return
 
 	for queue_payload in process_manager.manage(queue_payloads):
+		frame_number = queue_payload['frame_number']
 		target_vision_path = queue_payload['frame_path']
 		target_vision_frame = read_image(target_vision_path)
 		output_vision_frame = process_frame(
 		{
 			'reference_faces': reference_faces,
 			'source_face': source_face,
-			'target_vision_frame': target_vision_frame
+			'target_vision_frame': target_vision_frame,
+			'frame_number': frame_number
 		})
 		write_image(target_vision_path, output_vision_frame)
 		update_progress(1)
 
 
+def process_batch_frames(reference_faces : FaceSet, source_face : Face, queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
+	target_vision_frames = [ read_image(queue_payload['frame_path']) for queue_payload in queue_payloads ]
+	many_target_faces = [ select_target_faces(reference_faces, target_vision_frame, queue_payload['frame_number']) for queue_payload, target_vision_frame in zip(queue_payloads, target_vision_frames) ]
+	output_vision_frames = swap_batch_faces(source_face, many_target_faces, target_vision_frames)
+
+	for queue_payload, output_vision_frame in zip(queue_payloads, output_vision_frames):
+		write_image(queue_payload['frame_path'], output_vision_frame)
+	update_progress(len(queue_payloads))
+
+
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 	source_frames = read_static_images(source_paths)
@@ -436,7 +484,8 @@ def process_image(source_paths : List[str], target_path : str, output_path : str
 	{
 		'reference_faces': reference_faces,
 		'source_face': source_face,
-		'target_vision_frame': target_vision_frame
+		'target_vision_frame': target_vision_frame,
+		'frame_number': 0
 	})
 	write_image(output_path, output_vision_frame)
 
@@ -1,5 +1,4 @@
 from argparse import ArgumentParser
-from time import sleep
 from typing import Any, List, Literal, Optional
 
 import cv2
@@ -12,17 +11,17 @@ from facefusion import config, logger, process_manager, state_manager, wording
 from facefusion.common_helper import create_metavar
 from facefusion.content_analyser import clear_content_analyser
 from facefusion.download import conditional_download, is_download_done
-from facefusion.execution import create_inference_session, has_execution_provider
+from facefusion.execution import has_execution_provider
 from facefusion.face_analyser import clear_face_analyser
 from facefusion.filesystem import in_directory, is_file, is_image, is_video, resolve_relative_path, same_file_extension
+from facefusion.inference_manager import clear_inference_sessions, get_inference_session
 from facefusion.processors.frame import choices as frame_processors_choices
 from facefusion.processors.frame.typing import FrameColorizerInputs
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import thread_lock, thread_semaphore
+from facefusion.thread_helper import thread_semaphore
 from facefusion.typing import Args, Face, ModelSet, OptionsWithModel, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import read_image, read_static_image, unpack_resolution, write_image
 
-FRAME_PROCESSOR = None
 NAME = __name__.upper()
 MODELS : ModelSet =\
 {
@@ -61,22 +60,13 @@ OPTIONS : Optional[OptionsWithModel] = None
 
 
 def get_frame_processor() -> Any:
-	global FRAME_PROCESSOR
-
-	with thread_lock():
-		while process_manager.is_checking():
-			sleep(0.5)
-		if FRAME_PROCESSOR is None:
-			model_path = get_options('model').get('path')
-			execution_providers = [ 'cpu' ] if has_execution_provider('coreml') else state_manager.get_item('execution_providers')
-			FRAME_PROCESSOR = create_inference_session(model_path, state_manager.get_item('execution_device_id'), execution_providers)
-	return FRAME_PROCESSOR
+	model_path = get_options('model').get('path')
+	execution_providers = [ 'cpu' ] if has_execution_provider('coreml') else state_manager.get_item('execution_providers')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), execution_providers)
 
 
 def clear_frame_processor() -> None:
-	global FRAME_PROCESSOR
-
-	FRAME_PROCESSOR = None
+	clear_inference_sessions([ model.get('path') for model in MODELS.values() ])
 
 
 def get_options(key : Literal['model']) -> Any:
@@ -162,7 +152,7 @@ def colorize_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 	frame_processor = get_frame_processor()
 	prepare_vision_frame = prepare_temp_frame(temp_vision_frame)
 
-	with thread_semaphore():
+	with thread_semaphore(frame_processor):
 		color_vision_frame = frame_processor.run(None,
 		{
 			frame_processor.get_inputs()[0].name: prepare_vision_frame
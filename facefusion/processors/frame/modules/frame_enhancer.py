@@ -1,5 +1,4 @@
 from argparse import ArgumentParser
-from time import sleep
 from typing import Any, List, Literal, Optional
 
 import cv2
@@ -12,17 +11,16 @@ from facefusion import config, logger, process_manager, state_manager, wording
 from facefusion.common_helper import create_metavar
 from facefusion.content_analyser import clear_content_analyser
 from facefusion.download import conditional_download, is_download_done
-from facefusion.execution import create_inference_session
 from facefusion.face_analyser import clear_face_analyser
 from facefusion.filesystem import in_directory, is_file, is_image, is_video, resolve_relative_path, same_file_extension
+from facefusion.inference_manager import clear_inference_sessions, get_inference_session
 from facefusion.processors.frame import choices as frame_processors_choices
 from facefusion.processors.frame.typing import FrameEnhancerInputs
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import conditional_thread_semaphore, thread_lock
+from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.typing import Args, Face, ModelSet, OptionsWithModel, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import create_tile_frames, merge_tile_frames, read_image, read_static_image, write_image
 
-FRAME_PROCESSOR = None
 NAME = __name__.upper()
 MODELS : ModelSet =\
 {
@@ -115,21 +113,12 @@ OPTIONS : Optional[OptionsWithModel] = None
 
 
 def get_frame_processor() -> Any:
-	global FRAME_PROCESSOR
-
-	with thread_lock():
-		while process_manager.is_checking():
-			sleep(0.5)
-		if FRAME_PROCESSOR is None:
-			model_path = get_options('model').get('path')
-			FRAME_PROCESSOR = create_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-	return FRAME_PROCESSOR
+	model_path = get_options('model').get('path')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
 
 
 def clear_frame_processor() -> None:
-	global FRAME_PROCESSOR
-
-	FRAME_PROCESSOR = None
+	clear_inference_sessions([ model.get('path') for model in MODELS.values() ])
 
 
 def get_options(key : Literal['model']) -> Any:
@@ -217,7 +206,7 @@ def enhance_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 	tile_vision_frames, pad_width, pad_height = create_tile_frames(temp_vision_frame, size)
 
 	for index, tile_vision_frame in enumerate(tile_vision_frames):
-		with conditional_thread_semaphore():
+		with conditional_thread_semaphore(frame_processor):
 			tile_vision_frame = frame_processor.run(None,
 			{
 				frame_processor.get_inputs()[0].name : prepare_tile_frame(tile_vision_frame)
@@ -1,5 +1,4 @@
 from argparse import ArgumentParser
-from time import sleep
 from typing import Any, List, Literal, Optional
 
 import cv2
@@ -13,22 +12,21 @@ from facefusion.audio import create_empty_audio_frame, get_voice_frame, read_sta
 from facefusion.common_helper import get_first
 from facefusion.content_analyser import clear_content_analyser
 from facefusion.download import conditional_download, is_download_done
-from facefusion.execution import create_inference_session
-from facefusion.face_analyser import clear_face_analyser, get_many_faces, get_one_face
+from facefusion.face_analyser import clear_face_analyser, get_many_frame_faces, get_one_face
 from facefusion.face_helper import create_bounding_box_from_face_landmark_68, paste_back, warp_face_by_bounding_box, warp_face_by_face_landmark_5
 from facefusion.face_masker import clear_face_occluder, clear_face_parser, create_mouth_mask, create_occlusion_mask, create_static_box_mask
 from facefusion.face_selector import find_similar_faces, sort_and_filter_faces
 from facefusion.face_store import get_reference_faces
 from facefusion.filesystem import filter_audio_paths, has_audio, in_directory, is_file, is_image, is_video, resolve_relative_path, same_file_extension
+from facefusion.inference_manager import clear_inference_sessions, get_inference_session
 from facefusion.processors.frame import choices as frame_processors_choices
 from facefusion.processors.frame.typing import LipSyncerInputs
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import conditional_thread_semaphore, thread_lock
+from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.typing import Args, AudioFrame, Face, ModelSet, OptionsWithModel, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
 from facefusion.vision import read_image, read_static_image, restrict_video_fps, write_image
 from facefusion.voice_extractor import clear_voice_extractor
 
-FRAME_PROCESSOR = None
 NAME = __name__.upper()
 MODELS : ModelSet =\
 {
@@ -47,21 +45,12 @@ OPTIONS : Optional[OptionsWithModel] = None
 
 
 def get_frame_processor() -> Any:
-	global FRAME_PROCESSOR
-
-	with thread_lock():
-		while process_manager.is_checking():
-			sleep(0.5)
-		if FRAME_PROCESSOR is None:
-			model_path = get_options('model').get('path')
-			FRAME_PROCESSOR = create_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-	return FRAME_PROCESSOR
+	model_path = get_options('model').get('path')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
 
 
 def clear_frame_processor() -> None:
-	global FRAME_PROCESSOR
-
-	FRAME_PROCESSOR = None
+	clear_inference_sessions([ model.get('path') for model in MODELS.values() ])
 
 
 def get_options(key : Literal['model']) -> Any:
@@ -167,7 +156,7 @@ def sync_lip(target_face : Face, temp_audio_frame : AudioFrame, temp_vision_fram
 	close_vision_frame, close_matrix = warp_face_by_bounding_box(crop_vision_frame, bounding_box, (96, 96))
 	close_vision_frame = prepare_crop_frame(close_vision_frame)
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(frame_processor):
 		close_vision_frame = frame_processor.run(None,
 		{
 			'source': temp_audio_frame,
@@ -213,7 +202,7 @@ def process_frame(inputs : LipSyncerInputs) -> VisionFrame:
 	reference_faces = inputs.get('reference_faces')
 	source_audio_frame = inputs.get('source_audio_frame')
 	target_vision_frame = inputs.get('target_vision_frame')
-	many_faces = sort_and_filter_faces(get_many_faces([ target_vision_frame ]))
+	many_faces = sort_and_filter_faces(get_many_frame_faces(target_vision_frame, inputs.get('frame_number')))
 
 	if state_manager.get_item('face_selector_mode') == 'many':
 		if many_faces:
@@ -247,7 +236,8 @@ def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload]
 		{
 			'reference_faces': reference_faces,
 			'source_audio_frame': source_audio_frame,
-			'target_vision_frame': target_vision_frame
+			'target_vision_frame': target_vision_frame,
+			'frame_number': frame_number
 		})
 		write_image(target_vision_path, output_vision_frame)
 		update_progress(1)
@@ -261,7 +251,8 @@ def process_image(source_paths : List[str], target_path : str, output_path : str
 	{
 		'reference_faces': reference_faces,
 		'source_audio_frame': source_audio_frame,
-		'target_vision_frame': target_vision_frame
+		'target_vision_frame': target_vision_frame,
+		'frame_number': 0
 	})
 	write_image(output_path, output_vision_frame)
 
@@ -1,4 +1,4 @@
-from typing import Dict, List, Literal, TypedDict
+from typing import Dict, List, Literal, Tuple, TypedDict
 
 from facefusion.typing import AudioFrame, Face, FaceSet, StateContext, VisionFrame
 
@@ -15,23 +15,27 @@ FaceSwapperSet = Dict[FaceSwapperModel, List[str]]
 AgeModifierInputs = TypedDict('AgeModifierInputs',
 {
 	'reference_faces' : FaceSet,
-	'target_vision_frame' : VisionFrame
+	'target_vision_frame' : VisionFrame,
+	'frame_number' : int
 })
 FaceDebuggerInputs = TypedDict('FaceDebuggerInputs',
 {
 	'reference_faces' : FaceSet,
-	'target_vision_frame' : VisionFrame
+	'target_vision_frame' : VisionFrame,
+	'frame_number' : int
 })
 FaceEnhancerInputs = TypedDict('FaceEnhancerInputs',
 {
 	'reference_faces' : FaceSet,
-	'target_vision_frame' : VisionFrame
+	'target_vision_frame' : VisionFrame,
+	'frame_number' : int
 })
 FaceSwapperInputs = TypedDict('FaceSwapperInputs',
 {
 	'reference_faces' : FaceSet,
 	'source_face' : Face,
-	'target_vision_frame' : VisionFrame
+	'target_vision_frame' : VisionFrame,
+	'frame_number' : int
 })
 FrameColorizerInputs = TypedDict('FrameColorizerInputs',
 {
@@ -41,11 +45,30 @@ FrameEnhancerInputs = TypedDict('FrameEnhancerInputs',
 {
 	'target_vision_frame' : VisionFrame
 })
+FrameProcessorInputs = TypedDict('FrameProcessorInputs',
+{
+	'reference_faces' : FaceSet,
+	'source_face' : Face,
+	'source_audio_frame' : AudioFrame,
+	'target_vision_frame' : VisionFrame,
+	'frame_number' : int
+})
+FrameProcessorSharedFrame = TypedDict('FrameProcessorSharedFrame',
+{
+	'name' : str,
+	'shape' : Tuple[int, ...]
+})
+FrameProcessorWorkerReport = TypedDict('FrameProcessorWorkerReport',
+{
+	'worker_id' : int,
+	'process_time' : float
+})
 LipSyncerInputs = TypedDict('LipSyncerInputs',
 {
 	'reference_faces' : FaceSet,
 	'source_audio_frame' : AudioFrame,
-	'target_vision_frame' : VisionFrame
+	'target_vision_frame' : VisionFrame,
+	'frame_number' : int
 })
 
 FrameProcessorStateKey = Literal\
@@ -58,6 +81,7 @@ FrameProcessorStateKey = Literal\
 	'face_swapper_model',
 	'face_swapper_pixel_boost',
 	'face_swapper_expression_restorer',
+	'face_swapper_batch_size',
 	'frame_colorizer_model',
 	'frame_colorizer_blend',
 	'frame_colorizer_size',
@@ -74,6 +98,7 @@ FrameProcessorState = TypedDict('FrameProcessorState',
 	'face_enhancer_blend' : int,
 	'face_swapper_model' : FaceSwapperModel,
 	'face_swapper_pixel_boost' : str,
+	'face_swapper_batch_size' : int,
 	'frame_colorizer_model' : FrameColorizerModel,
 	'frame_colorizer_blend' : int,
 	'frame_colorizer_size' : str,
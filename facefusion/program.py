@@ -5,7 +5,7 @@ import facefusion.processors.frame
 from facefusion import config, logger, metadata, state_manager, wording
 from facefusion.common_helper import create_metavar
 from facefusion.execution import get_execution_provider_choices
-from facefusion.filesystem import list_directory
+from facefusion.filesystem import list_directory, resolve_relative_path
 from facefusion.jobs import job_store
 from facefusion.processors.frame.core import load_frame_processor_module
 from facefusion.program_helper import suggest_face_detector_choices
@@ -51,7 +51,8 @@ def create_face_analyser_program() -> ArgumentParser:
 	group_face_analyser.add_argument('--face-detector-angles', help = wording.get('help.face_detector_angles'), type = int, default = config.get_int_list('face_analyser.face_detector_angles', '0'), choices = facefusion.choices.face_detector_angles, nargs = '+', metavar = 'FACE_DETECTOR_ANGLES')
 	group_face_analyser.add_argument('--face-detector-score', help = wording.get('help.face_detector_score'), type = float, default = config.get_float_value('face_analyser.face_detector_score', '0.5'), choices = facefusion.choices.face_detector_score_range, metavar = create_metavar(facefusion.choices.face_detector_score_range))
 	group_face_analyser.add_argument('--face-landmarker-score', help = wording.get('help.face_landmarker_score'), type = float, default = config.get_float_value('face_analyser.face_landmarker_score', '0.5'), choices = facefusion.choices.face_landmarker_score_range, metavar = create_metavar(facefusion.choices.face_landmarker_score_range))
-	job_store.register_step_keys([ 'face_detector_model', 'face_detector_angles', 'face_detector_size', 'face_detector_score', 'face_landmarker_score' ])
+	group_face_analyser.add_argument('--face-tracker-interval', help = wording.get('help.face_tracker_interval'), type = int, default = config.get_int_value('face_analyser.face_tracker_interval', '0'), choices = facefusion.choices.face_tracker_interval_range, metavar = create_metavar(facefusion.choices.face_tracker_interval_range))
+	job_store.register_step_keys([ 'face_detector_model', 'face_detector_angles', 'face_detector_size', 'face_detector_score', 'face_landmarker_score', 'face_tracker_interval' ])
 	return program
 
 
@@ -85,9 +86,11 @@ def create_frame_extraction_program() -> ArgumentParser:
 	group_frame_extraction = program.add_argument_group('frame extraction')
 	group_frame_extraction.add_argument('--trim-frame-start', help = wording.get('help.trim_frame_start'), type = int, default = facefusion.config.get_int_value('frame_extraction.trim_frame_start'))
 	group_frame_extraction.add_argument('--trim-frame-end',	help = wording.get('help.trim_frame_end'), type = int, default = facefusion.config.get_int_value('frame_extraction.trim_frame_end'))
+	group_frame_extraction.add_argument('--frame-extraction-mode', help = wording.get('help.frame_extraction_mode'), default = config.get_str_value('frame_extraction.frame_extraction_mode', 'disk'), choices = facefusion.choices.frame_extraction_modes)
 	group_frame_extraction.add_argument('--temp-frame-format', help = wording.get('help.temp_frame_format'), default = config.get_str_value('frame_extraction.temp_frame_format', 'png'), choices = facefusion.choices.temp_frame_formats)
 	group_frame_extraction.add_argument('--keep-temp', help = wording.get('help.keep_temp'), action = 'store_true',	default = config.get_bool_value('frame_extraction.keep_temp'))
-	job_store.register_step_keys([ 'trim_frame_start', 'trim_frame_end', 'temp_frame_format', 'keep_temp' ])
+	group_frame_extraction.add_argument('--duplicate-frame-threshold', help = wording.get('help.duplicate_frame_threshold'), type = float, default = config.get_float_value('frame_extraction.duplicate_frame_threshold'), choices = facefusion.choices.duplicate_frame_threshold_range, metavar = create_metavar(facefusion.choices.duplicate_frame_threshold_range))
+	job_store.register_step_keys([ 'trim_frame_start', 'trim_frame_end', 'frame_extraction_mode', 'temp_frame_format', 'keep_temp', 'duplicate_frame_threshold' ])
 	return program
 
 
@@ -112,7 +115,8 @@ def create_frame_processors_program() -> ArgumentParser:
 	available_frame_processors = list_directory('facefusion/processors/frame/modules')
 	group_frame_processors = program.add_argument_group('frame processors')
 	group_frame_processors.add_argument('--frame-processors', help = wording.get('help.frame_processors').format(choices = ', '.join(available_frame_processors)), default = config.get_str_list('frame_processors.frame_processors', 'face_swapper'), nargs = '+')
-	job_store.register_step_keys([ 'frame_processors' ])
+	group_frame_processors.add_argument('--fuse-frame-processors', help = wording.get('help.fuse_frame_processors'), action = 'store_true', default = config.get_bool_value('frame_processors.fuse_frame_processors'))
+	job_store.register_step_keys([ 'frame_processors', 'fuse_frame_processors' ])
 	for frame_processor in available_frame_processors:
 		frame_processor_module = load_frame_processor_module(frame_processor)
 		frame_processor_module.register_args(program)
@@ -136,8 +140,19 @@ def create_execution_program() -> ArgumentParser:
 	group_execution.add_argument('--execution-device-id', help = wording.get('help.execution_device_id'), default = config.get_str_value('execution.execution_device_id', '0'))
 	group_execution.add_argument('--execution-providers', help = wording.get('help.execution_providers').format(choices = ', '.join(execution_providers)), default = config.get_str_list('execution.execution_providers', 'cpu'), choices = execution_providers, nargs = '+', metavar = 'EXECUTION_PROVIDERS')
 	group_execution.add_argument('--execution-thread-count', help = wording.get('help.execution_thread_count'), type = int, default = config.get_int_value('execution.execution_thread_count', '4'), choices = facefusion.choices.execution_thread_count_range, metavar = create_metavar(facefusion.choices.execution_thread_count_range))
+	group_execution.add_argument('--execution-pool-type', help = wording.get('help.execution_pool_type'), default = config.get_str_value('execution.execution_pool_type', 'thread'), choices = facefusion.choices.execution_pool_types)
 	group_execution.add_argument('--execution-queue-count', help = wording.get('help.execution_queue_count'), type = int, default = config.get_int_value('execution.execution_queue_count', '1'), choices = facefusion.choices.execution_queue_count_range, metavar = create_metavar(facefusion.choices.execution_queue_count_range))
-	job_store.register_job_keys([ 'execution_device_id', 'execution_providers', 'execution_thread_count', 'execution_queue_count' ])
+	group_execution.add_argument('--execution-segment-count', help = wording.get('help.execution_segment_count'), type = int, default = config.get_int_value('execution.execution_segment_count', '1'), choices = facefusion.choices.execution_segment_count_range, metavar = create_metavar(facefusion.choices.execution_segment_count_range))
+	group_execution.add_argument('--execution-step-count', help = wording.get('help.execution_step_count'), type = int, default = config.get_int_value('execution.execution_step_count', '1'), choices = facefusion.choices.execution_step_count_range, metavar = create_metavar(facefusion.choices.execution_step_count_range))
+	group_execution.add_argument('--execution-graph-optimization-level', help = wording.get('help.execution_graph_optimization_level'), default = config.get_str_value('execution.execution_graph_optimization_level', 'all'), choices = facefusion.choices.execution_graph_optimization_levels)
+	group_execution.add_argument('--execution-mode', help = wording.get('help.execution_mode'), default = config.get_str_value('execution.execution_mode', 'sequential'), choices = facefusion.choices.execution_modes)
+	group_execution.add_argument('--execution-intra-op-thread-count', help = wording.get('help.execution_intra_op_thread_count'), type = int, default = config.get_int_value('execution.execution_intra_op_thread_count', '0'), choices = facefusion.choices.execution_op_thread_count_range, metavar = create_metavar(facefusion.choices.execution_op_thread_count_range))
+	group_execution.add_argument('--execution-inter-op-thread-count', help = wording.get('help.execution_inter_op_thread_count'), type = int, default = config.get_int_value('execution.execution_inter_op_thread_count', '0'), choices = facefusion.choices.execution_op_thread_count_range, metavar = create_metavar(facefusion.choices.execution_op_thread_count_range))
+	group_execution.add_argument('--execution-memory-arena-strategy', help = wording.get('help.execution_memory_arena_strategy'), default = config.get_str_value('execution.execution_memory_arena_strategy', 'power_of_two'), choices = facefusion.choices.execution_memory_arena_strategies)
+	group_execution.add_argument('--execution-cache-path', help = wording.get('help.execution_cache_path'), default = config.get_str_value('execution.execution_cache_path', resolve_relative_path('../.caches')))
+	group_execution.add_argument('--execution-session-replica-count', help = wording.get('help.execution_session_replica_count'), type = int, default = config.get_int_value('execution.execution_session_replica_count', '1'), choices = facefusion.choices.execution_session_replica_count_range, metavar = create_metavar(facefusion.choices.execution_session_replica_count_range))
+	group_execution.add_argument('--execution-model-precision', help = wording.get('help.execution_model_precision'), default = config.get_str_value('execution.execution_model_precision', 'fp32'), choices = facefusion.choices.execution_model_precisions)
+	job_store.register_job_keys([ 'execution_device_id', 'execution_providers', 'execution_thread_count', 'execution_pool_type', 'execution_queue_count', 'execution_segment_count', 'execution_step_count', 'execution_graph_optimization_level', 'execution_mode', 'execution_intra_op_thread_count', 'execution_inter_op_thread_count', 'execution_memory_arena_strategy', 'execution_cache_path', 'execution_session_replica_count', 'execution_model_precision' ])
 	return program
 
 
@@ -146,7 +161,9 @@ def create_memory_program() -> ArgumentParser:
 	group_memory = program.add_argument_group('memory')
 	group_memory.add_argument('--video-memory-strategy', help = wording.get('help.video_memory_strategy'), default = config.get_str_value('memory.video_memory_strategy', 'strict'), choices = facefusion.choices.video_memory_strategies)
 	group_memory.add_argument('--system-memory-limit', help = wording.get('help.system_memory_limit'), type = int, default = config.get_int_value('memory.system_memory_limit', '0'), choices = facefusion.choices.system_memory_limit_range, metavar = create_metavar(facefusion.choices.system_memory_limit_range))
-	job_store.register_job_keys([ 'video_memory_strategy', 'system_memory_limit' ])
+	group_memory.add_argument('--face-store-memory-limit', help = wording.get('help.face_store_memory_limit'), type = int, default = config.get_int_value('memory.face_store_memory_limit', '1024'), choices = facefusion.choices.face_store_memory_limit_range, metavar = create_metavar(facefusion.choices.face_store_memory_limit_range))
+	group_memory.add_argument('--inference-memory-limit', help = wording.get('help.inference_memory_limit'), type = int, default = config.get_int_value('memory.inference_memory_limit', '0'), choices = facefusion.choices.inference_memory_limit_range, metavar = create_metavar(facefusion.choices.inference_memory_limit_range))
+	job_store.register_job_keys([ 'video_memory_strategy', 'system_memory_limit', 'face_store_memory_limit', 'inference_memory_limit' ])
 	return program
 
 
@@ -179,6 +196,21 @@ def create_job_status_program() -> ArgumentParser:
 	return program
 
 
+def create_show_throughput_program() -> ArgumentParser:
+	program = ArgumentParser(add_help = False)
+	program.add_argument('--show-throughput', help = wording.get('help.show_throughput'), action = 'store_true')
+	return program
+
+
+def create_quantize_program() -> ArgumentParser:
+	program = ArgumentParser(add_help = False)
+	group_quantize = program.add_argument_group('quantize')
+	group_quantize.add_argument('--quantize-method', help = wording.get('help.quantize_method'), default = config.get_str_value('quantize.quantize_method', 'dynamic'), choices = facefusion.choices.quantize_methods)
+	group_quantize.add_argument('--quantize-frame-total', help = wording.get('help.quantize_frame_total'), type = int, default = config.get_int_value('quantize.quantize_frame_total', '8'), choices = facefusion.choices.quantize_frame_total_range, metavar = create_metavar(facefusion.choices.quantize_frame_total_range))
+	group_quantize.add_argument('--quantize-similarity', help = wording.get('help.quantize_similarity'), type = float, default = config.get_float_value('quantize.quantize_similarity', '0.99'), choices = facefusion.choices.quantize_similarity_range, metavar = create_metavar(facefusion.choices.quantize_similarity_range))
+	return program
+
+
 def create_step_index_program() -> ArgumentParser:
 	program = ArgumentParser(add_help = False)
 	program.add_argument('step_index', help = wording.get('help.step_index'), type = int)
@@ -202,13 +234,14 @@ def create_program() -> ArgumentParser:
 	sub_program.add_parser('run', help = wording.get('help.run'), parents = [ collect_step_program(), create_uis_program(), collect_job_program() ], formatter_class = create_help_formatter_200)
 	sub_program.add_parser('run-headless', help = wording.get('help.run_headless'), parents = [ collect_step_program(), collect_job_program() ], formatter_class = create_help_formatter_200)
 	sub_program.add_parser('force-download', help = wording.get('help.force_download'), parents = [ create_log_level_program() ], formatter_class = create_help_formatter_200)
+	sub_program.add_parser('quantize', help = wording.get('help.quantize'), parents = [ collect_step_program(), create_quantize_program(), collect_job_program() ], formatter_class = create_help_formatter_200)
 	# job manager
 	sub_program.add_parser('job-create', help = wording.get('help.job_create'), parents = [ create_job_id_program(), create_jobs_path_program(), create_log_level_program() ], formatter_class = create_help_formatter_200)
 	sub_program.add_parser('job-submit', help = wording.get('help.job_submit'), parents = [ create_job_id_program(), create_jobs_path_program(), create_log_level_program() ], formatter_class = create_help_formatter_200)
 	sub_program.add_parser('job-submit-all', help = wording.get('help.job_submit_all'), parents = [ create_jobs_path_program(), create_log_level_program() ], formatter_class = create_help_formatter_200)
 	sub_program.add_parser('job-delete', help = wording.get('help.job_delete'), parents = [ create_job_id_program(), create_jobs_path_program(), create_log_level_program() ], formatter_class = create_help_formatter_200)
 	sub_program.add_parser('job-delete-all', help = wording.get('help.job_delete_all'), parents = [ create_jobs_path_program(), create_log_level_program() ], formatter_class = create_help_formatter_200)
-	sub_program.add_parser('job-list', help = wording.get('help.job_list'), parents = [ create_job_status_program(), create_jobs_path_program(), create_log_level_program() ], formatter_class = create_help_formatter_200)
+	sub_program.add_parser('job-list', help = wording.get('help.job_list'), parents = [ create_job_status_program(), create_show_throughput_program(), create_jobs_path_program(), create_log_level_program() ], formatter_class = create_help_formatter_200)
 	sub_program.add_parser('job-add-step', help = wording.get('help.job_add_step'), parents = [ create_job_id_program(), collect_step_program(), create_log_level_program() ], formatter_class = create_help_formatter_200)
 	sub_program.add_parser('job-remix-step', help = wording.get('help.job_remix_step'), parents = [ create_job_id_program(), create_step_index_program(), collect_step_program(), create_log_level_program() ], formatter_class = create_help_formatter_200)
 	sub_program.add_parser('job-insert-step', help = wording.get('help.job_insert_step'), parents = [ create_job_id_program(), create_step_index_program(), collect_step_program(), create_log_level_program() ], formatter_class = create_help_formatter_200)
@@ -0,0 +1,108 @@
+import hashlib
+import os
+from typing import Dict, List, Optional
+
+import cv2
+import numpy
+from tqdm import tqdm
+
+from facefusion import process_manager, state_manager, wording
+from facefusion.common_helper import is_windows
+from facefusion.filesystem import create_directory, is_video, sanitize_path_for_windows
+from facefusion.json import read_json, write_json
+from facefusion.temp_helper import get_base_directory_path
+from facefusion.typing import ShotIndex, VisionFrame
+
+SHOT_INDEXES : Dict[str, Optional[ShotIndex]] = {}
+SHOT_DISTANCE_LIMIT = 0.3
+SHOT_DISTANCE_RATIO = 3
+SHOT_DISTANCE_WINDOW = 12
+SHOT_HISTOGRAM_BINS = [ 16, 16 ]
+
+
+def get_shot_index(video_path : str) -> Optional[ShotIndex]:
+	if video_path:
+		if video_path not in SHOT_INDEXES:
+			SHOT_INDEXES[video_path] = read_json(get_shot_index_path(video_path)) or None #type:ignore[assignment]
+		return SHOT_INDEXES.get(video_path)
+	return None
+
+
+def detect_shot_index(video_path : str) -> Optional[ShotIndex]:
+	shot_index = get_shot_index(video_path)
+
+	if shot_index is None and is_video(video_path):
+		shot_index = create_shot_index(video_path)
+		if shot_index:
+			shot_index_path = get_shot_index_path(video_path)
+			create_directory(os.path.dirname(shot_index_path))
+			write_json(shot_index_path, shot_index) #type:ignore[arg-type]
+			SHOT_INDEXES[video_path] = shot_index
+	return shot_index
+
+
+def create_shot_index(video_path : str) -> Optional[ShotIndex]:
+	if is_windows():
+		video_path = sanitize_path_for_windows(video_path)
+	video_capture = cv2.VideoCapture(video_path)
+
+	if video_capture.isOpened():
+		video_fps = video_capture.get(cv2.CAP_PROP_FPS)
+		video_frame_total = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+		shot_histograms = []
+
+		with tqdm(total = video_frame_total, desc = wording.get('detecting_shots'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+			while not process_manager.is_stopping():
+				has_vision_frame, vision_frame = video_capture.read()
+				if not has_vision_frame:
+					break
+				shot_histograms.append(calc_shot_histogram(vision_frame))
+				progress.update()
+		video_capture.release()
+
+		if shot_histograms and not process_manager.is_stopping():
+			shot_index : ShotIndex =\
+			{
+				'video_fps': video_fps,
+				'frame_total': len(shot_histograms),
+				'shot_boundaries': calc_shot_boundaries(numpy.stack(shot_histograms))
+			}
+			return shot_index
+	return None
+
+
+def calc_shot_histogram(vision_frame : VisionFrame) -> VisionFrame:
+	vision_frame = cv2.resize(vision_frame, (128, 72), interpolation = cv2.INTER_AREA)
+	vision_frame = cv2.cvtColor(vision_frame, cv2.COLOR_BGR2HSV)
+	shot_histogram = cv2.calcHist([ vision_frame ], [ 0, 1 ], None, SHOT_HISTOGRAM_BINS, [ 0, 180, 0, 256 ]).ravel()
+	return shot_histogram / shot_histogram.sum()
+
+
+def calc_shot_boundaries(shot_histograms : VisionFrame) -> List[int]:
+	shot_distances = numpy.abs(numpy.diff(shot_histograms, axis = 0)).sum(axis = 1) * 0.5
+	shot_distance_windows = numpy.lib.stride_tricks.sliding_window_view(numpy.pad(shot_distances, SHOT_DISTANCE_WINDOW, mode = 'edge'), SHOT_DISTANCE_WINDOW * 2 + 1)
+	shot_distance_medians = numpy.median(shot_distance_windows, axis = 1)
+	return (numpy.flatnonzero((shot_distances > SHOT_DISTANCE_LIMIT) & (shot_distances > shot_distance_medians * SHOT_DISTANCE_RATIO)) + 1).tolist()
+
+
+def has_shot_boundary(video_path : str, start_frame_number : int, end_frame_number : int) -> bool:
+	shot_index = get_shot_index(video_path)
+
+	if shot_index and shot_index.get('video_fps'):
+		video_fps = shot_index.get('video_fps')
+		temp_video_fps = min(state_manager.get_item('output_video_fps') or video_fps, video_fps)
+		trim_frame_start = state_manager.get_item('trim_frame_start') or 0
+		start_frame_number = trim_frame_start + round(start_frame_number * video_fps / temp_video_fps)
+		end_frame_number = trim_frame_start + round(end_frame_number * video_fps / temp_video_fps)
+		return any(start_frame_number < shot_boundary <= end_frame_number for shot_boundary in shot_index.get('shot_boundaries'))
+	return False
+
+
+def get_shot_index_path(video_path : str) -> str:
+	video_stat = os.stat(video_path) if os.path.exists(video_path) else None
+	video_hash = hashlib.sha1(str([ os.path.abspath(video_path), video_stat and video_stat.st_size, video_stat and video_stat.st_mtime, SHOT_DISTANCE_LIMIT, SHOT_DISTANCE_RATIO, SHOT_DISTANCE_WINDOW, SHOT_HISTOGRAM_BINS ]).encode()).hexdigest()
+	return os.path.join(get_base_directory_path(), 'shots', video_hash + '.json')
+
+
+def clear_shot_indexes() -> None:
+	SHOT_INDEXES.clear()
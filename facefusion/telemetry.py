@@ -0,0 +1,104 @@
+import threading
+from time import perf_counter
+from typing import Optional
+
+from facefusion import state_manager
+from facefusion.date_helper import get_current_date_time
+from facefusion.jobs import job_store
+from facefusion.memory import get_process_memory
+from facefusion.typing import Args, JobStepTelemetry, TelemetryStore
+
+TELEMETRY_STORE : TelemetryStore =\
+{
+	'start_time': 0.0,
+	'phase_start_times': {},
+	'phase_times': {},
+	'frame_total': 0,
+	'date_started': None,
+	'peak_memory': 0
+}
+TELEMETRY_SAMPLE_EVENT : Optional[threading.Event] = None
+TELEMETRY_SAMPLE_INTERVAL = 0.1
+
+
+def get_telemetry_store() -> TelemetryStore:
+	return TELEMETRY_STORE
+
+
+def start_telemetry() -> None:
+	clear_telemetry()
+	TELEMETRY_STORE['start_time'] = perf_counter()
+	TELEMETRY_STORE['date_started'] = get_current_date_time().isoformat()
+	start_memory_sampler()
+
+
+def start_memory_sampler() -> None:
+	global TELEMETRY_SAMPLE_EVENT
+
+	TELEMETRY_SAMPLE_EVENT = threading.Event()
+	threading.Thread(target = sample_peak_memory, args = (TELEMETRY_SAMPLE_EVENT,), daemon = True).start()
+
+
+def stop_memory_sampler() -> None:
+	if TELEMETRY_SAMPLE_EVENT:
+		TELEMETRY_SAMPLE_EVENT.set()
+
+
+def sample_peak_memory(sample_event : threading.Event) -> None:
+	while not sample_event.is_set():
+		process_memory = get_process_memory()
+
+		if not sample_event.is_set():
+			TELEMETRY_STORE['peak_memory'] = max(TELEMETRY_STORE['peak_memory'], process_memory)
+		sample_event.wait(TELEMETRY_SAMPLE_INTERVAL)
+
+
+def start_telemetry_phase(phase_name : str) -> None:
+	TELEMETRY_STORE['phase_start_times'][phase_name] = perf_counter()
+
+
+def stop_telemetry_phase(phase_name : str) -> None:
+	phase_start_time = TELEMETRY_STORE['phase_start_times'].pop(phase_name, None)
+
+	if phase_start_time is not None:
+		TELEMETRY_STORE['phase_times'][phase_name] = TELEMETRY_STORE['phase_times'].get(phase_name, 0.0) + perf_counter() - phase_start_time
+
+
+def count_telemetry_frames(frame_total : int) -> None:
+	TELEMETRY_STORE['frame_total'] += frame_total
+
+
+def collect_telemetry() -> JobStepTelemetry:
+	stop_memory_sampler()
+	process_time = perf_counter() - TELEMETRY_STORE['start_time']
+	frame_total = TELEMETRY_STORE['frame_total']
+	peak_memory = max(TELEMETRY_STORE['peak_memory'], get_process_memory())
+	telemetry : JobStepTelemetry =\
+	{
+		'phase_times': { phase_name: round(phase_time, 4) for phase_name, phase_time in TELEMETRY_STORE['phase_times'].items() },
+		'date_started': TELEMETRY_STORE['date_started'],
+		'process_time': round(process_time, 4),
+		'frame_total': frame_total,
+		'frame_rate': round(frame_total / process_time, 2) if process_time > 0 else 0.0,
+		'peak_memory': peak_memory,
+		'execution': collect_execution_args()
+	}
+	return telemetry
+
+
+def collect_execution_args() -> Args:
+	execution_args =\
+	{
+		key: state_manager.get_item(key) for key in job_store.get_job_keys() if key.startswith('execution_') #type:ignore[arg-type]
+	}
+	return execution_args
+
+
+def clear_telemetry() -> None:
+	stop_memory_sampler()
+	TELEMETRY_STORE['start_time'] = 0.0
+	TELEMETRY_STORE['phase_start_times'] = {}
+	TELEMETRY_STORE['phase_times'] = {}
+	TELEMETRY_STORE['frame_total'] = 0
+	TELEMETRY_STORE['date_started'] = None
+	TELEMETRY_STORE['peak_memory'] = 0
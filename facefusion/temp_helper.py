@@ -1,7 +1,7 @@
 import glob
 import os
 import tempfile
-from typing import List
+from typing import List, Optional
 
 from facefusion import state_manager
 from facefusion.filesystem import create_directory, move_file, remove_directory
@@ -43,8 +43,15 @@ def clear_base_directory() -> bool:
 
 
 def get_temp_directory_path(file_path : str) -> str:
+	return resolve_temp_directory_path(file_path, state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end'))
+
+
+def resolve_temp_directory_path(file_path : str, trim_frame_start : Optional[int], trim_frame_end : Optional[int]) -> str:
 	file_name, _ = os.path.splitext(os.path.basename(file_path))
 	base_directory_path = get_base_directory_path()
+
+	if isinstance(trim_frame_start, int) or isinstance(trim_frame_end, int):
+		file_name += '-' + str(trim_frame_start or 0) + '-' + str(trim_frame_end or 'end')
 	return os.path.join(base_directory_path, file_name)
 
 
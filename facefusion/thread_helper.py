@@ -1,11 +1,15 @@
 import threading
 from contextlib import nullcontext
 from typing import ContextManager, Union
+from weakref import WeakKeyDictionary
+
+from onnxruntime import InferenceSession
 
 from facefusion.execution import has_execution_provider
 
 THREAD_LOCK : threading.Lock = threading.Lock()
-THREAD_SEMAPHORE : threading.Semaphore = threading.Semaphore()
+THREAD_SEMAPHORES : 'WeakKeyDictionary[InferenceSession, threading.Semaphore]' = WeakKeyDictionary()
+THREAD_SEMAPHORES_LOCK : threading.Lock = threading.Lock()
 NULL_CONTEXT : ContextManager[None] = nullcontext()
 
 
@@ -13,11 +17,12 @@ def thread_lock() -> threading.Lock:
 	return THREAD_LOCK
 
 
-def thread_semaphore() -> threading.Semaphore:
-	return THREAD_SEMAPHORE
+def thread_semaphore(inference_session : InferenceSession) -> threading.Semaphore:
+	with THREAD_SEMAPHORES_LOCK:
+		return THREAD_SEMAPHORES.setdefault(inference_session, threading.Semaphore())
 
 
-def conditional_thread_semaphore() -> Union[threading.Semaphore, ContextManager[None]]:
+def conditional_thread_semaphore(inference_session : InferenceSession) -> Union[threading.Semaphore, ContextManager[None]]:
 	if has_execution_provider('directml'):
-		return THREAD_SEMAPHORE
+		return thread_semaphore(inference_session)
 	return NULL_CONTEXT
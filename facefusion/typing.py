@@ -1,8 +1,9 @@
 from collections import namedtuple
-from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, TypedDict
+from typing import Any, Callable, Dict, List, Literal, Optional, OrderedDict, Set, Tuple, TypedDict, Union
 
 import numpy
 from numpy.typing import NDArray
+from onnxruntime import InferenceSession
 
 Score = float
 Angle = int
@@ -34,10 +35,15 @@ Face = namedtuple('Face',
 	'gender',
 	'age'
 ])
+FaceAttribute = Literal['embedding', 'gender_age']
 FaceSet = Dict[str, List[Face]]
+StaticFaceSet = OrderedDict[str, List[Face]]
 FaceStore = TypedDict('FaceStore',
 {
-	'static_faces' : FaceSet,
+	'static_faces' : StaticFaceSet,
+	'static_faces_size' : int,
+	'frame_faces' : StaticFaceSet,
+	'frame_faces_size' : int,
 	'reference_faces': FaceSet
 })
 
@@ -48,6 +54,15 @@ Distance = NDArray[Any]
 Matrix = NDArray[Any]
 Translation = NDArray[Any]
 
+FaceTrack = TypedDict('FaceTrack',
+{
+	'detect_frame_number' : int,
+	'frame_number' : int,
+	'track_vision_frame' : VisionFrame,
+	'faces' : List[Face]
+})
+FaceTrackSet = Dict[int, FaceTrack]
+
 AudioBuffer = bytes
 Audio = NDArray[Any]
 AudioChunk = NDArray[Any]
@@ -58,6 +73,37 @@ MelFilterBank = NDArray[Any]
 Fps = float
 Padding = Tuple[int, int, int, int]
 Resolution = Tuple[int, int]
+ShotIndex = TypedDict('ShotIndex',
+{
+	'video_fps' : Fps,
+	'frame_total' : int,
+	'shot_boundaries' : List[int]
+})
+FrameFingerprint = Union[str, NDArray[Any]]
+DuplicateFrameStore = TypedDict('DuplicateFrameStore',
+{
+	'frame_paths' : Dict[str, str],
+	'frame_total' : int,
+	'duplicate_frame_total' : int
+})
+Checkpoint = TypedDict('Checkpoint',
+{
+	'checkpoint_key' : str,
+	'frame_total' : int,
+	'frame_pass' : Optional[str],
+	'frame_passes' : List[str],
+	'duplicate_frame_paths' : Dict[str, str]
+})
+TelemetryPhaseSet = Dict[str, float]
+TelemetryStore = TypedDict('TelemetryStore',
+{
+	'start_time' : float,
+	'phase_start_times' : TelemetryPhaseSet,
+	'phase_times' : TelemetryPhaseSet,
+	'frame_total' : int,
+	'date_started' : Optional[str],
+	'peak_memory' : int
+})
 
 ProcessState = Literal['checking', 'processing', 'stopping', 'pending']
 QueuePayload = TypedDict('QueuePayload',
@@ -82,9 +128,16 @@ LogLevel = Literal['error', 'warn', 'info', 'debug']
 TableHeaders = List[str]
 TableContents = List[List[int | float | str]]
 
+ExecutionPoolType = Literal['thread', 'process']
+ExecutionGraphOptimizationLevel = Literal['disable', 'basic', 'extended', 'all']
+ExecutionMode = Literal['sequential', 'parallel']
+ExecutionMemoryArenaStrategy = Literal['power_of_two', 'same_as_requested', 'disabled']
+ExecutionModelPrecision = Literal['fp32', 'int8']
+QuantizeMethod = Literal['dynamic', 'static']
 VideoMemoryStrategy = Literal['strict', 'moderate', 'tolerant']
 FaceDetectorModel = Literal['many', 'retinaface', 'scrfd', 'yoloface']
 FaceDetectorSet = Dict[FaceDetectorModel, List[str]]
+FaceLandmarkerModel = Literal['68', '68_5']
 FaceRecognizerModel = Literal['arcface_blendswap', 'arcface_ghost', 'arcface_inswapper', 'arcface_simswap', 'arcface_uniface']
 FaceSelectorMode = Literal['many', 'one', 'reference']
 FaceSelectorOrder = Literal['left-right', 'right-left', 'top-bottom', 'bottom-top', 'small-large', 'large-small', 'best-worst', 'worst-best']
@@ -92,6 +145,7 @@ FaceSelectorAge = Literal['child', 'teen', 'adult', 'senior']
 FaceSelectorGender = Literal['female', 'male']
 FaceMaskType = Literal['box', 'occlusion', 'region']
 FaceMaskRegion = Literal['skin', 'left-eyebrow', 'right-eyebrow', 'left-eye', 'right-eye', 'glasses', 'nose', 'mouth', 'upper-lip', 'lower-lip']
+FrameExtractionMode = Literal['disk', 'pipe']
 TempFrameFormat = Literal['jpg', 'png', 'bmp']
 OutputAudioEncoder = Literal['aac', 'libmp3lame', 'libopus', 'libvorbis']
 OutputVideoEncoder = Literal['libx264', 'libx265', 'libvpx-vp9', 'h264_nvenc', 'hevc_nvenc', 'h264_amf', 'hevc_amf']
@@ -103,6 +157,23 @@ OptionsWithModel = TypedDict('OptionsWithModel',
 {
 	'model' : ModelValue
 })
+InferenceSessionEntry = TypedDict('InferenceSessionEntry',
+{
+	'model_path' : str,
+	'inference_session' : InferenceSession,
+	'session_size' : int,
+	'time_used' : float
+})
+InferenceSessionSet = Dict[str, InferenceSessionEntry]
+InferenceSessionGetter = Callable[[], Optional[InferenceSession]]
+InferenceInputs = Dict[str, NDArray[Any]]
+WarmUpReport = TypedDict('WarmUpReport',
+{
+	'model_path' : str,
+	'replica_index' : int,
+	'load_time' : float,
+	'inference_time' : Optional[float]
+})
 
 ExecutionProviderKey = Literal['cpu', 'coreml', 'cuda', 'directml', 'openvino', 'rocm']
 ExecutionProviderValue = Literal['CPUExecutionProvider', 'CoreMLExecutionProvider', 'CUDAExecutionProvider', 'DmlExecutionProvider', 'OpenVINOExecutionProvider', 'ROCMExecutionProvider']
@@ -149,12 +220,23 @@ JobStore = TypedDict('JobStore',
 	'step_keys' : List[str]
 })
 JobOutputSet = Dict[str, List[str]]
-JobStatus = Literal['drafted', 'queued', 'completed', 'failed']
+JobStatus = Literal['drafted', 'queued', 'running', 'completed', 'failed']
 JobStepStatus = Literal['drafted', 'queued', 'started', 'completed', 'failed']
+JobStepTelemetry = TypedDict('JobStepTelemetry',
+{
+	'phase_times' : TelemetryPhaseSet,
+	'date_started' : Optional[str],
+	'process_time' : float,
+	'frame_total' : int,
+	'frame_rate' : float,
+	'peak_memory' : int,
+	'execution' : Args
+})
 JobStep = TypedDict('JobStep',
 {
 	'args' : Args,
-	'status' : JobStepStatus
+	'status' : JobStepStatus,
+	'telemetry' : Optional[JobStepTelemetry]
 })
 Job = TypedDict('Job',
 {
@@ -164,6 +246,27 @@ Job = TypedDict('Job',
 	'steps' : List[JobStep]
 })
 JobSet = Dict[str, Job]
+JobSignature = Tuple[int, int, int]
+JobIndexEntry = TypedDict('JobIndexEntry',
+{
+	'job_path' : str,
+	'job_signature' : Optional[JobSignature],
+	'job' : Optional[Job]
+})
+JobIndex = Dict[str, JobIndexEntry]
+JobStatusIndexEntry = TypedDict('JobStatusIndexEntry',
+{
+	'status_signature' : Optional[JobSignature],
+	'date_indexed' : float,
+	'job_ids' : List[str]
+})
+JobStatusIndex = Dict[JobStatus, JobStatusIndexEntry]
+JobStepGraph = Dict[int, Set[int]]
+JobLease = TypedDict('JobLease',
+{
+	'worker_id' : str,
+	'date_renewed' : str
+})
 
 StateContext = Literal['core', 'uis']
 StateKey = Literal\
@@ -179,6 +282,7 @@ StateKey = Literal\
 	'face_detector_angles',
 	'face_detector_score',
 	'face_landmarker_score',
+	'face_tracker_interval',
 	'face_recognizer_model',
 	'face_selector_mode',
 	'face_selector_order',
@@ -193,8 +297,10 @@ StateKey = Literal\
 	'face_mask_regions',
 	'trim_frame_start',
 	'trim_frame_end',
+	'frame_extraction_mode',
 	'temp_frame_format',
 	'keep_temp',
+	'duplicate_frame_threshold',
 	'output_image_quality',
 	'output_image_resolution',
 	'output_audio_encoder',
@@ -205,20 +311,38 @@ StateKey = Literal\
 	'output_video_fps',
 	'skip_audio',
 	'frame_processors',
+	'fuse_frame_processors',
 	'open_browser',
 	'ui_layouts',
 	'ui_workflow',
 	'execution_device_id',
 	'execution_providers',
 	'execution_thread_count',
+	'execution_pool_type',
 	'execution_queue_count',
+	'execution_segment_count',
+	'execution_step_count',
+	'execution_graph_optimization_level',
+	'execution_mode',
+	'execution_intra_op_thread_count',
+	'execution_inter_op_thread_count',
+	'execution_memory_arena_strategy',
+	'execution_cache_path',
+	'execution_session_replica_count',
+	'execution_model_precision',
 	'video_memory_strategy',
 	'system_memory_limit',
+	'face_store_memory_limit',
+	'inference_memory_limit',
 	'skip_download',
 	'log_level',
 	'job_id',
 	'job_status',
-	'step_index'
+	'show_throughput',
+	'step_index',
+	'quantize_method',
+	'quantize_frame_total',
+	'quantize_similarity'
 ]
 State = TypedDict('State',
 {
@@ -233,6 +357,7 @@ State = TypedDict('State',
 	'face_detector_angles' : List[Angle],
 	'face_detector_score' : Score,
 	'face_landmarker_score' : Score,
+	'face_tracker_interval' : int,
 	'face_recognizer_model' : FaceRecognizerModel,
 	'face_selector_mode' : FaceSelectorMode,
 	'face_selector_order' : FaceSelectorOrder,
@@ -247,8 +372,10 @@ State = TypedDict('State',
 	'face_mask_regions' : List[FaceMaskRegion],
 	'trim_frame_start' : int,
 	'trim_frame_end' : int,
+	'frame_extraction_mode' : FrameExtractionMode,
 	'temp_frame_format' : TempFrameFormat,
 	'keep_temp' : bool,
+	'duplicate_frame_threshold' : Optional[float],
 	'output_image_quality' : int,
 	'output_image_resolution' : str,
 	'output_audio_encoder' : OutputAudioEncoder,
@@ -259,19 +386,37 @@ State = TypedDict('State',
 	'output_video_fps' : float,
 	'skip_audio' : bool,
 	'frame_processors' : List[str],
+	'fuse_frame_processors' : bool,
 	'open_browser' : bool,
 	'ui_layouts' : List[str],
 	'ui_workflow' : UiWorkflow,
 	'execution_device_id': str,
 	'execution_providers': List[ExecutionProviderKey],
 	'execution_thread_count': int,
+	'execution_pool_type': ExecutionPoolType,
 	'execution_queue_count': int,
+	'execution_segment_count': int,
+	'execution_step_count': int,
+	'execution_graph_optimization_level': ExecutionGraphOptimizationLevel,
+	'execution_mode': ExecutionMode,
+	'execution_intra_op_thread_count': int,
+	'execution_inter_op_thread_count': int,
+	'execution_memory_arena_strategy': ExecutionMemoryArenaStrategy,
+	'execution_cache_path': str,
+	'execution_session_replica_count': int,
+	'execution_model_precision': ExecutionModelPrecision,
 	'video_memory_strategy': VideoMemoryStrategy,
 	'system_memory_limit': int,
+	'face_store_memory_limit': int,
+	'inference_memory_limit': int,
 	'skip_download': bool,
 	'log_level': LogLevel,
 	'job_id': str,
 	'job_status': JobStatus,
-	'step_index': int
+	'show_throughput': bool,
+	'step_index': int,
+	'quantize_method': QuantizeMethod,
+	'quantize_frame_total': int,
+	'quantize_similarity': float
 })
 StateSet = Dict[StateContext, State]
@@ -6,7 +6,7 @@ import facefusion.choices
 from facefusion import state_manager, wording
 from facefusion.face_analyser import get_many_faces
 from facefusion.face_selector import sort_and_filter_faces
-from facefusion.face_store import clear_reference_faces, clear_static_faces
+from facefusion.face_store import clear_reference_faces
 from facefusion.filesystem import is_image, is_video
 from facefusion.typing import FaceSelectorAge, FaceSelectorGender, FaceSelectorMode, FaceSelectorOrder, VisionFrame
 from facefusion.uis.core import get_ui_component, get_ui_components, register_ui_component
@@ -146,7 +146,6 @@ def update_face_selector_gender(face_analyser_gender : FaceSelectorGender) -> gr
 
 def clear_and_update_reference_face_position(event : gradio.SelectData) -> gradio.Gallery:
 	clear_reference_faces()
-	clear_static_faces()
 	update_reference_face_position(event.index)
 	return update_reference_position_gallery()
 
@@ -165,7 +164,6 @@ def update_reference_frame_number(reference_frame_number : int) -> None:
 
 def clear_and_update_reference_position_gallery() -> gradio.Gallery:
 	clear_reference_faces()
-	clear_static_faces()
 	return update_reference_position_gallery()
 
 
@@ -11,7 +11,7 @@ from facefusion.common_helper import get_first
 from facefusion.content_analyser import analyse_frame
 from facefusion.core import conditional_append_reference_faces
 from facefusion.face_analyser import get_average_face, get_many_faces
-from facefusion.face_store import clear_reference_faces, clear_static_faces, get_reference_faces
+from facefusion.face_store import clear_reference_faces, get_reference_faces
 from facefusion.filesystem import filter_audio_paths, is_image, is_video
 from facefusion.processors.frame.core import load_frame_processor_module
 from facefusion.typing import AudioFrame, Face, FaceSet, VisionFrame
@@ -148,7 +148,6 @@ def listen() -> None:
 
 def clear_and_update_preview_image(frame_number : int = 0) -> gradio.Image:
 	clear_reference_faces()
-	clear_static_faces()
 	return update_preview_image(frame_number)
 
 
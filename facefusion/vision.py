@@ -1,3 +1,5 @@
+import os
+import uuid
 from functools import lru_cache
 from typing import List, Optional, Tuple
 
@@ -7,7 +9,7 @@ from cv2.typing import Size
 
 from facefusion.choices import image_template_sizes, video_template_sizes
 from facefusion.common_helper import is_windows
-from facefusion.filesystem import is_image, is_video, sanitize_path_for_windows
+from facefusion.filesystem import is_image, is_video, remove_file, sanitize_path_for_windows
 from facefusion.typing import Fps, Resolution, VisionFrame
 
 
@@ -35,9 +37,17 @@ def read_image(image_path : str) -> Optional[VisionFrame]:
 
 def write_image(image_path : str, vision_frame : VisionFrame) -> bool:
 	if image_path:
-		if is_windows():
-			image_path = sanitize_path_for_windows(image_path)
-		return cv2.imwrite(image_path, vision_frame)
+		image_temp_path = image_path + '.' + uuid.uuid4().hex + '.tmp'
+		is_success, image_buffer = cv2.imencode(os.path.splitext(image_path)[1], vision_frame)
+
+		if is_success:
+			try:
+				image_buffer.tofile(image_temp_path)
+				os.replace(image_temp_path, image_path)
+			except OSError:
+				remove_file(image_temp_path)
+				return False
+		return is_success
 	return False
 
 
@@ -1,4 +1,3 @@
-from time import sleep
 from typing import Any, Tuple
 
 import numpy
@@ -6,12 +5,11 @@ import scipy
 
 from facefusion import process_manager, state_manager
 from facefusion.download import conditional_download
-from facefusion.execution import create_inference_session
 from facefusion.filesystem import is_file, resolve_relative_path
-from facefusion.thread_helper import thread_lock, thread_semaphore
+from facefusion.inference_manager import clear_inference_sessions, get_inference_session
+from facefusion.thread_helper import thread_semaphore
 from facefusion.typing import Audio, AudioChunk, ModelSet
 
-VOICE_EXTRACTOR = None
 MODELS : ModelSet =\
 {
 	'voice_extractor':
@@ -23,21 +21,12 @@ MODELS : ModelSet =\
 
 
 def get_voice_extractor() -> Any:
-	global VOICE_EXTRACTOR
-
-	with thread_lock():
-		while process_manager.is_checking():
-			sleep(0.5)
-		if VOICE_EXTRACTOR is None:
-			model_path = MODELS.get('voice_extractor').get('path')
-			VOICE_EXTRACTOR = create_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
-	return VOICE_EXTRACTOR
+	model_path = MODELS.get('voice_extractor').get('path')
+	return get_inference_session(model_path, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
 
 
 def clear_voice_extractor() -> None:
-	global VOICE_EXTRACTOR
-
-	VOICE_EXTRACTOR = None
+	clear_inference_sessions([ MODELS.get('voice_extractor').get('path') ])
 
 
 def pre_check() -> bool:
@@ -71,7 +60,7 @@ def extract_voice(temp_audio_chunk : AudioChunk) -> AudioChunk:
 	temp_audio_chunk, pad_size = prepare_audio_chunk(temp_audio_chunk.T, chunk_size, trim_size)
 	temp_audio_chunk = decompose_audio_chunk(temp_audio_chunk, trim_size)
 
-	with thread_semaphore():
+	with thread_semaphore(voice_extractor):
 		temp_audio_chunk = voice_extractor.run(None,
 		{
 			voice_extractor.get_inputs()[0].name: temp_audio_chunk
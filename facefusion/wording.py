@@ -9,7 +9,11 @@ WORDING : Dict[str, Any] =\
 	'extracting_frames': 'Extracting frames with a resolution of {resolution} and {fps} frames per second',
 	'extracting_frames_succeed': 'Extracting frames succeed',
 	'extracting_frames_failed': 'Extracting frames failed',
+	'resuming_checkpoint': 'Resuming from the checkpoint with {frame_total} extracted frames',
+	'processing_checkpoint_skipped': 'Processing skipped as the checkpoint is already done',
+	'detecting_shots_succeed': 'Detecting shots succeed with {shot_total} shots',
 	'analysing': 'Analysing',
+	'detecting_shots': 'Detecting shots',
 	'processing': 'Processing',
 	'downloading': 'Downloading',
 	'temp_frames_not_found': 'Temporary frames not found',
@@ -22,15 +26,29 @@ WORDING : Dict[str, Any] =\
 	'merging_video': 'Merging video with a resolution of {resolution} and {fps} frames per second',
 	'merging_video_succeed': 'Merging video succeed',
 	'merging_video_failed': 'Merging video failed',
+	'streaming_frames': 'Streaming frames with a resolution of {resolution} and {fps} frames per second',
+	'streaming_frames_succeed': 'Streaming frames succeed',
+	'streaming_frames_failed': 'Streaming frames failed',
 	'skipping_audio': 'Skipping audio',
 	'restoring_audio_succeed': 'Restoring audio succeed',
 	'restoring_audio_skipped': 'Restoring audio skipped',
 	'clearing_temp': 'Clearing temporary resources',
 	'processing_stopped': 'Processing stopped',
+	'inference_memory_limit_exceeded': 'Keeping {session_total} models loaded beyond the inference memory limit of {inference_memory_limit} MB as the current processors need them',
+	'warming_up_model_succeed': 'Warming up {model_name} succeed with {load_seconds} seconds to load and {inference_seconds} seconds to infer',
+	'warming_up_model_skipped': 'Warming up {model_name} skipped the inference after {load_seconds} seconds to load',
+	'warming_up_model_failed': 'Warming up {model_name} failed with {exception}',
+	'warming_up_models_succeed': 'Warming up {model_total} models succeed in {seconds} seconds',
+	'quantizing_model_succeed': 'Quantizing {model_name} succeed with a similarity of {similarity}',
+	'quantizing_model_failed': 'Quantizing {model_name} failed with a similarity of {similarity}',
+	'quantizing_model_skipped': 'Quantizing {model_name} skipped without calibration inputs',
+	'quantizing_model_error': 'Quantizing {model_name} raised {exception}',
 	'processing_image_succeed': 'Processing to image succeed in {seconds} seconds',
 	'processing_image_failed': 'Processing to image failed',
 	'processing_video_succeed': 'Processing to video succeed in {seconds} seconds',
 	'processing_video_failed': 'Processing to video failed',
+	'restoring_duplicate_frames_failed': 'Restoring duplicate frames failed',
+	'skipping_duplicate_frames': 'Skipping {duplicate_frame_total} duplicate frames of {frame_total} frames with a ratio of {duplicate_frame_ratio}%',
 	'model_download_not_done': 'Download of the model is not done',
 	'model_file_not_present': 'File of the model is not present',
 	'choose_image_source': 'Choose a image for the source',
@@ -40,6 +58,7 @@ WORDING : Dict[str, Any] =\
 	'specify_image_or_video_output': 'Specify the output image or video within a directory',
 	'match_target_and_output_extension': 'Match the target and output extension',
 	'no_source_face_detected': 'No source face detected',
+	'face_swapper_batch_size_ignored': 'Swapping frames one by one as the batch size is not supported when streaming or fusing frame processors',
 	'frame_processor_not_loaded': 'Frame processor {frame_processor} could not be loaded',
 	'frame_processor_not_implemented': 'Frame processor {frame_processor} not implemented correctly',
 	'ui_layout_not_loaded': 'UI layout {ui_layout} could not be loaded',
@@ -72,6 +91,7 @@ WORDING : Dict[str, Any] =\
 	'processing_job_failed': 'Processing of job {job_id} failed',
 	'processing_jobs_failed': 'Processing of all jobs failed',
 	'processing_step': 'Processing step {step_current} of {step_total}',
+	'splitting_video': 'Splitting video into {segment_total} segments',
 	'time_ago_now': 'just now',
 	'time_ago_minutes': '{minutes} minutes ago',
 	'time_ago_hours': '{hours} hours and {minutes} minutes ago',
@@ -99,16 +119,30 @@ WORDING : Dict[str, Any] =\
 		'execution_device_id': 'specify the device used for processing',
 		'execution_providers': 'accelerate the model inference using different providers (choices: {choices}, ...)',
 		'execution_thread_count': 'specify the amount of parallel threads while processing',
+		'execution_pool_type': 'choose between worker threads or worker processes (process workers are shared by all processor passes of a video and exchange frames through shared memory when streaming)',
 		'execution_queue_count': 'specify the amount of frames each thread is processing',
+		'execution_segment_count': 'split the video into the amount of segments that get processed by parallel worker processes',
+		'execution_step_count': 'specify the amount of independent job steps that get processed in parallel',
+		'execution_graph_optimization_level': 'choose how aggressive the model graphs get optimized while loading',
+		'execution_mode': 'choose between running the operators of a model sequential or in parallel',
+		'execution_intra_op_thread_count': 'specify the amount of threads used within an operator (0 = automatic)',
+		'execution_inter_op_thread_count': 'specify the amount of threads used across operators in parallel execution mode (0 = automatic)',
+		'execution_memory_arena_strategy': 'choose how the memory arena grows to reduce the memory footprint (disabled turns off the cpu arena and grows the cuda and rocm arena as requested)',
+		'execution_cache_path': 'specify the directory to cache the optimized models for faster loading',
+		'execution_session_replica_count': 'specify the amount of sessions per model that split the intra op threads and run in parallel',
+		'execution_model_precision': 'prefer the quantized models when running on the cpu execution provider',
 		# memory
 		'video_memory_strategy': 'balance fast frame processing and low VRAM usage',
 		'system_memory_limit': 'limit the available RAM that can be used while processing',
+		'face_store_memory_limit': 'limit the RAM in megabytes that can be used to store analysed faces',
+		'inference_memory_limit': 'limit the RAM in megabytes that can be used by loaded models before the least recently used are unloaded',
 		# face analyser
 		'face_detector_model': 'choose the model responsible for detecting the faces',
 		'face_detector_size': 'specify the size of the frame provided to the face detector',
 		'face_detector_angles': 'specify the angles to rotate the frame before detecting faces',
 		'face_detector_score': 'filter the detected faces base on the confidence score',
 		'face_landmarker_score': 'filter the detected landmarks base on the confidence score',
+		'face_tracker_interval': 'track the faces between the detections and run the face detector every n frames (0 = detect every frame)',
 		# face selector
 		'face_selector_mode': 'use reference based tracking or simple matching',
 		'face_selector_order': 'specify the order of the detected faces',
@@ -125,8 +159,10 @@ WORDING : Dict[str, Any] =\
 		# frame extraction
 		'trim_frame_start': 'specify the the start frame of the target video',
 		'trim_frame_end': 'specify the the end frame of the target video',
+		'frame_extraction_mode': 'choose between temporary frames on disk or streaming frames through a pipe',
 		'temp_frame_format': 'specify the temporary resources format',
 		'keep_temp': 'keep the temporary resources after processing',
+		'duplicate_frame_threshold': 'reuse the output of the previous frame for duplicate frames within the difference threshold (0 = exact duplicates only)',
 		# output creation
 		'output_image_quality': 'specify the image quality which translates to the compression factor',
 		'output_image_resolution': 'specify the image output resolution based on the target image',
@@ -139,6 +175,7 @@ WORDING : Dict[str, Any] =\
 		'skip_audio': 'omit the audio from the target video',
 		# frame processors
 		'frame_processors': 'load a single or multiple frame processors. (choices: {choices}, ...)',
+		'fuse_frame_processors': 'run all frame processors in a single pass per frame',
 		'age_modifier_model': 'choose the model responsible for aging the face',
 		'age_modifier_direction': 'specify the direction in which the age should be modified',
 		'face_debugger_items': 'load a single or multiple frame processors (choices: {choices})',
@@ -147,6 +184,7 @@ WORDING : Dict[str, Any] =\
 		'face_swapper_model': 'choose the model responsible for swapping the face',
 		'face_swapper_pixel_boost': 'choose the pixel boost resolution for the face swapper',
 		'face_swapper_expression_restorer': 'restore expression from target face',
+		'face_swapper_batch_size': 'specify the amount of frames the face swapper runs through the model at once',
 		'frame_colorizer_model': 'choose the model responsible for colorizing the frame',
 		'frame_colorizer_blend': 'blend the colorized into the previous frame',
 		'frame_colorizer_size': 'specify the size of the frame provided to the frame colorizer',
@@ -161,9 +199,15 @@ WORDING : Dict[str, Any] =\
 		'run': 'run the program',
 		'run_headless': 'run the program in headless mode',
 		'force_download': 'force automate downloads and exit',
+		'quantize': 'quantize the models of the current options to int8 variants for the cpu and exit',
+		# quantize
+		'quantize_method': 'choose between dynamic quantization and static quantization calibrated by the target frames',
+		'quantize_frame_total': 'specify the amount of target frames used to calibrate and check the quantized models',
+		'quantize_similarity': 'specify the minimum output similarity of the quantized models compared to the original models',
 		# job
 		'job_id': 'specify the job id',
 		'step_index': 'specify the step index',
+		'show_throughput': 'show the frame total, frame rate and peak memory of the steps',
 		# job manager
 		'job_create': 'create a drafted job',
 		'job_submit': 'submit a drafted job to become a queued job',
@@ -1,8 +1,13 @@
 import os
+from typing import List, Union
+
+import numpy
+import onnx
+from onnx import TensorProto, helper
 
 from facefusion.filesystem import create_directory, is_directory, is_file, remove_directory
 from facefusion.temp_helper import get_base_directory_path
-from facefusion.typing import JobStatus
+from facefusion.typing import Face, JobStatus
 
 
 def is_test_job_file(file_path : str, job_status : JobStatus) -> bool:
@@ -42,3 +47,41 @@ def prepare_test_output_directory() -> bool:
 	remove_directory(test_outputs_directory)
 	create_directory(test_outputs_directory)
 	return is_directory(test_outputs_directory)
+
+
+def create_identity_model(input_shape : List[Union[int, str]]) -> onnx.ModelProto:
+	graph = helper.make_graph(
+	[
+		helper.make_node('Identity', [ 'input' ], [ 'output' ])
+	], 'identity',
+	[
+		helper.make_tensor_value_info('input', TensorProto.FLOAT, input_shape)
+	],
+	[
+		helper.make_tensor_value_info('output', TensorProto.FLOAT, input_shape)
+	])
+	return helper.make_model(graph)
+
+
+def create_test_face() -> Face:
+	face_landmark_5 = numpy.array([ [ 180, 100 ], [ 240, 100 ], [ 210, 130 ], [ 185, 160 ], [ 235, 160 ] ], dtype = numpy.float32)
+	return Face(
+		bounding_box = numpy.array([ 160, 70, 260, 190 ]),
+		landmark_set =
+		{
+			'5': face_landmark_5,
+			'5/68': face_landmark_5,
+			'68': numpy.zeros((68, 2)),
+			'68/5': numpy.zeros((68, 2))
+		},
+		score_set =
+		{
+			'detector': 0.9,
+			'landmarker': 0.9
+		},
+		angle = 0,
+		embedding = numpy.ones(512),
+		normed_embedding = numpy.ones(512),
+		gender = None,
+		age = None
+	)
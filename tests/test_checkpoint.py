@@ -0,0 +1,89 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from facefusion import state_manager
+from facefusion.checkpoint import append_checkpoint_frames, create_checkpoint, filter_checkpoint_frames, finish_checkpoint_pass, is_checkpoint_pass_done, read_checkpoint_frames, resume_checkpoint, start_checkpoint_pass
+from facefusion.jobs import job_store
+from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_directory_path
+from .helper import get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	prepare_test_output_directory()
+	target_path = get_test_output_file('target.mp4')
+
+	with open(target_path, 'wb') as target_file:
+		target_file.write(b'target')
+	clear_temp_directory(target_path)
+	create_temp_directory(target_path)
+	for index in range(3):
+		with open(os.path.join(get_temp_directory_path(target_path), str(index).zfill(4) + '.png'), 'wb') as temp_frame_file:
+			temp_frame_file.write(b'frame')
+	job_store.register_step_keys([ 'target_path', 'face_tracker_interval' ])
+	state_manager.init_item('target_path', target_path)
+	state_manager.init_item('temp_frame_format', 'png')
+	state_manager.init_item('frame_extraction_mode', 'disk')
+	state_manager.init_item('keep_temp', True)
+	state_manager.init_item('face_tracker_interval', 0)
+
+
+def test_resume_checkpoint() -> None:
+	target_path = state_manager.get_item('target_path')
+
+	assert resume_checkpoint(target_path) is None
+	assert create_checkpoint(target_path, 3, {}) is True
+	assert resume_checkpoint(target_path).get('frame_total') == 3
+	assert create_checkpoint(target_path, 4, {}) is True
+	assert resume_checkpoint(target_path) is None
+
+	create_checkpoint(target_path, 3, {})
+	state_manager.init_item('face_tracker_interval', 3)
+
+	assert resume_checkpoint(target_path) is None
+
+
+def test_checkpoint_pass() -> None:
+	target_path = state_manager.get_item('target_path')
+	create_checkpoint(target_path, 3, {})
+
+	assert is_checkpoint_pass_done(target_path, 'face_swapper') is False
+	assert finish_checkpoint_pass(target_path, 'face_swapper') is False
+	assert start_checkpoint_pass(target_path, 'face_swapper') is True
+	assert finish_checkpoint_pass(target_path, 'face_swapper') is True
+	assert is_checkpoint_pass_done(target_path, 'face_swapper') is True
+	assert is_checkpoint_pass_done(target_path, 'face_enhancer') is False
+
+	state_manager.init_item('keep_temp', False)
+
+	assert is_checkpoint_pass_done(target_path, 'face_swapper') is False
+
+
+def test_filter_checkpoint_frames() -> None:
+	target_path = state_manager.get_item('target_path')
+	queue_payloads = [ { 'frame_number': frame_number, 'frame_path': str(frame_number) } for frame_number in range(3) ]
+	create_checkpoint(target_path, 3, {})
+	start_checkpoint_pass(target_path, 'face_swapper')
+	append_checkpoint_frames(target_path, [ 0, 2 ])
+
+	assert read_checkpoint_frames(target_path) == { 0, 2 }
+	assert filter_checkpoint_frames(queue_payloads) == [ queue_payloads[1] ] #type:ignore[arg-type]
+
+	start_checkpoint_pass(target_path, 'face_enhancer')
+
+	assert read_checkpoint_frames(target_path) == set()
+	assert filter_checkpoint_frames(queue_payloads) == queue_payloads #type:ignore[arg-type]
+
+
+def test_append_checkpoint_frames() -> None:
+	target_path = state_manager.get_item('target_path')
+	create_checkpoint(target_path, 3, {})
+	start_checkpoint_pass(target_path, 'face_swapper')
+
+	with ThreadPoolExecutor(max_workers = 8) as executor:
+		for frame_number in range(1000):
+			executor.submit(append_checkpoint_frames, target_path, [ frame_number ])
+
+	assert read_checkpoint_frames(target_path) == set(range(1000))
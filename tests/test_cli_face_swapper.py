@@ -37,3 +37,17 @@ def test_swap_face_to_video() -> None:
 
 	assert subprocess.run(commands).returncode == 0
 	assert is_test_output_file('test-swap-face-to-video.mp4') is True
+
+
+def test_swap_face_to_video_with_fuse_frame_processors() -> None:
+	commands = [ sys.executable, 'facefusion.py', 'run-headless', '-j', get_test_jobs_directory(), '--frame-processors', 'face_swapper', 'face_enhancer', '--fuse-frame-processors', '-s', get_test_example_file('source.jpg'), '-t', get_test_example_file('target-240p.mp4'), '-o', get_test_output_file('test-swap-face-to-video-with-fuse-frame-processors.mp4'), '--trim-frame-end', '10' ]
+
+	assert subprocess.run(commands).returncode == 0
+	assert is_test_output_file('test-swap-face-to-video-with-fuse-frame-processors.mp4') is True
+
+
+def test_swap_face_to_video_with_process_pool() -> None:
+	commands = [ sys.executable, 'facefusion.py', 'run-headless', '-j', get_test_jobs_directory(), '--frame-processors', 'face_swapper', '--execution-pool-type', 'process', '--frame-extraction-mode', 'pipe', '-s', get_test_example_file('source.jpg'), '-t', get_test_example_file('target-240p.mp4'), '-o', get_test_output_file('test-swap-face-to-video-with-process-pool.mp4'), '--trim-frame-end', '10' ]
+
+	assert subprocess.run(commands).returncode == 0
+	assert is_test_output_file('test-swap-face-to-video-with-process-pool.mp4') is True
@@ -1,4 +1,27 @@
-from facefusion.execution import apply_execution_provider_options, get_execution_provider_choices, has_execution_provider
+import os
+from typing import Union
+
+import numpy
+import onnx
+import pytest
+from onnxruntime import ExecutionMode, GraphOptimizationLevel, InferenceSession
+
+from facefusion import state_manager
+from facefusion.execution import apply_execution_provider_options, create_inference_session, create_session_options, get_execution_provider_choices, get_quantized_model_path, has_dynamic_batch_size, has_execution_provider, resolve_optimized_model_path, resolve_quantized_model_path
+from facefusion.filesystem import copy_file, is_file
+from .helper import create_identity_model, get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	prepare_test_output_directory()
+	state_manager.init_item('execution_graph_optimization_level', 'all')
+	state_manager.init_item('execution_mode', 'sequential')
+	state_manager.init_item('execution_intra_op_thread_count', 0)
+	state_manager.init_item('execution_inter_op_thread_count', 0)
+	state_manager.init_item('execution_memory_arena_strategy', 'power_of_two')
+	state_manager.init_item('execution_cache_path', get_test_output_file('caches'))
+	state_manager.init_item('execution_model_precision', 'fp32')
 
 
 def test_get_execution_provider_choices() -> None:
@@ -10,6 +33,79 @@ def test_has_execution_provider() -> None:
 	assert has_execution_provider('openvino') is False
 
 
+def create_identity_session(batch_size : Union[int, str]) -> InferenceSession:
+	return InferenceSession(create_identity_model([ batch_size, 3 ]).SerializeToString(), providers = [ 'CPUExecutionProvider' ])
+
+
+def test_has_dynamic_batch_size() -> None:
+	assert has_dynamic_batch_size(create_identity_session('batch')) is True
+	assert has_dynamic_batch_size(create_identity_session(1)) is False
+
+
+def test_create_session_options() -> None:
+	state_manager.init_item('execution_graph_optimization_level', 'basic')
+	state_manager.init_item('execution_mode', 'parallel')
+	state_manager.init_item('execution_intra_op_thread_count', 2)
+	state_manager.init_item('execution_memory_arena_strategy', 'disabled')
+	session_options = create_session_options([ 'cpu' ])
+
+	assert session_options.graph_optimization_level == GraphOptimizationLevel.ORT_ENABLE_BASIC
+	assert session_options.execution_mode == ExecutionMode.ORT_PARALLEL
+	assert session_options.intra_op_num_threads == 2
+	assert session_options.enable_cpu_mem_arena is False
+	assert session_options.enable_mem_pattern is False
+	assert create_session_options([ 'directml' ]).execution_mode == ExecutionMode.ORT_SEQUENTIAL
+
+	state_manager.init_item('execution_intra_op_thread_count', 8)
+	state_manager.init_item('execution_session_replica_count', 3)
+
+	assert create_session_options([ 'cpu' ]).intra_op_num_threads == 2
+
+	state_manager.init_item('execution_session_replica_count', 1)
+
+
+def test_create_inference_session() -> None:
+	model_path = get_test_output_file('identity.onnx')
+	onnx.save(create_identity_model([ 'batch', 3 ]), model_path)
+	optimized_model_path = resolve_optimized_model_path(model_path, '0', [ 'cpu' ])
+
+	assert resolve_optimized_model_path(model_path, '0', [ 'coreml' ]) is None
+	assert resolve_optimized_model_path(model_path, '0', [ 'cuda' ]) != optimized_model_path
+	assert os.path.dirname(optimized_model_path) == get_test_output_file('caches')
+	assert is_file(optimized_model_path) is False
+
+	create_inference_session(model_path, '0', [ 'cpu' ])
+
+	assert is_file(optimized_model_path) is True
+
+	inference_session = create_inference_session(model_path, '0', [ 'cpu' ])
+	input_frame = numpy.ones((1, 3), dtype = numpy.float32)
+
+	assert numpy.array_equal(inference_session.run(None, { 'input': input_frame })[0], input_frame)
+	assert os.listdir(get_test_output_file('caches')) == [ os.path.basename(optimized_model_path) ]
+
+	state_manager.init_item('execution_graph_optimization_level', 'disable')
+
+	assert resolve_optimized_model_path(model_path, '0', [ 'cpu' ]) is None
+
+
+def test_resolve_quantized_model_path() -> None:
+	model_path = get_test_output_file('identity.onnx')
+	onnx.save(create_identity_model([ 'batch', 3 ]), model_path)
+
+	assert get_quantized_model_path(model_path) == get_test_output_file('identity.int8.onnx')
+	assert resolve_quantized_model_path(model_path, [ 'cpu' ]) == model_path
+
+	state_manager.init_item('execution_model_precision', 'int8')
+
+	assert resolve_quantized_model_path(model_path, [ 'cpu' ]) == model_path
+
+	copy_file(model_path, get_quantized_model_path(model_path))
+
+	assert resolve_quantized_model_path(model_path, [ 'cpu' ]) == get_quantized_model_path(model_path)
+	assert resolve_quantized_model_path(model_path, [ 'cuda', 'cpu' ]) == model_path
+
+
 def test_multiple_execution_providers() -> None:
 	execution_provider_with_options =\
 	[
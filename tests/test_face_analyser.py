@@ -1,13 +1,17 @@
 import subprocess
+from typing import Any, List, Union
 
+import numpy
 import pytest
+from onnxruntime import InferenceSession
 
-from facefusion import state_manager
+from facefusion import face_analyser, state_manager
 from facefusion.download import conditional_download
-from facefusion.face_analyser import clear_face_analyser, get_many_faces, get_one_face, pre_check
+from facefusion.face_analyser import calc_embeddings, clear_face_analyser, expand_face_landmarks_68_from_5, forward_batch, get_many_faces, get_one_face, pre_check
+from facefusion.face_store import clear_static_faces
 from facefusion.typing import Face
 from facefusion.vision import read_static_image
-from .helper import get_test_example_file, get_test_examples_directory
+from .helper import create_identity_model, create_test_face, get_test_example_file, get_test_examples_directory
 
 
 @pytest.fixture(scope = 'module', autouse = True)
@@ -99,3 +103,84 @@ def test_get_many_faces() -> None:
 	assert isinstance(many_faces[0], Face)
 	assert isinstance(many_faces[1], Face)
 	assert isinstance(many_faces[2], Face)
+
+
+def test_get_many_faces_with_face_attributes() -> None:
+	clear_static_faces()
+	source_path = get_test_example_file('source.jpg')
+	source_frame = read_static_image(source_path)
+	face = get_one_face(get_many_faces([ source_frame ], []))
+
+	assert face.embedding is None
+	assert face.gender is None
+
+	face = get_one_face(get_many_faces([ source_frame ], [ 'embedding' ]))
+
+	assert face.embedding is not None
+	assert face.gender is None
+
+	face = get_one_face(get_many_faces([ source_frame ]))
+
+	assert face.embedding is not None
+	assert face.gender is not None
+
+
+def create_identity_session(input_shape : List[Union[int, str]]) -> InferenceSession:
+	return InferenceSession(create_identity_model(input_shape).SerializeToString(), providers = [ 'CPUExecutionProvider' ])
+
+
+def count_session_runs(monkeypatch : pytest.MonkeyPatch, inference_session : InferenceSession) -> List[int]:
+	session_runs : List[int] = []
+	inference_session_run = inference_session.run
+
+	def run(output_names : Any, input_feed : Any) -> Any:
+		session_runs.append(len(next(iter(input_feed.values()))))
+		return inference_session_run(output_names, input_feed)
+
+	monkeypatch.setattr(inference_session, 'run', run)
+	return session_runs
+
+
+@pytest.mark.parametrize('batch_size', [ 'batch', 1 ])
+def test_forward_batch(monkeypatch : pytest.MonkeyPatch, batch_size : Union[int, str]) -> None:
+	inference_session = create_identity_session([ batch_size, 3 ])
+	session_runs = count_session_runs(monkeypatch, inference_session)
+	batch_vision_frame = numpy.arange(12, dtype = numpy.float32).reshape(4, 3)
+	batch_outputs = forward_batch(inference_session, batch_vision_frame)
+
+	assert len(batch_outputs) == 1
+	assert numpy.array_equal(batch_outputs[0], batch_vision_frame)
+	assert session_runs == ([ 4 ] if batch_size == 'batch' else [ 1, 1, 1, 1 ])
+
+
+@pytest.mark.parametrize('batch_size', [ 'batch', 1 ])
+def test_calc_embeddings(monkeypatch : pytest.MonkeyPatch, batch_size : Union[int, str]) -> None:
+	inference_session = create_identity_session([ batch_size, 3, 112, 112 ])
+	session_runs = count_session_runs(monkeypatch, inference_session)
+	monkeypatch.setattr(face_analyser, 'get_face_recognizer', lambda: inference_session)
+	temp_vision_frame = numpy.random.RandomState(0).randint(0, 255, (300, 420, 3)).astype(numpy.uint8)
+	face_landmarks_5 = [ create_test_face().landmark_set.get('5/68') + offset for offset in [ 0, 20, 40 ] ]
+	embeddings, normed_embeddings = calc_embeddings(temp_vision_frame, face_landmarks_5)
+
+	assert session_runs == ([ 3 ] if batch_size == 'batch' else [ 1, 1, 1 ])
+
+	for index, face_landmark_5 in enumerate(face_landmarks_5):
+		crop_embeddings, crop_normed_embeddings = calc_embeddings(temp_vision_frame, [ face_landmark_5 ])
+
+		assert numpy.allclose(embeddings[index], crop_embeddings[0])
+		assert numpy.allclose(normed_embeddings[index], crop_normed_embeddings[0])
+
+
+@pytest.mark.parametrize('batch_size', [ 'batch', 1 ])
+def test_expand_face_landmarks_68_from_5(monkeypatch : pytest.MonkeyPatch, batch_size : Union[int, str]) -> None:
+	inference_session = create_identity_session([ batch_size, 5, 2 ])
+	session_runs = count_session_runs(monkeypatch, inference_session)
+	monkeypatch.setattr(face_analyser, 'get_face_landmarker', lambda face_landmarker_model: inference_session)
+	face_landmarks_5 = [ create_test_face().landmark_set.get('5/68') + offset for offset in [ 0, 20, 40 ] ]
+	face_landmarks_68_5 = expand_face_landmarks_68_from_5(face_landmarks_5)
+
+	assert session_runs == ([ 3 ] if batch_size == 'batch' else [ 1, 1, 1 ])
+
+	for index, face_landmark_5 in enumerate(face_landmarks_5):
+		assert numpy.allclose(face_landmarks_68_5[index], expand_face_landmarks_68_from_5([ face_landmark_5 ])[0], atol = 1e-3)
+		assert numpy.allclose(face_landmarks_68_5[index], face_landmark_5, atol = 1e-3)
@@ -0,0 +1,128 @@
+import numpy
+
+from facefusion import state_manager
+from facefusion.face_store import calc_faces_size, clear_frame_faces, clear_static_faces, create_frame_hash, get_face_store, get_frame_faces, get_static_faces, set_frame_faces, set_static_faces
+from facefusion.typing import VisionFrame
+from .helper import create_test_face
+
+
+def create_test_vision_frame(value : int) -> VisionFrame:
+	vision_frame = numpy.zeros((240, 426, 3), dtype = numpy.uint8)
+	vision_frame[0, 0] = value % 256
+	vision_frame[0, 1] = value // 256
+	vision_frame[100, 100] = 1
+	return vision_frame
+
+
+def test_get_static_faces() -> None:
+	clear_static_faces()
+	state_manager.init_item('face_store_memory_limit', 0)
+	state_manager.init_item('face_detector_model', 'yoloface')
+	vision_frame = create_test_vision_frame(1)
+	faces = [ create_test_face() ]
+	set_static_faces(vision_frame, faces)
+
+	assert get_static_faces(vision_frame) == faces
+	assert get_static_faces(create_test_vision_frame(2)) is None
+
+	state_manager.init_item('face_detector_model', 'retinaface')
+
+	assert get_static_faces(vision_frame) is None
+
+	state_manager.init_item('face_detector_model', 'yoloface')
+
+	assert get_static_faces(vision_frame) == faces
+
+
+def test_set_static_faces_with_memory_limit() -> None:
+	clear_static_faces()
+	state_manager.init_item('face_store_memory_limit', 1)
+	faces = [ create_test_face() ]
+	frame_limit = 1024 * 1024 // calc_faces_size(faces)
+
+	for value in range(1, frame_limit + 1):
+		set_static_faces(create_test_vision_frame(value), faces)
+	get_static_faces(create_test_vision_frame(1))
+	set_static_faces(create_test_vision_frame(frame_limit + 1), faces)
+	set_static_faces(create_test_vision_frame(frame_limit + 2), faces)
+
+	assert get_static_faces(create_test_vision_frame(1)) == faces
+	assert get_static_faces(create_test_vision_frame(2)) is None
+	assert get_static_faces(create_test_vision_frame(3)) is None
+	assert get_static_faces(create_test_vision_frame(frame_limit + 2)) == faces
+	assert len(get_face_store().get('static_faces')) == frame_limit
+	assert get_face_store().get('static_faces_size') <= 1024 * 1024
+
+	clear_static_faces()
+
+	assert get_face_store().get('static_faces_size') == 0
+
+
+def test_get_frame_faces() -> None:
+	clear_frame_faces()
+	vision_frame = numpy.ones((240, 426, 3), dtype = numpy.uint8)
+	modified_vision_frame = numpy.zeros((240, 426, 3), dtype = numpy.uint8)
+	modified_vision_frame[0, 0] = 255
+	scaled_vision_frame = numpy.ones((480, 852, 3), dtype = numpy.uint8)
+	faces = [ create_test_face() ]
+	set_frame_faces(0, vision_frame, faces)
+
+	assert get_frame_faces(0, vision_frame) == faces
+	assert get_frame_faces(0, modified_vision_frame) == faces
+	assert get_frame_faces(0, scaled_vision_frame) is None
+	assert get_frame_faces(1, vision_frame) is None
+
+
+def test_set_frame_faces_with_memory_limit() -> None:
+	clear_frame_faces()
+	state_manager.init_item('face_store_memory_limit', 1)
+	vision_frame = numpy.ones((240, 426, 3), dtype = numpy.uint8)
+	faces = [ create_test_face() ]
+	frame_limit = 1024 * 1024 // calc_faces_size(faces)
+
+	for frame_number in range(frame_limit + 2):
+		set_frame_faces(frame_number, vision_frame, faces)
+
+	assert get_frame_faces(0, vision_frame) is None
+	assert get_frame_faces(1, vision_frame) is None
+	assert get_frame_faces(frame_limit + 1, vision_frame) == faces
+	assert len(get_face_store().get('frame_faces')) == frame_limit
+	assert get_face_store().get('frame_faces_size') <= 1024 * 1024
+
+	clear_frame_faces()
+
+	assert get_face_store().get('frame_faces_size') == 0
+
+
+def test_set_frame_faces_without_faces() -> None:
+	clear_frame_faces()
+	vision_frame = numpy.ones((240, 426, 3), dtype = numpy.uint8)
+	set_frame_faces(0, vision_frame, [])
+
+	assert get_frame_faces(0, vision_frame) == []
+
+
+def test_clear_frame_faces() -> None:
+	vision_frame = numpy.ones((240, 426, 3), dtype = numpy.uint8)
+	set_frame_faces(0, vision_frame, [ create_test_face() ])
+	clear_frame_faces()
+
+	assert get_frame_faces(0, vision_frame) is None
+
+
+def test_create_frame_hash() -> None:
+	vision_frame = numpy.random.randint(0, 255, (2160, 3840, 3), dtype = numpy.uint8)
+	modified_vision_frame = vision_frame.copy()
+	modified_vision_frame[0, 0] = 255 - modified_vision_frame[0, 0]
+	unsampled_vision_frame = vision_frame.copy()
+	unsampled_vision_frame[1, 1] = 255 - unsampled_vision_frame[1, 1]
+	uniform_vision_frame = numpy.full((2160, 3840, 3), 128, dtype = numpy.uint8)
+	modified_uniform_vision_frame = uniform_vision_frame.copy()
+	modified_uniform_vision_frame[1, 1] = 0
+
+	assert create_frame_hash(vision_frame) == create_frame_hash(vision_frame.copy())
+	assert create_frame_hash(vision_frame) != create_frame_hash(modified_vision_frame)
+	assert create_frame_hash(vision_frame) != create_frame_hash(unsampled_vision_frame)
+	assert create_frame_hash(vision_frame) != create_frame_hash(vision_frame[:1080])
+	assert create_frame_hash(uniform_vision_frame) != create_frame_hash(modified_uniform_vision_frame)
+	assert create_frame_hash(numpy.zeros((2160, 3840, 3), dtype = numpy.uint8)) is None
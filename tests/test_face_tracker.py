@@ -0,0 +1,102 @@
+import subprocess
+from typing import List
+
+import cv2
+import numpy
+import pytest
+
+from facefusion import face_analyser, process_manager, state_manager
+from facefusion.face_store import clear_frame_faces
+from facefusion.face_tracker import clear_face_tracks, get_face_tracks, set_face_track, track_faces
+from facefusion.filesystem import create_directory
+from facefusion.processors.frame import core
+from facefusion.temp_helper import clear_temp_directory, create_temp_directory
+from facefusion.typing import Face, FaceAttribute, VisionFrame
+from .helper import create_test_face, get_test_example_file, get_test_examples_directory
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_face_tracks()
+	state_manager.init_item('face_tracker_interval', 3)
+
+
+def create_test_vision_frame(offset : int) -> VisionFrame:
+	texture_frame = cv2.GaussianBlur(numpy.random.RandomState(0).randint(0, 255, (300, 500, 3)).astype(numpy.uint8), (7, 7), 0)
+	return numpy.ascontiguousarray(texture_frame[:, offset:offset + 420])
+
+
+def test_track_faces() -> None:
+	face = create_test_face()
+	set_face_track(create_test_vision_frame(10), 0, [ face ])
+	faces = track_faces(create_test_vision_frame(7), 1)
+
+	assert len(faces) == 1
+	assert numpy.allclose(faces[0].bounding_box, face.bounding_box + [ 3, 0, 3, 0 ], atol = 0.5)
+	assert numpy.allclose(faces[0].landmark_set.get('5/68'), face.landmark_set.get('5/68') + [ 3, 0 ], atol = 0.5)
+	assert numpy.array_equal(faces[0].embedding, face.embedding)
+
+
+def test_track_faces_within_interval() -> None:
+	set_face_track(create_test_vision_frame(10), 0, [ create_test_face() ])
+
+	assert track_faces(create_test_vision_frame(10), 2) is None
+	assert track_faces(create_test_vision_frame(9), 1)
+	assert track_faces(create_test_vision_frame(8), 2)
+	assert track_faces(create_test_vision_frame(7), 3) is None
+
+
+def test_track_faces_without_track() -> None:
+	set_face_track(create_test_vision_frame(10), 0, [])
+
+	assert get_face_tracks() == {}
+	assert track_faces(create_test_vision_frame(10), 1) is None
+
+	state_manager.init_item('face_tracker_interval', 0)
+	set_face_track(create_test_vision_frame(10), 0, [ create_test_face() ])
+
+	assert track_faces(create_test_vision_frame(10), 1) is None
+
+
+def test_track_faces_with_lost_track() -> None:
+	set_face_track(create_test_vision_frame(10), 0, [ create_test_face() ])
+
+	assert track_faces(numpy.random.RandomState(1).randint(0, 255, (300, 420, 3)).astype(numpy.uint8), 1) is None
+
+
+def test_track_faces_in_stream(monkeypatch : pytest.MonkeyPatch) -> None:
+	detect_vision_frames : List[VisionFrame] = []
+
+	def get_many_faces(vision_frames : List[VisionFrame], face_attributes : List[FaceAttribute]) -> List[Face]:
+		detect_vision_frames.extend(vision_frames)
+		return [ create_test_face() ]
+
+	def process_chain_frame(inputs : core.FrameProcessorInputs) -> VisionFrame:
+		face_analyser.get_many_frame_faces(inputs.get('target_vision_frame'), inputs.get('frame_number'))
+		return inputs.get('target_vision_frame')
+
+	create_directory(get_test_examples_directory())
+	cv2.imwrite(get_test_example_file('target-static.png'), create_test_vision_frame(10))
+	subprocess.run([ 'ffmpeg', '-loop', '1', '-i', get_test_example_file('target-static.png'), '-frames:v', '12', '-r', '25', get_test_example_file('target-static.mp4'), '-y' ])
+	monkeypatch.setattr(face_analyser, 'get_many_faces', get_many_faces)
+	monkeypatch.setattr(core, 'process_chain_frame', process_chain_frame)
+	state_manager.init_item('target_path', get_test_example_file('target-static.mp4'))
+	state_manager.init_item('face_selector_mode', 'many')
+	state_manager.init_item('frame_processors', [])
+	state_manager.init_item('execution_thread_count', 2)
+	state_manager.init_item('execution_queue_count', 1)
+	state_manager.init_item('execution_pool_type', 'thread')
+	state_manager.init_item('duplicate_frame_threshold', None)
+	state_manager.init_item('output_video_encoder', 'libx264')
+	state_manager.init_item('output_video_preset', 'veryfast')
+	state_manager.init_item('output_video_quality', 80)
+	state_manager.init_item('log_level', 'error')
+	clear_frame_faces()
+	create_temp_directory(get_test_example_file('target-static.mp4'))
+	process_manager.start()
+
+	assert core.multi_process_stream([], get_test_example_file('target-static.mp4'), '420x300', 25, '420x300', 25) is True
+	assert len(detect_vision_frames) == 4
+
+	process_manager.end()
+	clear_temp_directory(get_test_example_file('target-static.mp4'))
@@ -5,7 +5,7 @@ import pytest
 
 from facefusion import process_manager, state_manager
 from facefusion.download import conditional_download
-from facefusion.ffmpeg import concat_video, extract_frames, read_audio_buffer
+from facefusion.ffmpeg import close_pipe, concat_video, extract_frames, pipe_extract_frames, read_audio_buffer, read_pipe_frame
 from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_directory_path
 from .helper import get_test_example_file, get_test_examples_directory, get_test_output_file, prepare_test_output_directory
 
@@ -110,6 +110,30 @@ def test_extract_frames_with_trim_end() -> None:
 		clear_temp_directory(target_path)
 
 
+def test_pipe_extract_frames() -> None:
+	state_manager.init_item('trim_frame_start', 124)
+	state_manager.init_item('trim_frame_end', 224)
+	providers =\
+	[
+		(get_test_example_file('target-240p-25fps.mp4'), 120),
+		(get_test_example_file('target-240p-30fps.mp4'), 100),
+		(get_test_example_file('target-240p-60fps.mp4'), 50)
+	]
+
+	for target_path, frame_total in providers:
+		extract_process = pipe_extract_frames(target_path, '452x240', 30.0)
+		vision_frames = []
+		vision_frame = read_pipe_frame(extract_process, (452, 240))
+
+		while vision_frame is not None:
+			vision_frames.append(vision_frame)
+			vision_frame = read_pipe_frame(extract_process, (452, 240))
+
+		assert close_pipe(extract_process) is True
+		assert len(vision_frames) == frame_total
+		assert vision_frames[0].shape == (240, 452, 3)
+
+
 def test_concat_video() -> None:
 	output_path = get_test_output_file('test-concat-video.mp4')
 	temp_output_paths =\
@@ -0,0 +1,86 @@
+import os
+from typing import List
+
+import numpy
+import pytest
+
+from facefusion import state_manager
+from facefusion.frame_deduplicator import calc_duplicate_frame_ratio, clear_duplicate_frames, create_frame_fingerprint, detect_duplicate_frames, filter_duplicate_frames, get_duplicate_frame_store, is_duplicate_fingerprint, restore_duplicate_frames, should_skip_duplicate_frames
+from facefusion.vision import read_image, write_image
+from .helper import get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_duplicate_frames()
+	prepare_test_output_directory()
+	state_manager.init_item('execution_thread_count', 4)
+	state_manager.init_item('frame_processors', [ 'face_swapper' ])
+	state_manager.init_item('duplicate_frame_threshold', 0)
+
+
+def create_test_frame_paths(frame_values : List[int]) -> List[str]:
+	temp_frame_paths = []
+
+	for index, frame_value in enumerate(frame_values):
+		temp_frame_path = get_test_output_file(str(index).zfill(4) + '.png')
+		vision_frame = numpy.full((36, 64, 3), 100, dtype = numpy.uint8)
+		vision_frame[:, :16] = frame_value
+		write_image(temp_frame_path, vision_frame)
+		temp_frame_paths.append(temp_frame_path)
+	return temp_frame_paths
+
+
+def test_should_skip_duplicate_frames() -> None:
+	assert should_skip_duplicate_frames() is True
+
+	state_manager.init_item('frame_processors', [ 'face_swapper', 'lip_syncer' ])
+
+	assert should_skip_duplicate_frames() is False
+
+	state_manager.init_item('frame_processors', [ 'face_swapper' ])
+	state_manager.init_item('duplicate_frame_threshold', None)
+
+	assert should_skip_duplicate_frames() is False
+
+
+def test_is_duplicate_fingerprint() -> None:
+	vision_frame = numpy.full((36, 64, 3), 100, dtype = numpy.uint8)
+	near_vision_frame = vision_frame.copy()
+	near_vision_frame[0, 0] = 0
+
+	assert is_duplicate_fingerprint(create_frame_fingerprint(vision_frame), create_frame_fingerprint(vision_frame.copy())) is True
+	assert is_duplicate_fingerprint(create_frame_fingerprint(vision_frame), create_frame_fingerprint(near_vision_frame)) is False
+
+	state_manager.init_item('duplicate_frame_threshold', 0.5)
+
+	assert is_duplicate_fingerprint(create_frame_fingerprint(vision_frame), create_frame_fingerprint(near_vision_frame)) is True
+	assert is_duplicate_fingerprint(create_frame_fingerprint(vision_frame), create_frame_fingerprint(255 - vision_frame)) is False
+
+
+def test_detect_duplicate_frames() -> None:
+	temp_frame_paths = create_test_frame_paths([ 0, 0, 0, 255, 255, 0 ])
+	detect_duplicate_frames(temp_frame_paths)
+
+	assert get_duplicate_frame_store().get('frame_paths') ==\
+	{
+		temp_frame_paths[1]: temp_frame_paths[0],
+		temp_frame_paths[2]: temp_frame_paths[0],
+		temp_frame_paths[4]: temp_frame_paths[3]
+	}
+	assert calc_duplicate_frame_ratio() == 0.5
+
+	queue_payloads = filter_duplicate_frames([ { 'frame_number': index, 'frame_path': temp_frame_path } for index, temp_frame_path in enumerate(temp_frame_paths) ])
+
+	assert [ queue_payload.get('frame_number') for queue_payload in queue_payloads ] == [ 0, 3, 5 ]
+
+
+def test_restore_duplicate_frames() -> None:
+	temp_frame_paths = create_test_frame_paths([ 0, 0, 255 ])
+	detect_duplicate_frames(temp_frame_paths)
+	write_image(temp_frame_paths[0], numpy.zeros((36, 64, 3), dtype = numpy.uint8))
+
+	assert restore_duplicate_frames() is True
+	assert numpy.array_equal(read_image(temp_frame_paths[1]), read_image(temp_frame_paths[0]))
+	assert not numpy.array_equal(read_image(temp_frame_paths[2]), read_image(temp_frame_paths[0]))
+	assert os.path.basename(temp_frame_paths[1]) == '0001.png'
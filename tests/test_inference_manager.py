@@ -0,0 +1,158 @@
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List
+
+import onnx
+import pytest
+from onnxruntime import InferenceSession
+
+from facefusion import inference_manager, process_manager, state_manager
+from facefusion.execution import create_inference_session
+from facefusion.filesystem import get_file_size
+from facefusion.inference_manager import calc_inference_sessions_size, clear_inference_sessions, create_inference_inputs, create_session_key, get_inference_session, get_inference_sessions, reduce_inference_sessions, warm_up_inference_sessions
+from facefusion.thread_helper import thread_semaphore
+from facefusion.typing import ExecutionProviderKey
+from .helper import create_identity_model, get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	prepare_test_output_directory()
+	process_manager.end()
+	state_manager.init_item('inference_memory_limit', 0)
+	state_manager.init_item('execution_thread_count', 4)
+	state_manager.init_item('execution_session_replica_count', 1)
+	for index in range(3):
+		onnx.save(create_identity_model([ 'batch', 3, 'size' ]), get_test_output_file('identity-' + str(index) + '.onnx'))
+	clear_inference_sessions([ get_test_output_file('identity-' + str(index) + '.onnx') for index in range(3) ])
+
+
+def test_get_inference_session() -> None:
+	model_path = get_test_output_file('identity-0.onnx')
+	inference_session = get_inference_session(model_path, '0', [ 'cpu' ])
+
+	assert get_inference_session(model_path, '0', [ 'cpu' ]) is inference_session
+	assert get_inference_session(model_path, '1', [ 'cpu' ]) is not inference_session
+	assert get_inference_sessions().get(create_session_key(model_path, '0', [ 'cpu' ])).get('session_size') > 0
+
+
+def test_get_inference_session_replicas() -> None:
+	model_path = get_test_output_file('identity-0.onnx')
+	state_manager.init_item('execution_session_replica_count', 2)
+	barrier = threading.Barrier(4)
+
+	def get_barrier_inference_session(_ : int) -> InferenceSession:
+		barrier.wait()
+		return get_inference_session(model_path, '0', [ 'cpu' ])
+
+	with ThreadPoolExecutor(max_workers = 4) as executor:
+		inference_sessions = list(executor.map(get_barrier_inference_session, range(4)))
+
+	replica_sessions = list(dict.fromkeys(inference_sessions))
+
+	assert len(replica_sessions) == 2
+	assert create_session_key(model_path, '0', [ 'cpu' ], 1) in get_inference_sessions()
+	assert thread_semaphore(replica_sessions[0]) is not thread_semaphore(replica_sessions[1])
+	assert thread_semaphore(replica_sessions[0]) is thread_semaphore(replica_sessions[0])
+
+	clear_inference_sessions([ model_path ])
+
+	assert get_inference_sessions() == {}
+
+
+def test_get_inference_session_with_concurrent_loads(monkeypatch : pytest.MonkeyPatch) -> None:
+	model_paths = [ get_test_output_file('identity-' + str(index) + '.onnx') for index in range(3) ]
+	resident_memories = itertools.count(0, 256 * 1024 ** 2)
+	barrier = threading.Barrier(2)
+
+	def create_barrier_inference_session(model_path : str, execution_device_id : str, execution_provider_keys : List[ExecutionProviderKey]) -> InferenceSession:
+		barrier.wait()
+		return create_inference_session(model_path, execution_device_id, execution_provider_keys)
+
+	monkeypatch.setattr(inference_manager, 'get_resident_memory', lambda: next(resident_memories))
+	monkeypatch.setattr(inference_manager, 'create_inference_session', create_barrier_inference_session)
+
+	with ThreadPoolExecutor(max_workers = 2) as executor:
+		list(executor.map(partial(get_inference_session, execution_device_id = '0', execution_provider_keys = [ 'cpu' ]), model_paths[:2]))
+
+	assert get_inference_sessions().get(create_session_key(model_paths[0], '0', [ 'cpu' ])).get('session_size') == get_file_size(model_paths[0])
+	assert get_inference_sessions().get(create_session_key(model_paths[1], '0', [ 'cpu' ])).get('session_size') == get_file_size(model_paths[1])
+
+	monkeypatch.setattr(inference_manager, 'create_inference_session', create_inference_session)
+	get_inference_session(model_paths[2], '0', [ 'cpu' ])
+
+	assert get_inference_sessions().get(create_session_key(model_paths[2], '0', [ 'cpu' ])).get('session_size') == 256 * 1024 ** 2
+
+
+def test_reduce_inference_sessions() -> None:
+	model_paths = [ get_test_output_file('identity-' + str(index) + '.onnx') for index in range(3) ]
+	session_keys = [ create_session_key(model_path, '0', [ 'cpu' ]) for model_path in model_paths ]
+
+	for model_path, session_key in zip(model_paths, session_keys):
+		get_inference_session(model_path, '0', [ 'cpu' ])
+		get_inference_sessions()[session_key]['session_size'] = 1024 * 1024
+	get_inference_session(model_paths[0], '0', [ 'cpu' ])
+	state_manager.init_item('inference_memory_limit', 2)
+	reduce_inference_sessions(session_keys[2])
+
+	assert session_keys[0] in get_inference_sessions()
+	assert session_keys[1] not in get_inference_sessions()
+	assert session_keys[2] in get_inference_sessions()
+	assert calc_inference_sessions_size() == 2 * 1024 * 1024
+
+	state_manager.init_item('inference_memory_limit', 1)
+	reduce_inference_sessions(session_keys[2])
+
+	assert list(get_inference_sessions().keys()) == [ session_keys[2] ]
+
+	process_manager.start()
+	for model_path in model_paths:
+		get_inference_session(model_path, '0', [ 'cpu' ])
+	for session_key in session_keys:
+		get_inference_sessions()[session_key]['session_size'] = 1024 * 1024
+	reduce_inference_sessions(session_keys[0])
+
+	assert list(get_inference_sessions().keys()) == session_keys
+
+	process_manager.end()
+	reduce_inference_sessions(session_keys[0])
+
+	assert list(get_inference_sessions().keys()) == [ session_keys[0] ]
+
+
+def test_clear_inference_sessions() -> None:
+	model_path = get_test_output_file('identity-0.onnx')
+	get_inference_session(model_path, '0', [ 'cpu' ])
+	get_inference_session(model_path, '1', [ 'cpu' ])
+	clear_inference_sessions([ model_path ])
+
+	assert create_session_key(model_path, '0', [ 'cpu' ]) not in get_inference_sessions()
+	assert create_session_key(model_path, '1', [ 'cpu' ]) not in get_inference_sessions()
+
+
+def test_create_inference_inputs() -> None:
+	inference_session = get_inference_session(get_test_output_file('identity-0.onnx'), '0', [ 'cpu' ])
+	inference_inputs = create_inference_inputs(inference_session)
+
+	assert inference_inputs.get('input').shape == (1, 3, 256)
+	assert inference_inputs.get('input').dtype == 'float32'
+
+
+def test_warm_up_inference_sessions() -> None:
+	inference_session_getters = [ partial(get_inference_session, get_test_output_file('identity-' + str(index) + '.onnx'), '0', [ 'cpu' ]) for index in range(3) ]
+	warm_up_reports = warm_up_inference_sessions(inference_session_getters + [ lambda: None, partial(get_inference_session, get_test_output_file('identity-invalid.onnx'), '0', [ 'cpu' ]) ])
+
+	assert [ warm_up_report.get('model_path') for warm_up_report in warm_up_reports ] == [ get_test_output_file('identity-' + str(index) + '.onnx') for index in range(3) ]
+	assert all(warm_up_report.get('inference_time') is not None for warm_up_report in warm_up_reports)
+
+
+def test_warm_up_inference_sessions_with_replicas() -> None:
+	model_path = get_test_output_file('identity-0.onnx')
+	state_manager.init_item('execution_session_replica_count', 3)
+	warm_up_reports = warm_up_inference_sessions([ partial(get_inference_session, model_path, '0', [ 'cpu' ]) ])
+
+	assert sorted(warm_up_report.get('replica_index') for warm_up_report in warm_up_reports) == [ 0, 1, 2 ]
+	assert all(create_session_key(model_path, '0', [ 'cpu' ], replica_index) in get_inference_sessions() for replica_index in range(3))
+	assert len(get_inference_sessions()) == 3
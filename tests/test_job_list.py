@@ -3,7 +3,7 @@ from time import sleep
 import pytest
 
 from facefusion.jobs.job_list import compose_job_list
-from facefusion.jobs.job_manager import clear_jobs, create_job, init_jobs
+from facefusion.jobs.job_manager import add_step, clear_jobs, create_job, init_jobs, set_step_telemetry
 from .helper import get_test_jobs_directory
 
 
@@ -22,3 +22,43 @@ def test_compose_job_list() -> None:
 	assert job_headers == [ 'job id', 'steps', 'date created', 'date updated', 'job status' ]
 	assert job_contents[0] == [ 'job-test-compose-job-list-1', 0, 'just now', None, 'drafted' ]
 	assert job_contents[1] == [ 'job-test-compose-job-list-2', 0, 'just now', None, 'drafted' ]
+
+
+def test_compose_job_list_throughput() -> None:
+	create_job('job-test-compose-job-list-throughput')
+	add_step('job-test-compose-job-list-throughput', {})
+	add_step('job-test-compose-job-list-throughput', {})
+	job_headers, job_contents = compose_job_list('drafted', True)
+
+	assert job_headers[-3:] == [ 'frames', 'fps', 'peak memory' ]
+	assert job_contents[0][-3:] == [ None, None, None ]
+
+	for step_index, peak_memory in enumerate([ 512 * 1024 ** 2, 768 * 1024 ** 2 ]):
+		set_step_telemetry('job-test-compose-job-list-throughput', step_index,
+		{
+			'phase_times': {},
+			'date_started': None,
+			'process_time': 5.0,
+			'frame_total': 100,
+			'frame_rate': 20.0,
+			'peak_memory': peak_memory,
+			'execution': {}
+		})
+	_, job_contents = compose_job_list('drafted', True)
+
+	assert job_contents[0][-3:] == [ 200, 20.0, '768 MB' ]
+
+	for step_index, peak_memory in enumerate([ 512 * 1024 ** 2, 768 * 1024 ** 2 ]):
+		set_step_telemetry('job-test-compose-job-list-throughput', step_index,
+		{
+			'phase_times': {},
+			'date_started': '2024-01-01T00:00:0' + str(step_index) + '+00:00',
+			'process_time': 5.0,
+			'frame_total': 100,
+			'frame_rate': 20.0,
+			'peak_memory': peak_memory,
+			'execution': {}
+		})
+	_, job_contents = compose_job_list('drafted', True)
+
+	assert job_contents[0][-3:] == [ 200, 33.33, '768 MB' ]
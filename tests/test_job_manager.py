@@ -1,7 +1,13 @@
+import glob
+import os
+from typing import List
+
 import pytest
 
 from facefusion.jobs.job_helper import get_step_output_path
-from facefusion.jobs.job_manager import add_step, clear_jobs, count_step_total, create_job, delete_job, delete_jobs, find_job_ids, get_steps, init_jobs, insert_step, move_job_file, remix_step, remove_step, set_step_status, set_steps_status, submit_job, submit_jobs
+from facefusion.jobs.job_manager import add_step, claim_job, clear_jobs, commit_job_transaction, count_step_total, create_job, delete_job, delete_jobs, find_job_ids, find_job_path, get_job_lease_path, get_steps, init_jobs, insert_step, job_transaction, move_job_file, read_job_file, recover_jobs, release_job, remix_step, remove_step, renew_job_lease, set_step_status, set_step_telemetry, set_steps_status, start_job_transaction, submit_job, submit_jobs, suggest_job_path
+from facefusion.json import read_json, write_json
+from facefusion.typing import JobStepTelemetry
 from .helper import get_test_jobs_directory
 
 
@@ -94,6 +100,88 @@ def test_delete_jobs() -> None:
 	assert delete_jobs() is True
 
 
+def test_claim_job() -> None:
+	args_1 =\
+	{
+		'source_path': 'source-1.jpg',
+		'target_path': 'target-1.jpg',
+		'output_path': 'output-1.jpg'
+	}
+
+	assert claim_job('job-invalid') is False
+
+	create_job('job-test-claim-job')
+	add_step('job-test-claim-job', args_1)
+
+	assert claim_job('job-test-claim-job') is False
+
+	submit_job('job-test-claim-job')
+
+	assert claim_job('job-test-claim-job') is True
+	assert claim_job('job-test-claim-job') is False
+	assert find_job_ids('running') == [ 'job-test-claim-job' ]
+	assert renew_job_lease('job-test-claim-job') is True
+
+	write_json(get_job_lease_path('job-test-claim-job'), { 'worker_id': 'worker-invalid' })
+
+	assert renew_job_lease('job-test-claim-job') is False
+	assert set_step_status('job-test-claim-job', 0, 'completed') is False
+	assert get_steps('job-test-claim-job')[0].get('status') == 'queued'
+	assert release_job('job-test-claim-job', 'completed') is False
+
+	move_job_file('job-test-claim-job', 'queued')
+
+	assert claim_job('job-test-claim-job') is True
+	assert renew_job_lease('job-test-claim-job') is True
+	assert set_step_status('job-test-claim-job', 0, 'completed') is True
+
+
+def test_release_job() -> None:
+	args_1 =\
+	{
+		'source_path': 'source-1.jpg',
+		'target_path': 'target-1.jpg',
+		'output_path': 'output-1.jpg'
+	}
+
+	assert release_job('job-invalid', 'completed') is False
+
+	create_job('job-test-release-job')
+	add_step('job-test-release-job', args_1)
+	submit_job('job-test-release-job')
+	claim_job('job-test-release-job')
+
+	assert release_job('job-test-release-job', 'completed') is True
+	assert find_job_ids('running') == []
+	assert find_job_ids('completed') == [ 'job-test-release-job' ]
+	assert os.path.exists(get_job_lease_path('job-test-release-job')) is False
+
+
+def test_recover_jobs() -> None:
+	args_1 =\
+	{
+		'source_path': 'source-1.jpg',
+		'target_path': 'target-1.jpg',
+		'output_path': 'output-1.jpg'
+	}
+
+	create_job('job-test-recover-jobs-1')
+	add_step('job-test-recover-jobs-1', args_1)
+	submit_job('job-test-recover-jobs-1')
+	claim_job('job-test-recover-jobs-1')
+	create_job('job-test-recover-jobs-2')
+	add_step('job-test-recover-jobs-2', args_1)
+	submit_job('job-test-recover-jobs-2')
+	claim_job('job-test-recover-jobs-2')
+	os.utime(get_job_lease_path('job-test-recover-jobs-2'), (0, 0))
+
+	assert recover_jobs() is True
+	assert find_job_ids('running') == [ 'job-test-recover-jobs-1' ]
+	assert find_job_ids('queued') == [ 'job-test-recover-jobs-2' ]
+	assert os.path.exists(get_job_lease_path('job-test-recover-jobs-2')) is False
+	assert claim_job('job-test-recover-jobs-2') is True
+
+
 @pytest.mark.skip()
 def test_find_jobs() -> None:
 	pass
@@ -140,6 +228,30 @@ def test_find_job_ids() -> None:
 	assert find_job_ids('failed') == [ 'job-test-find-job-ids-2' ]
 
 
+def test_find_job_ids_with_status_index(monkeypatch : pytest.MonkeyPatch) -> None:
+	job_patterns : List[str] = []
+	glob_glob = glob.glob
+	drafted_path = os.path.join(get_test_jobs_directory(), 'drafted')
+
+	def count_glob(job_pattern : str) -> List[str]:
+		job_patterns.append(job_pattern)
+		return glob_glob(job_pattern)
+
+	monkeypatch.setattr(glob, 'glob', count_glob)
+	create_job('job-test-find-job-ids-with-status-index-1')
+	os.utime(drafted_path, (0, 0))
+
+	assert find_job_ids('drafted') == [ 'job-test-find-job-ids-with-status-index-1' ]
+	assert find_job_ids('drafted') == [ 'job-test-find-job-ids-with-status-index-1' ]
+	assert len(job_patterns) == 1
+
+	create_job('job-test-find-job-ids-with-status-index-2')
+
+	assert find_job_ids('drafted') == [ 'job-test-find-job-ids-with-status-index-1', 'job-test-find-job-ids-with-status-index-2' ]
+	assert find_job_ids('drafted') == [ 'job-test-find-job-ids-with-status-index-1', 'job-test-find-job-ids-with-status-index-2' ]
+	assert len(job_patterns) == 3
+
+
 def test_add_step() -> None:
 	args_1 =\
 	{
@@ -367,3 +479,116 @@ def test_set_steps_status() -> None:
 	assert steps[0].get('status') == 'queued'
 	assert steps[1].get('status') == 'queued'
 	assert count_step_total('job-test-set-steps-status') == 2
+
+
+def test_set_step_telemetry() -> None:
+	args_1 =\
+	{
+		'source_path': 'source-1.jpg',
+		'target_path': 'target-1.jpg',
+		'output_path': 'output-1.jpg'
+	}
+	step_telemetry : JobStepTelemetry =\
+	{
+		'phase_times': { 'extract': 1.0, 'face_swapper': 4.0, 'merge': 1.0 },
+		'date_started': None,
+		'process_time': 6.0,
+		'frame_total': 120,
+		'frame_rate': 20.0,
+		'peak_memory': 1024 ** 3,
+		'execution': { 'execution_thread_count': 4 }
+	}
+
+	assert set_step_telemetry('job-invalid', 0, step_telemetry) is False
+
+	create_job('job-test-set-step-telemetry')
+	add_step('job-test-set-step-telemetry', args_1)
+
+	assert get_steps('job-test-set-step-telemetry')[0].get('telemetry') is None
+	assert set_step_telemetry('job-test-set-step-telemetry', 99, step_telemetry) is False
+	assert set_step_telemetry('job-test-set-step-telemetry', 0, step_telemetry) is True
+	assert get_steps('job-test-set-step-telemetry')[0].get('telemetry') == step_telemetry
+
+
+def test_read_job_file() -> None:
+	args_1 =\
+	{
+		'source_path': 'source-1.jpg',
+		'target_path': 'target-1.jpg',
+		'output_path': 'output-1.jpg'
+	}
+
+	assert read_job_file('job-invalid') is None
+
+	create_job('job-test-read-job-file')
+	add_step('job-test-read-job-file', args_1)
+	job = read_job_file('job-test-read-job-file')
+	job.get('steps').clear()
+
+	assert count_step_total('job-test-read-job-file') == 1
+
+	job_content = read_json(find_job_path('job-test-read-job-file'))
+	job_content.get('steps').append(job_content.get('steps')[0])
+	write_json(find_job_path('job-test-read-job-file'), job_content)
+
+	assert count_step_total('job-test-read-job-file') == 2
+
+	os.rename(find_job_path('job-test-read-job-file'), suggest_job_path('job-test-read-job-file', 'failed'))
+
+	assert find_job_path('job-test-read-job-file') == suggest_job_path('job-test-read-job-file', 'failed')
+	assert count_step_total('job-test-read-job-file') == 2
+
+	os.remove(suggest_job_path('job-test-read-job-file', 'failed'))
+
+	assert find_job_path('job-test-read-job-file') is None
+	assert read_job_file('job-test-read-job-file') is None
+
+
+def test_job_transaction() -> None:
+	args_1 =\
+	{
+		'source_path': 'source-1.jpg',
+		'target_path': 'target-1.jpg',
+		'output_path': 'output-1.jpg'
+	}
+
+	assert start_job_transaction('job-invalid') is False
+	assert commit_job_transaction('job-invalid') is False
+
+	create_job('job-test-job-transaction')
+	add_step('job-test-job-transaction', args_1)
+	add_step('job-test-job-transaction', args_1)
+
+	assert start_job_transaction('job-test-job-transaction') is True
+	assert start_job_transaction('job-test-job-transaction') is False
+
+	set_step_status('job-test-job-transaction', 0, 'completed')
+	set_step_status('job-test-job-transaction', 1, 'failed')
+	move_job_file('job-test-job-transaction', 'failed')
+
+	assert get_steps('job-test-job-transaction')[0].get('status') == 'completed'
+	assert read_json(suggest_job_path('job-test-job-transaction', 'failed')).get('steps')[0].get('status') == 'drafted'
+	assert commit_job_transaction('job-test-job-transaction') is True
+	assert [ step.get('status') for step in read_json(suggest_job_path('job-test-job-transaction', 'failed')).get('steps') ] == [ 'completed', 'failed' ]
+	assert os.listdir(os.path.dirname(suggest_job_path('job-test-job-transaction', 'failed'))) == [ 'job-test-job-transaction.json' ]
+
+
+def test_job_transaction_discard() -> None:
+	args_1 =\
+	{
+		'source_path': 'source-1.jpg',
+		'target_path': 'target-1.jpg',
+		'output_path': 'output-1.jpg'
+	}
+
+	create_job('job-test-job-transaction-discard')
+	add_step('job-test-job-transaction-discard', args_1)
+
+	with pytest.raises(RuntimeError):
+		with job_transaction('job-test-job-transaction-discard') as is_job_transaction:
+			assert is_job_transaction is True
+			set_step_status('job-test-job-transaction-discard', 0, 'completed')
+			raise RuntimeError
+
+	assert get_steps('job-test-job-transaction-discard')[0].get('status') == 'drafted'
+	assert start_job_transaction('job-test-job-transaction-discard') is True
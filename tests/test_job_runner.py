@@ -1,12 +1,13 @@
 import subprocess
+from concurrent.futures import Future
 
 import pytest
 
 from facefusion import state_manager
 from facefusion.download import conditional_download
 from facefusion.filesystem import copy_file
-from facefusion.jobs.job_manager import add_step, clear_jobs, create_job, init_jobs, submit_job, submit_jobs
-from facefusion.jobs.job_runner import collect_output_set, finalize_steps, run_job, run_jobs, run_steps
+from facefusion.jobs.job_manager import add_step, clear_jobs, create_job, get_steps, init_jobs, remix_step, submit_job, submit_jobs
+from facefusion.jobs.job_runner import collect_output_set, create_step_graph, finalize_steps, resolve_step_futures, run_job, run_jobs, run_steps
 from facefusion.typing import Args
 from .helper import get_test_example_file, get_test_examples_directory, get_test_jobs_directory, get_test_output_file, is_test_output_file, prepare_test_output_directory
 
@@ -143,6 +144,70 @@ def test_run_steps() -> None:
 	add_step('job-test-run-steps', args_3)
 
 	assert run_steps('job-test-run-steps', process_step) is True
+	assert all(step.get('telemetry').get('frame_total') == 0 for step in get_steps('job-test-run-steps'))
+
+
+def test_create_step_graph() -> None:
+	args_1 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.mp4'),
+		'output_path': get_test_output_file('output-1.mp4')
+	}
+	args_2 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.jpg'),
+		'output_path': get_test_output_file('output-1.jpg')
+	}
+	args_3 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.mp4'),
+		'output_path': get_test_output_file('output-2.mp4'),
+		'trim_frame_start': 100
+	}
+
+	create_job('job-test-create-step-graph')
+	add_step('job-test-create-step-graph', args_1)
+	add_step('job-test-create-step-graph', args_2)
+	add_step('job-test-create-step-graph', args_3)
+	remix_step('job-test-create-step-graph', 1, args_2)
+	add_step('job-test-create-step-graph', args_1)
+
+	assert create_step_graph('job-test-create-step-graph', get_steps('job-test-create-step-graph')) ==\
+	{
+		0: set(),
+		1: { 0 },
+		2: set(),
+		3: { 1 },
+		4: { 0, 1 }
+	}
+
+
+def test_resolve_step_futures() -> None:
+	args_1 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.jpg'),
+		'output_path': get_test_output_file('output-1.jpg')
+	}
+
+	create_job('job-test-resolve-step-futures')
+	for _ in range(3):
+		add_step('job-test-resolve-step-futures', args_1)
+	step_futures = { Future(): step_index for step_index in range(3) } #type:ignore[var-annotated]
+	completed_step_indices = set() #type:ignore[var-annotated]
+	step_future_1, step_future_2, step_future_3 = step_futures
+	step_future_1.set_result((True, None))
+	step_future_2.set_exception(RuntimeError())
+	step_future_3.cancel()
+
+	assert resolve_step_futures('job-test-resolve-step-futures', step_futures, { step_future_1 }, completed_step_indices) is True
+	assert resolve_step_futures('job-test-resolve-step-futures', step_futures, { step_future_2, step_future_3 }, completed_step_indices) is False
+	assert step_futures == {}
+	assert completed_step_indices == { 0 }
+	assert [ step.get('status') for step in get_steps('job-test-resolve-step-futures') ] == [ 'completed', 'failed', 'failed' ]
 
 
 def test_finalize_steps() -> None:
@@ -0,0 +1,35 @@
+import subprocess
+
+import pytest
+
+from facefusion.filesystem import create_directory
+from facefusion.jobs.job_segmenter import calc_segment_frame_ranges, split_step_args
+from .helper import get_test_example_file, get_test_examples_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	create_directory(get_test_examples_directory())
+	subprocess.run([ 'ffmpeg', '-f', 'lavfi', '-i', 'testsrc2=duration=4:size=426x240:rate=25', get_test_example_file('target-240p-segments.mp4'), '-y' ])
+
+
+def test_split_step_args() -> None:
+	step_args =\
+	{
+		'target_path': get_test_example_file('target-240p-segments.mp4'),
+		'output_path': get_test_example_file('output.mp4'),
+		'trim_frame_start': None,
+		'trim_frame_end': None
+	}
+
+	assert [ (segment_step_args.get('trim_frame_start'), segment_step_args.get('trim_frame_end')) for segment_step_args in split_step_args(step_args, 4) ] == [ (None, 25), (25, 50), (50, 75), (75, None) ]
+	assert all(segment_step_args.get('output_path') == step_args.get('output_path') for segment_step_args in split_step_args(step_args, 4))
+	assert split_step_args(step_args, 1) == [ step_args ]
+	assert split_step_args({ 'target_path': 'invalid' }, 4) == [ { 'target_path': 'invalid' } ]
+
+
+def test_calc_segment_frame_ranges() -> None:
+	assert calc_segment_frame_ranges(None, None, 100, 3) == [ (None, 33), (33, 66), (66, None) ]
+	assert calc_segment_frame_ranges(10, 40, 100, 3) == [ (10, 20), (20, 30), (30, 40) ]
+	assert calc_segment_frame_ranges(10, None, 13, 8) == [ (10, 11), (11, 12), (12, None) ]
+	assert calc_segment_frame_ranges(None, None, 0, 4) == [ (None, None) ]
@@ -1,5 +1,8 @@
+import os
 import tempfile
 
+import pytest
+
 from facefusion.json import read_json, write_json
 
 
@@ -17,3 +20,12 @@ def test_write_json() -> None:
 	_, json_path = tempfile.mkstemp(suffix = '.json')
 
 	assert write_json(json_path, {})
+	assert write_json(json_path, { 'key': 'value' })
+	assert read_json(json_path) == { 'key': 'value' }
+	assert not [ file_name for file_name in os.listdir(os.path.dirname(json_path)) if file_name.startswith(os.path.basename(json_path) + '.') ]
+
+	with pytest.raises(TypeError):
+		write_json(json_path, { 'key': object() }) #type:ignore[dict-item]
+
+	assert read_json(json_path) == { 'key': 'value' }
+	assert not [ file_name for file_name in os.listdir(os.path.dirname(json_path)) if file_name.startswith(os.path.basename(json_path) + '.') ]
@@ -0,0 +1,109 @@
+from typing import List
+
+import numpy
+import onnx
+import pytest
+from onnx import TensorProto, helper, numpy_helper
+from onnxruntime import InferenceSession
+
+from facefusion import logger, state_manager
+from facefusion.execution import get_quantized_model_path
+from facefusion.filesystem import is_file
+from facefusion.model_quantizer import calc_output_similarity, collect_calibration_inputs, quantize_model, run_calibration, split_calibration_frames
+from facefusion.typing import InferenceInputs
+from .helper import get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	prepare_test_output_directory()
+	state_manager.init_item('quantize_method', 'dynamic')
+	state_manager.init_item('quantize_similarity', 0.99)
+	create_convolution_model(get_test_output_file('convolution.onnx'))
+
+
+def create_convolution_model(model_path : str) -> None:
+	weight = numpy.random.default_rng(0).standard_normal((8, 3, 3, 3)).astype(numpy.float32)
+	graph = helper.make_graph(
+	[
+		helper.make_node('Conv', [ 'input', 'weight' ], [ 'output' ], pads = [ 1, 1, 1, 1 ])
+	], 'convolution',
+	[
+		helper.make_tensor_value_info('input', TensorProto.FLOAT, [ 1, 3, 32, 32 ])
+	],
+	[
+		helper.make_tensor_value_info('output', TensorProto.FLOAT, [ 1, 8, 32, 32 ])
+	],
+	[
+		numpy_helper.from_array(weight, 'weight')
+	])
+	onnx.save(helper.make_model(graph, opset_imports = [ helper.make_opsetid('', 13) ]), model_path)
+
+
+def create_calibration_inputs(start : int = 0) -> List[InferenceInputs]:
+	return [ { 'input': numpy.random.default_rng(index).random((1, 3, 32, 32)).astype(numpy.float32) } for index in range(start, start + 4) ]
+
+
+def test_run_calibration() -> None:
+	inference_session = InferenceSession(get_test_output_file('convolution.onnx'), providers = [ 'CPUExecutionProvider' ])
+	calibration_inputs : List[InferenceInputs] = []
+	input_frame = create_calibration_inputs()[0].get('input')
+	output_frame = run_calibration(inference_session.run, calibration_inputs, None, { 'input': input_frame })[0]
+
+	assert output_frame.shape == (1, 8, 32, 32)
+	assert numpy.array_equal(calibration_inputs[0].get('input'), input_frame)
+
+
+def test_quantize_model() -> None:
+	model_path = get_test_output_file('convolution.onnx')
+
+	assert quantize_model(model_path, create_calibration_inputs(), create_calibration_inputs(4)) is True
+	assert is_file(get_quantized_model_path(model_path)) is True
+
+	state_manager.init_item('quantize_method', 'static')
+
+	assert quantize_model(model_path, create_calibration_inputs(), create_calibration_inputs(4)) is True
+
+	state_manager.init_item('quantize_similarity', 1.0)
+
+	assert quantize_model(model_path, create_calibration_inputs(), create_calibration_inputs(4)) is False
+
+
+def test_quantize_model_with_exception(monkeypatch : pytest.MonkeyPatch) -> None:
+	messages : List[str] = []
+	monkeypatch.setattr(logger, 'error', lambda message, scope: messages.append(message))
+
+	assert quantize_model(get_test_output_file('invalid.onnx'), create_calibration_inputs(), create_calibration_inputs(4)) is False
+	assert messages[0].startswith('Quantizing invalid.onnx raised')
+
+
+def test_collect_calibration_inputs() -> None:
+	def get_inference_session() -> InferenceSession:
+		raise RuntimeError('model not found')
+
+	state_manager.init_item('target_path', get_test_output_file('target.jpg'))
+	state_manager.init_item('frame_processors', [])
+	state_manager.init_item('face_selector_mode', 'reference')
+	state_manager.init_item('execution_model_precision', 'int8')
+
+	assert collect_calibration_inputs([ get_inference_session ], [ numpy.zeros((2, 2, 3), dtype = numpy.uint8) ]) == {}
+	assert state_manager.get_item('face_selector_mode') == 'reference'
+	assert state_manager.get_item('execution_model_precision') == 'int8'
+
+
+def test_split_calibration_frames() -> None:
+	calibration_frames = [ numpy.full((2, 2, 3), index, dtype = numpy.uint8) for index in range(8) ]
+	calibration_frames, validation_frames = split_calibration_frames(calibration_frames)
+
+	assert [ calibration_frame[0, 0, 0] for calibration_frame in calibration_frames ] == [ 0, 2, 3, 4, 6, 7 ]
+	assert [ validation_frame[0, 0, 0] for validation_frame in validation_frames ] == [ 1, 5 ]
+	assert split_calibration_frames(calibration_frames[:1]) == (calibration_frames[:1], [])
+
+
+def test_calc_output_similarity() -> None:
+	output = numpy.array([ 1.0, 2.0, 3.0 ])
+
+	assert calc_output_similarity(output, output * 2) == pytest.approx(1.0)
+	assert calc_output_similarity(output, -output) == pytest.approx(-1.0)
+	assert calc_output_similarity(output, output[:2]) == 0.0
+	assert calc_output_similarity(numpy.zeros(3), numpy.zeros(3)) == 1.0
@@ -0,0 +1,55 @@
+import subprocess
+
+import pytest
+
+from facefusion import state_manager
+from facefusion.filesystem import create_directory
+from facefusion.json import read_json
+from facefusion.shot_detector import clear_shot_indexes, detect_shot_index, get_shot_index, get_shot_index_path, has_shot_boundary
+from .helper import get_test_example_file, get_test_examples_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	create_directory(get_test_examples_directory())
+	subprocess.run([ 'ffmpeg', '-f', 'lavfi', '-i', 'testsrc2=duration=1:size=426x240:rate=25', '-f', 'lavfi', '-i', 'smptebars=duration=1:size=426x240:rate=25', '-filter_complex', '[0:v][1:v]concat=n=2:v=1', get_test_example_file('target-240p-shots.mp4'), '-y' ])
+	state_manager.init_item('log_level', 'error')
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_shot_indexes()
+	state_manager.init_item('output_video_fps', 25)
+	state_manager.init_item('trim_frame_start', None)
+
+
+def test_detect_shot_index() -> None:
+	shot_index = detect_shot_index(get_test_example_file('target-240p-shots.mp4'))
+
+	assert shot_index.get('frame_total') == 50
+	assert shot_index.get('shot_boundaries') == [ 25 ]
+	assert read_json(get_shot_index_path(get_test_example_file('target-240p-shots.mp4'))) == shot_index
+
+	clear_shot_indexes()
+
+	assert get_shot_index(get_test_example_file('target-240p-shots.mp4')) == shot_index
+	assert detect_shot_index('invalid') is None
+	assert get_shot_index('invalid') is None
+
+
+def test_has_shot_boundary() -> None:
+	detect_shot_index(get_test_example_file('target-240p-shots.mp4'))
+
+	assert has_shot_boundary(get_test_example_file('target-240p-shots.mp4'), 24, 25) is True
+	assert has_shot_boundary(get_test_example_file('target-240p-shots.mp4'), 25, 26) is False
+
+	state_manager.init_item('trim_frame_start', 10)
+
+	assert has_shot_boundary(get_test_example_file('target-240p-shots.mp4'), 14, 15) is True
+
+	state_manager.init_item('output_video_fps', 12.5)
+
+	assert has_shot_boundary(get_test_example_file('target-240p-shots.mp4'), 7, 8) is True
+	assert has_shot_boundary(get_test_example_file('target-240p-shots.mp4'), 8, 9) is False
+	assert has_shot_boundary('invalid', 0, 1) is False
+	assert get_shot_index('invalid') is None
@@ -0,0 +1,46 @@
+from time import sleep
+
+import pytest
+
+from facefusion import state_manager
+from facefusion.jobs import job_store
+from facefusion.telemetry import collect_telemetry, count_telemetry_frames, get_telemetry_store, start_telemetry, start_telemetry_phase, stop_telemetry_phase
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	job_store.register_job_keys([ 'execution_thread_count', 'log_level' ])
+	state_manager.init_item('execution_thread_count', 4)
+	state_manager.init_item('log_level', 'info')
+	start_telemetry()
+
+
+def test_telemetry_phase() -> None:
+	stop_telemetry_phase('extract')
+
+	assert get_telemetry_store().get('phase_times') == {}
+
+	for _ in range(2):
+		start_telemetry_phase('face_swapper')
+		sleep(0.1)
+		stop_telemetry_phase('face_swapper')
+
+	assert get_telemetry_store().get('phase_times').get('face_swapper') >= 0.2
+	assert get_telemetry_store().get('phase_start_times') == {}
+
+
+def test_collect_telemetry() -> None:
+	count_telemetry_frames(10)
+	count_telemetry_frames(10)
+	sleep(0.1)
+	telemetry = collect_telemetry()
+
+	assert telemetry.get('frame_total') == 20
+	assert 0 < telemetry.get('frame_rate') <= 200
+	assert telemetry.get('date_started')
+	assert telemetry.get('peak_memory') > 0
+	assert telemetry.get('execution') == { 'execution_thread_count': 4 }
+
+	start_telemetry()
+
+	assert collect_telemetry().get('frame_total') == 0
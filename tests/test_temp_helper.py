@@ -16,6 +16,8 @@ def before_all() -> None:
 		'https://github.com/facefusion/facefusion-assets/releases/download/examples/target-240p.mp4'
 	])
 	state_manager.init_item('temp_frame_format', 'png')
+	state_manager.init_item('trim_frame_start', None)
+	state_manager.init_item('trim_frame_end', None)
 
 
 def test_get_temp_file_path() -> None:
@@ -31,3 +33,17 @@ def test_get_temp_directory_path() -> None:
 def test_get_temp_frames_pattern() -> None:
 	temp_directory = tempfile.gettempdir()
 	assert get_temp_frames_pattern(get_test_example_file('target-240p.mp4'), '%04d') == os.path.join(temp_directory, 'facefusion', 'target-240p', '%04d.png')
+
+
+def test_get_temp_directory_path_with_trim() -> None:
+	temp_directory = tempfile.gettempdir()
+	state_manager.init_item('trim_frame_start', 10)
+
+	assert get_temp_directory_path(get_test_example_file('target-240p.mp4')) == os.path.join(temp_directory, 'facefusion', 'target-240p-10-end')
+
+	state_manager.init_item('trim_frame_start', None)
+	state_manager.init_item('trim_frame_end', 20)
+
+	assert get_temp_directory_path(get_test_example_file('target-240p.mp4')) == os.path.join(temp_directory, 'facefusion', 'target-240p-0-20')
+
+	state_manager.init_item('trim_frame_end', None)
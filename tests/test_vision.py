@@ -1,10 +1,12 @@
+import os
 import subprocess
 
+import numpy
 import pytest
 
 from facefusion.download import conditional_download
-from facefusion.vision import count_video_frame_total, create_image_resolutions, create_video_resolutions, detect_image_resolution, detect_video_fps, detect_video_resolution, get_video_frame, normalize_resolution, pack_resolution, restrict_image_resolution, restrict_video_fps, restrict_video_resolution, unpack_resolution
-from .helper import get_test_example_file, get_test_examples_directory
+from facefusion.vision import count_video_frame_total, create_image_resolutions, create_video_resolutions, detect_image_resolution, detect_video_fps, detect_video_resolution, get_video_frame, normalize_resolution, pack_resolution, read_image, restrict_image_resolution, restrict_video_fps, restrict_video_resolution, unpack_resolution, write_image
+from .helper import get_test_example_file, get_test_examples_directory, get_test_output_file, prepare_test_output_directory
 
 
 @pytest.fixture(scope = 'module', autouse = True)
@@ -48,6 +50,17 @@ def test_create_image_resolutions() -> None:
 	assert create_image_resolutions(None) == []
 
 
+def test_write_image() -> None:
+	prepare_test_output_directory()
+	output_path = get_test_output_file('test-write-image.png')
+	vision_frame = numpy.full((36, 64, 3), 128, dtype = numpy.uint8)
+
+	assert write_image(output_path, vision_frame) is True
+	assert numpy.array_equal(read_image(output_path), vision_frame)
+	assert os.listdir(os.path.dirname(output_path)) == [ 'test-write-image.png' ]
+	assert write_image('', vision_frame) is False
+
+
 def test_get_video_frame() -> None:
 	assert get_video_frame(get_test_example_file('target-240p-25fps.mp4')) is not None
 	assert get_video_frame('invalid') is None